@@ -109,7 +109,7 @@ resource "azurerm_container_app" "api" {
 
       env {
         name  = "AZURE_STORAGE_QUEUE_NAME"
-        value = azurerm_storage_queue.ai_generation_tasks.name
+        value = local.ai_generation_tasks_queue_name
       }
 
       env {
@@ -178,6 +178,9 @@ resource "azurerm_container_app" "worker" {
   template {
     min_replicas = var.worker_min_replicas
     max_replicas = var.worker_max_replicas
+    # On SIGTERM the worker drains for up to 90s (WORKER_DRAIN_TIMEOUT_SECONDS)
+    # before it exits; leave it room before the replica is killed
+    termination_grace_period_seconds = 120
 
     container {
       name   = local.worker_container_app_name
@@ -207,7 +210,21 @@ resource "azurerm_container_app" "worker" {
 
       env {
         name  = "AZURE_STORAGE_QUEUE_NAME"
-        value = azurerm_storage_queue.ai_generation_tasks.name
+        value = local.ai_generation_tasks_queue_name
+      }
+
+      # The worker serves /metrics and /ready on its monitoring port (9100);
+      # a replica only counts as ready once it polls its queues
+      readiness_probe {
+        transport = "HTTP"
+        port      = 9100
+        path      = "/ready"
+      }
+
+      liveness_probe {
+        transport = "HTTP"
+        port      = 9100
+        path      = "/"
       }
 
       # Add all other environment variables from app_settings
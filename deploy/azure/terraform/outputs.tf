@@ -37,8 +37,8 @@ output "output_container_name" {
 }
 
 output "ai_generation_tasks_queue_name" {
-  description = "Name of the AI generation tasks storage queue"
-  value       = azurerm_storage_queue.ai_generation_tasks.name
+  description = "Base name of the AI generation task lane queues"
+  value       = local.ai_generation_tasks_queue_name
 }
 
 output "storage_account_identity_principal_id" {
@@ -42,11 +42,54 @@ resource "azurerm_storage_container" "output" {
   container_access_type = "private"
 }
 
+# Task messages too large for a queue message (claim checks); the worker
+# deletes each payload once its task succeeded
+resource "azurerm_storage_container" "queue_payloads" {
+  name                  = "queue-payloads"
+  storage_account_id    = azurerm_storage_account.main.id
+  container_access_type = "private"
+}
+
+# Payloads of dead-lettered or abandoned tasks are removed after 30 days
+resource "azurerm_storage_management_policy" "queue_payloads" {
+  storage_account_id = azurerm_storage_account.main.id
+
+  rule {
+    name    = "expire-queue-payloads"
+    enabled = true
+
+    filters {
+      prefix_match = ["${azurerm_storage_container.queue_payloads.name}/"]
+      blob_types   = ["blockBlob"]
+    }
+
+    actions {
+      base_blob {
+        delete_after_days_since_modification_greater_than = 30
+      }
+    }
+  }
+}
+
 # ============================================================================
 # Storage Queue
 # ============================================================================
+# Base name shared by the lane queues; services receive it as
+# AZURE_STORAGE_QUEUE_NAME and append the lane
+locals {
+  ai_generation_tasks_queue_name = "ai-generation-tasks"
+}
+
+# One queue per lane (see edu_queue.lanes); the worker schedules across them
 resource "azurerm_storage_queue" "ai_generation_tasks" {
-  name              = "ai-generation-tasks"
+  for_each           = toset(["interactive", "indexing", "bulk"])
+  name               = "${local.ai_generation_tasks_queue_name}-${each.key}"
+  storage_account_id = azurerm_storage_account.main.id
+}
+
+# Dead-letter queue for tasks that exhausted their attempts
+resource "azurerm_storage_queue" "ai_generation_tasks_poison" {
+  name               = "${local.ai_generation_tasks_queue_name}-poison"
   storage_account_id = azurerm_storage_account.main.id
 }
 
@@ -1,6 +1,8 @@
 from functools import lru_cache
 
+from edu_core.events import EventBusKind
 from edu_core.keyvault import KeyVaultSettingsSource
+from edu_queue.backends import QueueBackendKind
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,12 +15,26 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # Task queue backend: "azure" (Storage Queues) or "postgres" (the database)
+    queue_backend: QueueBackendKind = "azure"
+    # Messages sent by concurrent requests are buffered for up to this long
+    # and sent together (0 sends each message right away)
+    queue_send_max_delay_seconds: float = 0.0
+    queue_send_max_batch_size: int = 32
+    # Messages over the queue's size limit are stored gzipped in a blob
+    # container and enqueued as a reference (claim check)
+    queue_compress_payloads: bool = True
+    # Project events pushed to clients: "postgres" (NOTIFY, shared with the
+    # worker) or "memory" (only events raised in the same process)
+    event_bus: EventBusKind = "postgres"
+
     # Azure Storage
     azure_storage_connection_string: str = ""
     azure_storage_queue_name: str = "ai-generation-tasks"
     azure_storage_input_container_name: str = "input"
     azure_storage_output_container_name: str = "output"
     azure_storage_chat_files_container_name: str = "chat-files"
+    azure_storage_queue_payloads_container_name: str = "queue-payloads"
 
     # Database
     database_url: str = ""
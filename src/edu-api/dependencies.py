@@ -1,5 +1,7 @@
 """FastAPI dependencies for service construction."""
 
+from functools import lru_cache
+
 from azure.storage.blob import BlobServiceClient
 from config import Settings, get_settings
 from edu_core.services import (
@@ -7,6 +9,7 @@ from edu_core.services import (
     DocumentService,
     DocumentUploadService,
     FlashcardGroupService,
+    GenerationJobService,
     MindMapService,
     NoteService,
     PracticeService,
@@ -17,6 +20,9 @@ from edu_core.services import (
     UsageService,
     UserService,
 )
+from edu_db.notifications import NotificationListener
+from edu_queue.backends import QueueBackend, create_queue_backend
+from edu_queue.claim_check import AzureBlobPayloadStore
 from edu_queue.service import QueueService
 from fastapi import Depends
 
@@ -35,16 +41,45 @@ def get_blob_service_client(
     )
 
 
-def get_queue_service(
-    settings: Settings = Depends(get_settings_dep),
-) -> QueueService:
-    """Get QueueService instance with configuration from settings."""
+@lru_cache
+def get_queue_backend() -> QueueBackend:
+    """Get the queue backend, created once so its connections are reused."""
+    settings = get_settings()
+    return create_queue_backend(
+        settings.queue_backend,
+        azure_storage_connection_string=settings.azure_storage_connection_string,
+        database_url=settings.database_url,
+    )
+
+
+@lru_cache
+def get_queue_service() -> QueueService:
+    """Get the QueueService, shared so buffered messages are sent together."""
+    settings = get_settings()
     return QueueService(
-        connection_string=settings.azure_storage_connection_string,
+        backend=get_queue_backend(),
         queue_name=settings.azure_storage_queue_name,
+        max_batch_size=settings.queue_send_max_batch_size,
+        max_delay_seconds=settings.queue_send_max_delay_seconds,
+        payload_store=AzureBlobPayloadStore(
+            settings.azure_storage_connection_string,
+            settings.azure_storage_queue_payloads_container_name,
+        ),
+        compress_payloads=settings.queue_compress_payloads,
     )
 
 
+@lru_cache
+def get_notification_listener() -> NotificationListener:
+    """Get the listener shared by all streams waiting on database notifications."""
+    return NotificationListener(get_settings().database_url)
+
+
+def get_generation_job_service() -> GenerationJobService:
+    """Get GenerationJobService instance."""
+    return GenerationJobService()
+
+
 def get_search_service(
     settings: Settings = Depends(get_settings_dep),
 ) -> SearchService:
@@ -135,8 +170,6 @@ def get_mind_map_service(
     return MindMapService(queue_service=queue_service)
 
 
-
-
 def get_chat_service_with_streaming(
     search_service: SearchService = Depends(get_search_service),
     settings: Settings = Depends(get_settings_dep),
@@ -2,6 +2,12 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from config import get_settings
+from dependencies import (
+    get_notification_listener,
+    get_queue_backend,
+    get_queue_service,
+)
+from edu_core.events import get_event_bus, init_event_bus
 from edu_core.exceptions import NotFoundError, UsageLimitExceededError
 from edu_db.session import init_db
 from exception_handlers import (
@@ -18,7 +24,9 @@ from routers import (
     auth_router,
     chats_router,
     documents_router,
+    events_router,
     flashcard_groups_router,
+    generation_jobs_router,
     mind_maps_router,
     notes_router,
     practice_records_router,
@@ -47,10 +55,21 @@ class Api:
             settings = get_settings()
             # Initialize the database
             init_db(settings.database_url)
+            # Project events reach clients through the shared listener
+            init_event_bus(
+                settings.event_bus,
+                database_url=settings.database_url,
+                listener=get_notification_listener(),
+            )
             print(
                 f"[{self.config.name}] Startup: Ready to serve on port {self.config.port}"
             )
             yield
+            # Send buffered queue messages before the connections close
+            await get_queue_service().aclose()
+            await get_queue_backend().aclose()
+            get_event_bus().close()
+            get_notification_listener().close()
             print(f"[{self.config.name}] Shutdown: cleanup complete.")
 
         self.app = FastAPI(
@@ -99,6 +118,8 @@ class Api:
         self.app.include_router(flashcard_groups_router)
         self.app.include_router(practice_records_router)
         self.app.include_router(mind_maps_router)
+        self.app.include_router(generation_jobs_router)
+        self.app.include_router(events_router)
         self.app.include_router(study_plans_router)
         self.app.include_router(usage_router)
         self.app.include_router(users_router)
@@ -1,7 +1,9 @@
 from .auth import router as auth_router
 from .chats import router as chats_router
 from .documents import router as documents_router
+from .events import router as events_router
 from .flashcard_groups import router as flashcard_groups_router
+from .generation_jobs import router as generation_jobs_router
 from .mind_maps import router as mind_maps_router
 from .notes import router as notes_router
 from .practice_records import router as practice_records_router
@@ -15,7 +17,9 @@ __all__ = [
     "auth_router",
     "chats_router",
     "documents_router",
+    "events_router",
     "flashcard_groups_router",
+    "generation_jobs_router",
     "mind_maps_router",
     "notes_router",
     "practice_records_router",
@@ -93,9 +93,9 @@ async def upload_document(
             ]
         )
 
-        # Queue processing tasks for all documents
-        for document_id in document_ids:
-            task_message: QueueTaskMessage = {
+        # Queue processing tasks for all documents in one batch
+        task_messages: list[QueueTaskMessage] = [
+            {
                 "type": TaskType.DOCUMENT_PROCESSING,
                 "data": DocumentProcessingData(
                     document_id=document_id,
@@ -103,7 +103,9 @@ async def upload_document(
                     user_id=current_user.id,
                 ),
             }
-            queue_service.send_message(task_message)
+            for document_id in document_ids
+        ]
+        await queue_service.send_many(task_messages)
 
         return {"document_ids": document_ids}
 
@@ -0,0 +1,102 @@
+"""Router for the project event stream."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+from auth import get_current_user
+from dependencies import get_project_service
+from edu_core.events import EventBus, get_event_bus
+from edu_core.exceptions import NotFoundError
+from edu_core.schemas.events import ProjectEvent, ProjectEventType
+from edu_core.schemas.users import UserDto
+from edu_core.services import ProjectService
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from routers.generation_jobs import SSE_HEADERS
+
+router = APIRouter(prefix="/api/v1/projects/{project_id}/events", tags=["events"])
+
+# Seconds between keep-alive comments, which also retry a lost connection
+KEEPALIVE_INTERVAL_SECONDS = 15.0
+# Events buffered for a slow client before it is told to resync instead
+MAX_PENDING_EVENTS = 256
+
+
+def format_event(event: ProjectEvent) -> bytes:
+    """Encode a project event as a server-sent event."""
+    return f"data: {event.model_dump_json()}\n\n".encode()
+
+
+async def project_event_stream(
+    event_bus: EventBus, project_id: str
+) -> AsyncGenerator[bytes]:
+    """Stream a project's events until the client disconnects.
+
+    A ``resync`` event is sent whenever events may have been missed: after
+    the bus reconnects, and when the client fell too far behind.
+
+    Args:
+        event_bus: Bus delivering the events
+        project_id: The project ID
+
+    Yields:
+        Server-sent events and keep-alive comments
+    """
+    events: asyncio.Queue[ProjectEvent] = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+    overflowed = False
+
+    def on_event(event: ProjectEvent) -> None:
+        nonlocal overflowed
+        try:
+            events.put_nowait(event)
+        except asyncio.QueueFull:
+            overflowed = True
+
+    resync = ProjectEvent(type=ProjectEventType.RESYNC, project_id=project_id)
+    unsubscribe = event_bus.subscribe(project_id, on_event)
+    connected = event_bus.connected
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), KEEPALIVE_INTERVAL_SECONDS)
+            except TimeoutError:
+                event_bus.reconnect()
+                if event_bus.connected and not connected:
+                    yield format_event(resync)
+                connected = event_bus.connected
+                yield b": keep-alive\n\n"
+                continue
+
+            if overflowed:
+                while not events.empty():
+                    events.get_nowait()
+                overflowed = False
+                event = resync
+            yield format_event(event)
+    finally:
+        unsubscribe()
+
+
+@router.get("", status_code=200)
+async def stream_project_events(
+    project_id: str,
+    current_user: UserDto = Depends(get_current_user),
+    project_service: ProjectService = Depends(get_project_service),
+    event_bus: EventBus = Depends(get_event_bus),
+):
+    """Stream document status changes, new resources and finished generations.
+
+    Clients refetch what an event refers to; on ``resync`` they reload
+    everything they show.
+    """
+    try:
+        project_service.get_project(project_id=project_id, owner_id=current_user.id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return StreamingResponse(
+        project_event_stream(event_bus, project_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -5,16 +5,24 @@ from collections.abc import AsyncGenerator
 from auth import get_current_user
 from dependencies import (
     get_flashcard_group_service,
+    get_generation_job_service,
+    get_notification_listener,
     get_usage_service,
 )
 from edu_core.exceptions import NotFoundError
 from edu_core.schemas.flashcards import FlashcardDto, FlashcardGroupDto
 from edu_core.schemas.users import UserDto
-from edu_core.services import FlashcardGroupService, UsageService
+from edu_core.services import FlashcardGroupService, GenerationJobService, UsageService
+from edu_db.notifications import NotificationListener
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
 
+from routers.generation_jobs import (
+    SSE_HEADERS,
+    GenerationProgressUpdate,
+    format_progress,
+    queue_and_follow,
+)
 from routers.schemas import (
     FlashcardCreate,
     FlashcardGroupCreate,
@@ -116,14 +124,6 @@ async def delete_flashcard_group(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-class GenerationProgressUpdate(BaseModel):
-    """Progress update for generation streaming."""
-
-    status: str = Field(..., description="Status: searching, generating, saving, done")
-    message: str = Field(..., description="Progress message")
-    error: str | None = Field(None, description="Error message if any")
-
-
 @router.post("/{group_id}/generate", response_model=FlashcardGroupDto)
 async def generate_flashcards(
     project_id: str,
@@ -137,13 +137,14 @@ async def generate_flashcards(
     # Check usage limit before processing
     usage_service.check_and_increment(current_user.id, "flashcard_generation")
     try:
-        return service.queue_generation(
+        group, _ = await service.queue_generation(
             group_id=group_id,
             project_id=project_id,
             topic=request.topic,
             custom_instructions=request.custom_instructions,
             user_id=current_user.id,
         )
+        return group
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -158,34 +159,30 @@ async def generate_flashcards_stream(
     current_user: UserDto = Depends(get_current_user),
     service: FlashcardGroupService = Depends(get_flashcard_group_service),
     usage_service: UsageService = Depends(get_usage_service),
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    listener: NotificationListener = Depends(get_notification_listener),
 ):
-    """Queue flashcard generation request with streaming progress updates."""
+    """Queue flashcard generation request and stream the worker's progress."""
     # Check usage limit before processing
     usage_service.check_and_increment(current_user.id, "flashcard_generation")
 
     async def generate_stream() -> AsyncGenerator[bytes]:
         """Generate streaming progress updates"""
         try:
-            # Queuing request
-            progress = GenerationProgressUpdate(
-                status="queuing", message="Queuing flashcard generation request..."
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
-
-            service.queue_generation(
-                group_id=group_id,
+            async for event in queue_and_follow(
+                job_service,
+                listener,
+                enqueue=lambda: service.queue_generation(
+                    group_id=group_id,
+                    project_id=project_id,
+                    topic=request.topic,
+                    custom_instructions=request.custom_instructions,
+                    user_id=current_user.id,
+                ),
                 project_id=project_id,
-                topic=request.topic,
-                custom_instructions=request.custom_instructions,
-                user_id=current_user.id,
-            )
-
-            # Done (queued)
-            progress = GenerationProgressUpdate(
-                status="done",
-                message="Flashcard generation request queued successfully",
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
+                label="flashcards",
+            ):
+                yield event
 
         except NotFoundError as e:
             error_progress = GenerationProgressUpdate(
@@ -193,24 +190,17 @@ async def generate_flashcards_stream(
                 message="Error queuing flashcard generation",
                 error=str(e),
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
         except Exception as e:
             error_progress = GenerationProgressUpdate(
                 status="done",
                 message="Error queuing flashcard generation",
                 error=str(e),
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
 
     return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
-        },
+        generate_stream(), media_type="text/event-stream", headers=SSE_HEADERS
     )
 
 
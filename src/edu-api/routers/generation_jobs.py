@@ -0,0 +1,235 @@
+"""Router for generation job progress."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+from auth import get_current_user
+from dependencies import get_generation_job_service, get_notification_listener
+from edu_core.exceptions import NotFoundError
+from edu_core.schemas.generation_jobs import (
+    GenerationJobDto,
+    GenerationJobStatus,
+    GenerationStage,
+)
+from edu_core.schemas.users import UserDto
+from edu_core.services import GenerationJobService
+from edu_core.services.generation_jobs import GENERATION_JOBS_CHANNEL
+from edu_db.notifications import NotificationListener
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+router = APIRouter(
+    prefix="/api/v1/projects/{project_id}/generation-jobs",
+    tags=["generation-jobs"],
+)
+
+# Seconds between re-reads of the job when no notification arrives; each
+# also sends a keep-alive comment so proxies do not close the stream
+REFRESH_INTERVAL_SECONDS = 15.0
+# Seconds after which a stream stops following a job that is still running
+STREAM_TIMEOUT_SECONDS = 900.0
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "*",
+}
+
+
+class GenerationProgressUpdate(BaseModel):
+    """Progress update for generation streaming."""
+
+    status: str = Field(
+        ..., description="Status: queuing, queued, searching, generating, saving, done"
+    )
+    message: str = Field(..., description="Progress message")
+    error: str | None = Field(None, description="Error message if any")
+    job_id: str | None = Field(None, description="ID of the generation job")
+
+
+def format_progress(progress: GenerationProgressUpdate) -> bytes:
+    """Encode a progress update as a server-sent event."""
+    return f"data: {progress.model_dump_json()}\n\n".encode()
+
+
+def _job_progress(job: GenerationJobDto, label: str) -> GenerationProgressUpdate:
+    """Describe the current state of a job."""
+    if job.status == GenerationJobStatus.SUCCEEDED:
+        return GenerationProgressUpdate(
+            status="done", message=f"{label.capitalize()} generated", job_id=job.id
+        )
+    if job.status == GenerationJobStatus.FAILED:
+        return GenerationProgressUpdate(
+            status="done",
+            message=f"Error generating {label}",
+            error=job.error or "Generation failed",
+            job_id=job.id,
+        )
+    if job.status == GenerationJobStatus.SUPERSEDED:
+        return GenerationProgressUpdate(
+            status="done",
+            message=f"Replaced by a newer {label} generation request",
+            job_id=job.id,
+        )
+    if job.status == GenerationJobStatus.QUEUED:
+        message = (
+            f"Retrying {label} generation..."
+            if job.attempts
+            else "Waiting for a worker..."
+        )
+        return GenerationProgressUpdate(status="queued", message=message, job_id=job.id)
+
+    messages = {
+        GenerationStage.SEARCHING: "Analyzing project documents...",
+        GenerationStage.GENERATING: f"Generating {label}...",
+        GenerationStage.SAVING: f"Saving {label}...",
+    }
+    if job.stage is None:
+        return GenerationProgressUpdate(
+            status="running", message=f"Starting {label} generation...", job_id=job.id
+        )
+    return GenerationProgressUpdate(
+        status=job.stage.value, message=messages[job.stage], job_id=job.id
+    )
+
+
+async def follow_job(
+    job_service: GenerationJobService,
+    listener: NotificationListener,
+    job_id: str,
+    project_id: str,
+    label: str,
+) -> AsyncGenerator[bytes]:
+    """Stream a job's progress until it finishes.
+
+    The job is re-read whenever the worker announces a change on
+    ``GENERATION_JOBS_CHANNEL``, and at least every
+    ``REFRESH_INTERVAL_SECONDS`` in case a notification was missed.
+
+    Args:
+        job_service: GenerationJobService instance
+        listener: Listener delivering job change notifications
+        job_id: The job ID
+        project_id: The project ID the job must belong to
+        label: Name of the generated entity used in messages, e.g. "quiz"
+
+    Yields:
+        Server-sent events, ending with a "done" update
+    """
+    changed = asyncio.Event()
+
+    def on_notify(payload: str) -> None:
+        if payload == job_id:
+            changed.set()
+
+    unsubscribe = listener.subscribe(GENERATION_JOBS_CHANNEL, on_notify)
+    deadline = asyncio.get_running_loop().time() + STREAM_TIMEOUT_SECONDS
+    try:
+        last_state = None
+        while True:
+            changed.clear()
+            job = await asyncio.to_thread(job_service.get_job, job_id, project_id)
+            state = (job.status, job.stage, job.attempts)
+            if state != last_state:
+                last_state = state
+                yield format_progress(_job_progress(job, label))
+            if job.status.is_finished:
+                return
+
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                progress = GenerationProgressUpdate(
+                    status="done",
+                    message=f"{label.capitalize()} generation is still running",
+                    job_id=job_id,
+                )
+                yield format_progress(progress)
+                return
+
+            try:
+                await asyncio.wait_for(
+                    changed.wait(), min(REFRESH_INTERVAL_SECONDS, remaining)
+                )
+            except TimeoutError:
+                listener.reconnect()
+                yield b": keep-alive\n\n"
+    finally:
+        unsubscribe()
+
+
+async def queue_and_follow(
+    job_service: GenerationJobService,
+    listener: NotificationListener,
+    enqueue: Callable[[], Awaitable[tuple[object, GenerationJobDto]]],
+    project_id: str,
+    label: str,
+) -> AsyncGenerator[bytes]:
+    """Queue a generation task and stream the progress of its job.
+
+    A duplicate of a task that is still queued or running is not queued
+    again; the stream follows the job already tracking it.
+
+    Args:
+        job_service: GenerationJobService instance
+        listener: Listener delivering job change notifications
+        enqueue: Queues the task, returning the target entity and its job
+        project_id: The project ID
+        label: Name of the generated entity used in messages, e.g. "quiz"
+
+    Yields:
+        Server-sent events, ending with a "done" update
+    """
+    progress = GenerationProgressUpdate(
+        status="queuing", message=f"Queuing {label} generation request..."
+    )
+    yield format_progress(progress)
+
+    # The job just created, or the in-flight job the request collapsed into
+    _, job = await enqueue()
+
+    async for event in follow_job(job_service, listener, job.id, project_id, label):
+        yield event
+
+
+@router.get("/{job_id}", response_model=GenerationJobDto)
+async def get_generation_job(
+    project_id: str,
+    job_id: str,
+    current_user: UserDto = Depends(get_current_user),
+    service: GenerationJobService = Depends(get_generation_job_service),
+):
+    """Get a generation job by ID."""
+    try:
+        return await asyncio.to_thread(
+            service.get_job, job_id=job_id, project_id=project_id
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}/stream", status_code=200)
+async def stream_generation_job(
+    project_id: str,
+    job_id: str,
+    current_user: UserDto = Depends(get_current_user),
+    service: GenerationJobService = Depends(get_generation_job_service),
+    listener: NotificationListener = Depends(get_notification_listener),
+):
+    """Stream progress updates of a generation job, e.g. after a reconnect."""
+    try:
+        job = await asyncio.to_thread(
+            service.get_job, job_id=job_id, project_id=project_id
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    label = job.task_type.removesuffix("_generation").replace("_", " ")
+    return StreamingResponse(
+        follow_job(service, listener, job_id, project_id, label),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -4,30 +4,30 @@ from collections.abc import AsyncGenerator
 
 from auth import get_current_user
 from dependencies import (
+    get_generation_job_service,
     get_mind_map_service,
+    get_notification_listener,
     get_usage_service,
 )
 from edu_core.exceptions import NotFoundError
 from edu_core.schemas.mind_maps import MindMapDto
 from edu_core.schemas.users import UserDto
-from edu_core.services import MindMapService, UsageService
+from edu_core.services import GenerationJobService, MindMapService, UsageService
+from edu_db.notifications import NotificationListener
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
 
+from routers.generation_jobs import (
+    SSE_HEADERS,
+    GenerationProgressUpdate,
+    format_progress,
+    queue_and_follow,
+)
 from routers.schemas import MindMapCreate
 
 router = APIRouter(prefix="/api/v1/projects/{project_id}/mind-maps", tags=["mind-maps"])
 
 
-class GenerationProgressUpdate(BaseModel):
-    """Progress update for generation streaming."""
-
-    status: str = Field(..., description="Status: searching, generating, saving, done")
-    message: str = Field(..., description="Progress message")
-    error: str | None = Field(None, description="Error message if any")
-
-
 @router.get("", response_model=list[MindMapDto])
 async def list_mind_maps(
     project_id: str,
@@ -101,8 +101,10 @@ async def create_mind_map_stream(
     current_user: UserDto = Depends(get_current_user),
     service: MindMapService = Depends(get_mind_map_service),
     usage_service: UsageService = Depends(get_usage_service),
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    listener: NotificationListener = Depends(get_notification_listener),
 ):
-    """Queue mind map generation request with streaming progress updates."""
+    """Queue mind map generation request and stream the worker's progress."""
 
     # Check usage limit before processing
     usage_service.check_and_increment(current_user.id, "mindmap_generation")
@@ -110,43 +112,34 @@ async def create_mind_map_stream(
     async def generate_stream() -> AsyncGenerator[bytes]:
         """Generate streaming progress updates"""
         try:
-            # Queuing request
-            progress = GenerationProgressUpdate(
-                status="queuing", message="Queuing mind map generation request..."
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
-
-            service.queue_generation(
-                user_id=current_user.id,
+            # The worker creates the mind map once it is generated; its ID is
+            # the target of the job being followed
+            async for event in queue_and_follow(
+                job_service,
+                listener,
+                enqueue=lambda: service.queue_generation(
+                    user_id=current_user.id,
+                    project_id=project_id,
+                    topic=request.title or request.custom_instructions or "",
+                    custom_instructions=request.custom_instructions
+                    or request.description,
+                ),
                 project_id=project_id,
-                topic=request.title or request.custom_instructions or "",
-                custom_instructions=request.custom_instructions or request.description,
-            )
-
-            # Done (queued)
-            progress = GenerationProgressUpdate(
-                status="done", message="Mind map generation request queued successfully"
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
+                label="mind map",
+            ):
+                yield event
 
         except NotFoundError as e:
             error_progress = GenerationProgressUpdate(
                 status="done", message="Error queuing mind map generation", error=str(e)
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
         except Exception as e:
             error_progress = GenerationProgressUpdate(
                 status="done", message="Error queuing mind map generation", error=str(e)
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
 
     return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
-        },
+        generate_stream(), media_type="text/event-stream", headers=SSE_HEADERS
     )
@@ -4,16 +4,24 @@ from collections.abc import AsyncGenerator
 
 from auth import get_current_user
 from dependencies import (
+    get_generation_job_service,
     get_note_service,
+    get_notification_listener,
 )
 from edu_core.exceptions import NotFoundError
 from edu_core.schemas.notes import NoteDto
 from edu_core.schemas.users import UserDto
-from edu_core.services import NoteService
+from edu_core.services import GenerationJobService, NoteService
+from edu_db.notifications import NotificationListener
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
 
+from routers.generation_jobs import (
+    SSE_HEADERS,
+    GenerationProgressUpdate,
+    format_progress,
+    queue_and_follow,
+)
 from routers.schemas import GenerateRequest, NoteCreate, NoteUpdate
 
 router = APIRouter(prefix="/api/v1/projects/{project_id}/notes", tags=["notes"])
@@ -107,14 +115,6 @@ async def delete_note(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-class GenerationProgressUpdate(BaseModel):
-    """Progress update for generation streaming."""
-
-    status: str = Field(..., description="Status: searching, generating, saving, done")
-    message: str = Field(..., description="Progress message")
-    error: str | None = Field(None, description="Error message if any")
-
-
 @router.post("/{note_id}/generate", response_model=NoteDto)
 async def generate_note(
     project_id: str,
@@ -125,13 +125,14 @@ async def generate_note(
 ):
     """Queue note generation request to be processed by a worker."""
     try:
-        return service.queue_generation(
+        note, _ = await service.queue_generation(
             note_id=note_id,
             project_id=project_id,
             topic=request.topic,
             custom_instructions=request.custom_instructions,
             user_id=current_user.id,
         )
+        return note
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -145,50 +146,40 @@ async def generate_note_stream(
     request: GenerateRequest,
     current_user: UserDto = Depends(get_current_user),
     service: NoteService = Depends(get_note_service),
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    listener: NotificationListener = Depends(get_notification_listener),
 ):
-    """Queue note generation request with streaming progress updates."""
+    """Queue note generation request and stream the worker's progress."""
 
     async def generate_stream() -> AsyncGenerator[bytes]:
         """Generate streaming progress updates"""
         try:
-            # Queuing request
-            progress = GenerationProgressUpdate(
-                status="queuing", message="Queuing note generation request..."
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
-
-            service.queue_generation(
-                note_id=note_id,
+            async for event in queue_and_follow(
+                job_service,
+                listener,
+                enqueue=lambda: service.queue_generation(
+                    note_id=note_id,
+                    project_id=project_id,
+                    topic=request.topic,
+                    custom_instructions=request.custom_instructions,
+                    user_id=current_user.id,
+                ),
                 project_id=project_id,
-                topic=request.topic,
-                custom_instructions=request.custom_instructions,
-                user_id=current_user.id,
-            )
-
-            # Done (queued)
-            progress = GenerationProgressUpdate(
-                status="done", message="Note generation request queued successfully"
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
+                label="note",
+            ):
+                yield event
 
         except NotFoundError as e:
             error_progress = GenerationProgressUpdate(
                 status="done", message="Error queuing note generation", error=str(e)
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
         except Exception as e:
             error_progress = GenerationProgressUpdate(
                 status="done", message="Error queuing note generation", error=str(e)
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
 
     return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
-        },
+        generate_stream(), media_type="text/event-stream", headers=SSE_HEADERS
     )
@@ -4,17 +4,25 @@ from collections.abc import AsyncGenerator
 
 from auth import get_current_user
 from dependencies import (
+    get_generation_job_service,
+    get_notification_listener,
     get_quiz_service,
     get_usage_service,
 )
 from edu_core.exceptions import NotFoundError
 from edu_core.schemas.quizzes import QuizDto, QuizQuestionDto
 from edu_core.schemas.users import UserDto
-from edu_core.services import QuizService, UsageService
+from edu_core.services import GenerationJobService, QuizService, UsageService
+from edu_db.notifications import NotificationListener
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
 
+from routers.generation_jobs import (
+    SSE_HEADERS,
+    GenerationProgressUpdate,
+    format_progress,
+    queue_and_follow,
+)
 from routers.schemas import (
     GenerateRequest,
     QuizCreate,
@@ -113,14 +121,6 @@ async def delete_quiz(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-class GenerationProgressUpdate(BaseModel):
-    """Progress update for generation streaming."""
-
-    status: str = Field(..., description="Status: searching, generating, saving, done")
-    message: str = Field(..., description="Progress message")
-    error: str | None = Field(None, description="Error message if any")
-
-
 @router.post("/{quiz_id}/generate", response_model=QuizDto)
 async def generate_quiz(
     project_id: str,
@@ -134,13 +134,14 @@ async def generate_quiz(
     # Check usage limit before processing
     usage_service.check_and_increment(current_user.id, "quiz_generation")
     try:
-        return service.queue_generation(
+        quiz, _ = await service.queue_generation(
             quiz_id=quiz_id,
             project_id=project_id,
             topic=request.topic,
             custom_instructions=request.custom_instructions,
             user_id=current_user.id,
         )
+        return quiz
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -155,54 +156,44 @@ async def generate_quiz_stream(
     current_user: UserDto = Depends(get_current_user),
     service: QuizService = Depends(get_quiz_service),
     usage_service: UsageService = Depends(get_usage_service),
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    listener: NotificationListener = Depends(get_notification_listener),
 ):
-    """Queue quiz generation request with streaming progress updates."""
+    """Queue quiz generation request and stream the worker's progress."""
     # Check usage limit before processing
     usage_service.check_and_increment(current_user.id, "quiz_generation")
 
     async def generate_stream() -> AsyncGenerator[bytes]:
         """Generate streaming progress updates"""
         try:
-            # Queuing request
-            progress = GenerationProgressUpdate(
-                status="queuing", message="Queuing quiz generation request..."
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
-
-            service.queue_generation(
-                quiz_id=quiz_id,
+            async for event in queue_and_follow(
+                job_service,
+                listener,
+                enqueue=lambda: service.queue_generation(
+                    quiz_id=quiz_id,
+                    project_id=project_id,
+                    topic=request.topic,
+                    custom_instructions=request.custom_instructions,
+                    user_id=current_user.id,
+                ),
                 project_id=project_id,
-                topic=request.topic,
-                custom_instructions=request.custom_instructions,
-                user_id=current_user.id,
-            )
-
-            # Done (queued)
-            progress = GenerationProgressUpdate(
-                status="done", message="Quiz generation request queued successfully"
-            )
-            yield f"data: {progress.model_dump_json()}\n\n".encode()
+                label="quiz",
+            ):
+                yield event
 
         except NotFoundError as e:
             error_progress = GenerationProgressUpdate(
                 status="done", message="Error queuing quiz generation", error=str(e)
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
         except Exception as e:
             error_progress = GenerationProgressUpdate(
                 status="done", message="Error queuing quiz generation", error=str(e)
             )
-            yield f"data: {error_progress.model_dump_json()}\n\n".encode()
+            yield format_progress(error_progress)
 
     return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
-        },
+        generate_stream(), media_type="text/event-stream", headers=SSE_HEADERS
     )
 
 
@@ -1,6 +1,8 @@
+import asyncio
 from uuid import uuid4
 
 from config import get_settings
+from edu_queue.backends import create_queue_backend
 from edu_queue.schemas import (
     FlashcardGenerationData,
     QueueTaskMessage,
@@ -12,13 +14,18 @@ from rich.console import Console
 console = Console(force_terminal=True)
 
 
-def main():
+async def main():
     settings = get_settings()
 
     console.print("[bold green]Edu API started[/bold green]")
 
+    backend = create_queue_backend(
+        settings.queue_backend,
+        azure_storage_connection_string=settings.azure_storage_connection_string,
+        database_url=settings.database_url,
+    )
     queue_svc = QueueService(
-        connection_string=settings.azure_storage_connection_string,
+        backend=backend,
         queue_name="ai-generation-tasks",  # Make sure this queue exists in Azure/Azurite
     )
 
@@ -40,10 +47,11 @@ def main():
 
     console.print(f"[bold blue]Sending task payload:[/bold blue] {task_message}")
 
-    queue_svc.send_message(task_message)
+    await queue_svc.send_message(task_message)
+    await backend.aclose()
 
     console.print("[bold green]Task message sent to queue successfully![/bold green]")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+import {
+  documentsRemoteAtom,
+  refreshDocumentAtom,
+} from '@/data-acess/document'
+import { flashcardGroupsAtom } from '@/data-acess/flashcard'
+import { mindMapsAtom } from '@/data-acess/mind-map'
+import { notesAtom } from '@/data-acess/note'
+import { quizzesAtom } from '@/data-acess/quiz'
+import { ApiClientService } from '@/integrations/api/http'
+import { Atom, Registry } from '@effect-atom/atom-react'
+import { Effect, Schedule, Schema, Stream } from 'effect'
+
+const RECONNECT_DELAY = '3 seconds'
+
+const ProjectResourceType = Schema.Literal(
+  'document',
+  'quiz',
+  'flashcard_group',
+  'note',
+  'mind_map',
+)
+
+const ProjectEvent = Schema.Struct({
+  type: Schema.Literal(
+    'document_status_changed',
+    'resource_created',
+    'generation_finished',
+    'resync',
+  ),
+  project_id: Schema.String,
+  resource_type: Schema.NullishOr(ProjectResourceType),
+  resource_id: Schema.NullishOr(Schema.String),
+  status: Schema.NullishOr(Schema.String),
+  error: Schema.NullishOr(Schema.String),
+})
+type ProjectEvent = typeof ProjectEvent.Type
+
+const refreshResources = (
+  registry: Registry.Registry,
+  projectId: string,
+  resourceType: typeof ProjectResourceType.Type,
+) => {
+  switch (resourceType) {
+    case 'document':
+      registry.refresh(documentsRemoteAtom(projectId))
+      break
+    case 'quiz':
+      registry.refresh(quizzesAtom(projectId))
+      break
+    case 'flashcard_group':
+      registry.refresh(flashcardGroupsAtom(projectId))
+      break
+    case 'note':
+      registry.refresh(notesAtom(projectId))
+      break
+    case 'mind_map':
+      registry.refresh(mindMapsAtom(projectId))
+      break
+  }
+}
+
+const refreshAll = (registry: Registry.Registry, projectId: string) => {
+  for (const resourceType of ProjectResourceType.literals) {
+    refreshResources(registry, projectId, resourceType)
+  }
+}
+
+const handleEvent = (
+  registry: Registry.Registry,
+  projectId: string,
+  event: ProjectEvent,
+) => {
+  switch (event.type) {
+    case 'document_status_changed':
+      if (event.resource_id) {
+        registry.set(refreshDocumentAtom, {
+          projectId,
+          documentId: event.resource_id,
+        })
+      }
+      break
+    case 'resource_created':
+    case 'generation_finished':
+      if (event.resource_type) {
+        refreshResources(registry, projectId, event.resource_type)
+      }
+      break
+    case 'resync':
+      refreshAll(registry, projectId)
+      break
+  }
+}
+
+/**
+ * Follows the project's event stream while mounted and refreshes whatever
+ * changed: document statuses, new resources and finished generations.
+ * After a dropped connection everything is refreshed, since events may
+ * have been missed in between.
+ */
+export const projectEventsAtom = Atom.family((projectId: string) => {
+  let connectedBefore = false
+
+  return Atom.make(
+    Effect.gen(function* () {
+      const registry = yield* Registry.AtomRegistry
+      const { httpClient } = yield* ApiClientService
+      const resp = yield* httpClient.get(
+        `/api/v1/projects/${projectId}/events`,
+      )
+
+      if (connectedBefore) {
+        refreshAll(registry, projectId)
+      }
+      connectedBefore = true
+
+      yield* resp.stream.pipe(
+        Stream.decodeText(),
+        Stream.splitLines,
+        Stream.filter((line) => line.startsWith('data: ')),
+        Stream.map((line) => line.slice(6)),
+        Stream.mapEffect((line) =>
+          Schema.decodeUnknown(Schema.parseJson(ProjectEvent))(line),
+        ),
+        Stream.runForEach((event) =>
+          Effect.sync(() => handleEvent(registry, projectId, event)),
+        ),
+      )
+    }).pipe(
+      // Reconnect whenever the stream ends or fails
+      Effect.either,
+      Effect.repeat(Schedule.spaced(RECONNECT_DELAY)),
+      Effect.provide(ApiClientService.Default),
+    ),
+  )
+})
@@ -34,6 +34,7 @@ type Props = {
 
 const getDocumentStatus = (
   status: typeof DocumentStatus.Type,
+  indexingProgress?: number | null,
 ): {
   label: string
   variant: 'default' | 'secondary' | 'destructive' | 'outline'
@@ -47,6 +48,12 @@ const getDocumentStatus = (
         variant: 'secondary',
         icon: Loader2Icon,
       }
+    case 'partially_indexed':
+      return {
+        label: `Indexing ${indexingProgress ?? 0}%`,
+        variant: 'outline',
+        icon: CheckCircle2Icon,
+      }
     case 'processed':
     case 'indexed':
       return {
@@ -70,7 +77,10 @@ const getDocumentStatus = (
 }
 
 export const DocumentListItem = ({ document }: Props) => {
-  const statusInfo = getDocumentStatus(document.status)
+  const statusInfo = getDocumentStatus(
+    document.status,
+    document.indexing_progress,
+  )
   const StatusIcon = statusInfo.icon
 
   const deleteDocument = useAtomSet(deleteDocumentAtom, { mode: 'promise' })
@@ -4,7 +4,7 @@ import { documentsAtom, refreshDocumentsAtom } from '@/data-acess/document'
 import { currentProjectIdAtom } from '@/data-acess/project'
 import { studyResourcesAtom } from '@/data-acess/study-resources'
 import { useUploadDocumentDialog } from '@/features/document/components/upload-document-dialog'
-import { useDocumentPolling } from '@/hooks/use-document-polling'
+import { useProjectEvents } from '@/hooks/use-project-events'
 import { cn } from '@/lib/utils'
 import { Result, useAtomSet, useAtomValue } from '@effect-atom/atom-react'
 import { useNavigate } from '@tanstack/react-router'
@@ -256,8 +256,8 @@ export const ProjectDetailPage = ({ projectId }: ProjectDetailPageProps) => {
     setCurrentProject(projectId)
   }, [projectId, setCurrentProject])
 
-  // Poll for document status updates when documents are not ready
-  useDocumentPolling(projectId)
+  // Refresh documents and study resources as the project changes
+  useProjectEvents(projectId)
 
   return (
     <div className="flex h-full flex-col max-h-screen">
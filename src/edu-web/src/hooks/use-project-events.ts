@@ -0,0 +1,10 @@
+import { projectEventsAtom } from '@/data-acess/project-events'
+import { useAtomMount } from '@effect-atom/atom-react'
+
+/**
+ * Hook that keeps the project's documents and study resources up to date
+ * from the project event stream while the component is mounted
+ */
+export const useProjectEvents = (projectId: string) => {
+  useAtomMount(projectEventsAtom(projectId))
+}
@@ -102,6 +102,7 @@ export class DocumentStatus extends S.Literal(
   'uploaded',
   'processing',
   'processed',
+  'partially_indexed',
   'indexed',
   'failed',
 ) {}
@@ -132,9 +133,16 @@ export class DocumentDto extends S.Class<DocumentDto>('DocumentDto')({
    */
   file_size: S.Int.pipe(S.greaterThan(0)),
   /**
-   * Document processing status: uploaded, processing, processed, failed, indexed
+   * Document processing status: uploaded, processing, processed, partially_indexed, failed, indexed
    */
   status: DocumentStatus,
+  /**
+   * Percentage of the document's segments that are already searchable
+   */
+  indexing_progress: S.optionalWith(
+    S.Int.pipe(S.greaterThanOrEqualTo(0), S.lessThanOrEqualTo(100)),
+    { nullable: true },
+  ),
   /**
    * Auto-generated summary of the document
    */
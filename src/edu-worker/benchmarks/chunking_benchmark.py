@@ -0,0 +1,140 @@
+"""Benchmark chunking throughput on a synthetic 1,000-page markdown document.
+
+Compares the previous approach (character-sized chunks, splitters rebuilt for
+every document, pages split serially) with the ChunkingEngine on a thread and
+on a process pool.
+
+Run from src/edu-worker:
+    python -m benchmarks.chunking_benchmark --pages 1000 --runs 3
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chunking import ChunkingEngine
+from extractors.base import PAGE_BREAK
+from langchain_text_splitters import (
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+)
+
+WORDS = [
+    "photosynthesis",
+    "chlorophyll",
+    "membrane",
+    "enzyme",
+    "equilibrium",
+    "derivative",
+    "integral",
+    "vector",
+    "matrix",
+    "theorem",
+    "hypothesis",
+    "experiment",
+    "variable",
+    "function",
+    "molecule",
+    "energy",
+    "momentum",
+    "velocity",
+    "acceleration",
+    "revolution",
+    "treaty",
+    "parliament",
+    "economy",
+]
+
+
+def build_fixture(pages: int, seed: int = 42) -> str:
+    """Build a deterministic markdown document with headers, lists and tables."""
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))) + "."
+
+    rendered = []
+    for page in range(1, pages + 1):
+        blocks = [f"# Chapter {page // 20 + 1}", f"## Section {page}"]
+        for sub in range(3):
+            blocks.append(f"### Topic {page}.{sub + 1}")
+            blocks.append(" ".join(sentence() for _ in range(rng.randint(4, 10))))
+            blocks.append("\n".join(f"- {sentence()}" for _ in range(3)))
+        blocks.append("| Term | Definition |\n| --- | --- |")
+        blocks.extend(f"| {rng.choice(WORDS)} | {sentence()} |" for _ in range(4))
+        rendered.append("\n\n".join(blocks))
+    return f"\n{PAGE_BREAK}\n".join(rendered)
+
+
+def legacy_split(text: str) -> list[str]:
+    """The per-document splitting used before the ChunkingEngine."""
+    pages = [p.strip() for p in text.split(PAGE_BREAK) if p.strip()]
+    header_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=[("#", "h1"), ("##", "h2"), ("###", "h3")]
+    )
+    chunker = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks: list[str] = []
+    for page in pages:
+        sections = header_splitter.split_text(page)
+        chunks.extend(d.page_content for d in chunker.split_documents(sections))
+    return chunks
+
+
+def timed(label: str, pages: int, runs: int, func) -> None:
+    durations = []
+    chunks = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        chunks = func()
+        durations.append(time.perf_counter() - start)
+    best = min(durations)
+    print(
+        f"{label:<28} best {best:7.3f}s  "
+        f"{pages / best:8.1f} pages/s  {len(chunks):6d} chunks"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--encoding", default="cl100k_base")
+    args = parser.parse_args()
+
+    text = build_fixture(args.pages)
+    print(f"Fixture: {args.pages} pages, {len(text):,} characters\n")
+
+    timed("legacy (chars, rebuilt)", args.pages, args.runs, lambda: legacy_split(text))
+
+    serial = ChunkingEngine(encoding_name=args.encoding)
+    # The first call builds and caches the encoding and splitters
+    serial.split(text[:1000])
+    timed(
+        "engine (thread)",
+        args.pages,
+        args.runs,
+        lambda: asyncio.run(serial.asplit(text)),
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=args.processes, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        parallel = ChunkingEngine(
+            encoding_name=args.encoding, executor=executor, parallel_page_threshold=1
+        )
+        # Warm up the pool processes so start-up cost is not measured
+        asyncio.run(parallel.asplit(text))
+        timed(
+            f"engine ({args.processes} processes)",
+            args.pages,
+            args.runs,
+            lambda: asyncio.run(parallel.asplit(text)),
+        )
+
+
+if __name__ == "__main__":
+    main()
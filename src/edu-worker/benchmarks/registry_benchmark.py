@@ -0,0 +1,98 @@
+"""Benchmark per-message processor overhead of the ProcessorRegistry.
+
+Compares the previous approach (every processor and its clients built for
+every message) with the cached registry, where a processor is built on the
+first message of its task type and reused afterwards. No network calls are
+made: the clients are constructed but never used.
+
+Run from src/edu-worker:
+    python -m benchmarks.registry_benchmark --messages 200
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chunking import ChunkingEngine
+from edu_queue.schemas import TaskType
+from memory_budget import MemoryBudget
+from processors.registry import ProcessorRegistry, console
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=benchmark;"
+    "AccountKey=YmVuY2htYXJr;EndpointSuffix=core.windows.net"
+)
+
+
+def create_registry(executor: ThreadPoolExecutor) -> ProcessorRegistry:
+    return ProcessorRegistry(
+        search_service=None,
+        azure_openai_chat_deployment="gpt-4o-mini",
+        azure_openai_endpoint="https://benchmark.openai.azure.com",
+        azure_openai_api_version="2024-12-01-preview",
+        azure_storage_connection_string=CONNECTION_STRING,
+        azure_storage_input_container_name="input",
+        azure_storage_output_container_name="output",
+        azure_cu_endpoint="https://benchmark.cognitiveservices.azure.com",
+        azure_cu_key="benchmark",
+        azure_cu_analyzer_id="prebuilt-documentAnalyzer",
+        azure_cu_max_connections=50,
+        azure_cu_poll_timeout_seconds=180,
+        azure_openai_embedding_deployment="text-embedding-3-large",
+        memory_budget=MemoryBudget(512 * 1024 * 1024),
+        document_spool_max_memory_bytes=16 * 1024 * 1024,
+        chunking_engine=ChunkingEngine(),
+        embedding_batch_size=64,
+        pdf_shard_min_pages=100,
+        pdf_shard_pages=50,
+        pdf_shard_concurrency=4,
+        pdf_shard_max_retries=2,
+        cpu_executor=executor,
+    )
+
+
+def report(label: str, durations: list[float]) -> None:
+    durations = sorted(durations)
+    mean = sum(durations) / len(durations)
+    p95 = durations[int(len(durations) * 0.95) - 1]
+    print(
+        f"{label:<26} mean {mean * 1000:9.3f}ms  "
+        f"p95 {p95 * 1000:9.3f}ms  max {durations[-1] * 1000:9.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    task_types = list(TaskType)
+    console.quiet = True
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        start = time.perf_counter()
+        registry = create_registry(executor)
+        print(f"Registry startup: {(time.perf_counter() - start) * 1000:.3f}ms\n")
+
+        # Before: a fresh set of processors and clients for every message
+        rebuilt = []
+        for index in range(args.messages):
+            start = time.perf_counter()
+            fresh = create_registry(executor)
+            for task_type in task_types:
+                fresh.get_processor(task_type)
+            fresh.get_processor(task_types[index % len(task_types)])
+            rebuilt.append(time.perf_counter() - start)
+        report("rebuilt per message", rebuilt)
+
+        # After: processors built on first use and reused
+        cached = []
+        for index in range(args.messages):
+            start = time.perf_counter()
+            registry.get_processor(task_types[index % len(task_types)])
+            cached.append(time.perf_counter() - start)
+        report("cached (incl. first use)", cached)
+        report("cached (steady state)", cached[len(task_types) :])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Token-aware markdown chunking for document indexing."""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import lru_cache
+
+import tiktoken
+from extractors.base import PAGE_BREAK
+from langchain_text_splitters import (
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+)
+
+DEFAULT_ENCODING_NAME = "cl100k_base"
+HEADERS_TO_SPLIT_ON = [("#", "h1"), ("##", "h2"), ("###", "h3")]
+
+
+@lru_cache
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    return tiktoken.get_encoding(encoding_name)
+
+
+@lru_cache
+def _get_splitters(
+    encoding_name: str, chunk_size: int, chunk_overlap: int
+) -> tuple[MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter]:
+    """Build the splitters once per configuration (and once per pool process).
+
+    Both splitters are stateless after construction, so the cached instances
+    are shared between threads.
+    """
+    encoding = _get_encoding(encoding_name)
+
+    def token_length(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    header_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=HEADERS_TO_SPLIT_ON
+    )
+    chunker = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=token_length,
+    )
+    return header_splitter, chunker
+
+
+def split_pages(
+    pages: list[tuple[int, str]],
+    encoding_name: str,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> list[tuple[int, list[str]]]:
+    """Split pages into token-sized chunks.
+
+    Module-level so it can be sent to a process pool.
+
+    Args:
+        pages: (page number, page markdown) pairs
+        encoding_name: tiktoken encoding used to measure chunks
+        chunk_size: Maximum chunk size in tokens
+        chunk_overlap: Overlap between consecutive chunks in tokens
+
+    Returns:
+        (page number, chunks) pairs in input order
+    """
+    header_splitter, chunker = _get_splitters(encoding_name, chunk_size, chunk_overlap)
+
+    result = []
+    for page_number, page in pages:
+        sections = header_splitter.split_text(page)
+        chunks = [d.page_content for d in chunker.split_documents(sections)]
+        result.append((page_number, chunks))
+    return result
+
+
+class ChunkingEngine:
+    """Splits analyzed markdown into chunks sized in embedding-model tokens.
+
+    Pages are split on ``PAGE_BREAK`` markers, then on markdown headers, then
+    recursively down to ``chunk_size`` tokens. Documents with at least
+    ``parallel_page_threshold`` pages are split in contiguous page batches on
+    ``executor`` (a process pool); smaller documents are split on a thread so
+    the event loop is never blocked.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 256,
+        chunk_overlap: int = 48,
+        encoding_name: str = DEFAULT_ENCODING_NAME,
+        executor: Executor | None = None,
+        parallel_page_threshold: int = 200,
+        pages_per_batch: int = 50,
+    ):
+        """Initialize the engine.
+
+        Args:
+            chunk_size: Maximum chunk size in tokens
+            chunk_overlap: Overlap between consecutive chunks in tokens
+            encoding_name: tiktoken encoding of the embedding model
+            executor: Process pool for large documents, or None to always
+                split on a thread
+            parallel_page_threshold: Minimum page count for using the executor
+            pages_per_batch: Pages sent to the executor per task
+        """
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.encoding_name = encoding_name
+        self.executor = executor
+        self.parallel_page_threshold = parallel_page_threshold
+        self.pages_per_batch = pages_per_batch
+
+    @staticmethod
+    def get_pages(text: str, delimiter: str = PAGE_BREAK) -> list[tuple[int, str]]:
+        """Split markdown into non-empty pages, keeping their 1-based page numbers.
+
+        Args:
+            text: Markdown content
+            delimiter: Page break delimiter
+
+        Returns:
+            (page number, page markdown) pairs
+        """
+        pages = []
+        for index, page in enumerate(text.split(delimiter), start=1):
+            page = page.strip()
+            if page:
+                pages.append((index, page))
+        return pages
+
+    def split(self, text: str) -> list[str]:
+        """Split markdown synchronously on the calling thread.
+
+        Args:
+            text: Markdown content
+
+        Returns:
+            List of text chunks
+        """
+        pages = split_pages(
+            self.get_pages(text),
+            self.encoding_name,
+            self.chunk_size,
+            self.chunk_overlap,
+        )
+        return [chunk for _, chunks in pages for chunk in chunks]
+
+    async def asplit_pages(self, text: str) -> list[tuple[int, list[str]]]:
+        """Split markdown off the event loop, keeping chunks grouped by page.
+
+        Args:
+            text: Markdown content
+
+        Returns:
+            (page number, chunks) pairs in page order
+        """
+        pages = self.get_pages(text)
+        args = (self.encoding_name, self.chunk_size, self.chunk_overlap)
+
+        if self.executor is None or len(pages) < self.parallel_page_threshold:
+            return await asyncio.to_thread(split_pages, pages, *args)
+
+        loop = asyncio.get_running_loop()
+        batches = [
+            pages[i : i + self.pages_per_batch]
+            for i in range(0, len(pages), self.pages_per_batch)
+        ]
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, split_pages, batch, *args)
+                for batch in batches
+            )
+        )
+        return [page for batch in results for page in batch]
+
+    async def asplit(self, text: str) -> list[str]:
+        """Split markdown off the event loop.
+
+        Args:
+            text: Markdown content
+
+        Returns:
+            List of text chunks in document order
+        """
+        pages = await self.asplit_pages(text)
+        return [chunk for _, chunks in pages for chunk in chunks]
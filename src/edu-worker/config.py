@@ -1,6 +1,8 @@
 from functools import lru_cache
 
+from edu_core.events import EventBusKind
 from edu_core.keyvault import KeyVaultSettingsSource
+from edu_queue.backends import QueueBackendKind
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,25 +15,110 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # Task queue backend: "azure" (Storage Queues) or "postgres" (the database)
+    queue_backend: QueueBackendKind = "azure"
+    # Project events pushed to clients: "postgres" (NOTIFY, shared with the
+    # worker) or "memory" (only events raised in the same process)
+    event_bus: EventBusKind = "postgres"
+
     # Azure Storage connection string
     azure_storage_connection_string: str = ""
+    # Base name of the lane queues ("<name>-interactive", "-indexing", "-bulk")
     azure_storage_queue_name: str = "ai-generation-tasks"
+    # Messages that exhausted their attempts, kept until replayed
+    azure_storage_dead_letter_queue_name: str = "ai-generation-tasks-poison"
     azure_storage_input_container_name: str = "input"
     azure_storage_output_container_name: str = "output"
+    # Oversized task messages enqueued by the API as claim checks
+    azure_storage_queue_payloads_container_name: str = "queue-payloads"
+    # Document contents downloaded at the same time, e.g. for topic graphs
+    contents_download_concurrency: int = 8
+    # Local disk cache of downloaded contents, revalidated with the blob's
+    # ETag; 0 disables it. Empty directory: one in the system temp directory
+    contents_cache_max_bytes: int = 256 * 1024 * 1024
+    contents_cache_dir: str = ""
+
+    # Message concurrency: messages processed at once on the event loop and
+    # messages received ahead of a free slot per lane
+    worker_max_concurrency: int = 5
+    worker_prefetch_count: int = 2
+    # Lanes are scheduled by weight when several have messages waiting; each
+    # lane runs at most its own cap. A lane with weight 0 is not consumed.
+    worker_lane_weights: dict[str, int] = {
+        "interactive": 6,
+        "indexing": 3,
+        "bulk": 1,
+    }
+    worker_lane_max_concurrency: dict[str, int] = {
+        "interactive": 5,
+        "indexing": 3,
+        "bulk": 2,
+    }
+    worker_visibility_timeout_seconds: int = 300
+    # Held messages have their visibility renewed on this interval, so a long
+    # task is never redelivered while it still runs
+    worker_lease_renew_interval_seconds: int = 60
+    # Deliveries allowed before a message is moved to the dead-letter queue
+    worker_max_attempts: int = 5
+    worker_poll_interval_seconds: float = 1.0
+    # Processing time allowed per task type before the processor is cancelled
+    # and the attempt fails; other types get the default
+    worker_task_timeout_seconds: dict[str, float] = {
+        "document_processing": 1800,
+        "chat_title_generation": 60,
+    }
+    worker_default_task_timeout_seconds: float = 600
+    # On SIGTERM, messages still running get this long to finish before they
+    # are cancelled and released to other workers; keep it below the
+    # platform's termination grace period
+    worker_drain_timeout_seconds: float = 90
+    # Threads for blocking SDK calls and for CPU-bound parsing, respectively
+    worker_io_threads: int = 32
+    worker_cpu_threads: int = 2
+
+    # Document processing memory limits
+    document_memory_budget_bytes: int = 512 * 1024 * 1024
+    document_spool_max_memory_bytes: int = 16 * 1024 * 1024
+
+    # Chunking (sizes are in tokens of the embedding model's encoding)
+    chunk_size_tokens: int = 256
+    chunk_overlap_tokens: int = 48
+    chunking_encoding_name: str = "cl100k_base"
+    chunking_parallel_page_threshold: int = 200
+    chunking_max_processes: int = 2
 
-    # Azure Content Understanding
     azure_cu_endpoint: str = ""
     azure_cu_key: str = ""
     azure_cu_analyzer_id: str = "prebuilt-documentAnalyzer"
+    azure_cu_max_connections: int = 50
+    azure_cu_poll_timeout_seconds: int = 180
+    # PDFs with at least this many pages are analyzed in page-range shards
+    pdf_shard_min_pages: int = 100
+    pdf_shard_pages: int = 50
+    pdf_shard_concurrency: int = 4
+    pdf_shard_max_retries: int = 2
 
     # Azure OpenAI
     azure_openai_endpoint: str = ""
     azure_openai_chat_deployment: str = "gpt-4o-mini"
     azure_openai_embedding_deployment: str = "text-embedding-3-large"
     azure_openai_api_version: str = "2024-12-01-preview"
+    # Segments embedded and committed per batch during progressive indexing
+    embedding_batch_size: int = 64
+    # Build and cache a project's topic graph on the bulk lane whenever a
+    # document is indexed, so the next generation finds it ready
+    topic_graph_precompute: bool = True
 
     # Database
     database_url: str = ""
+    database_pool_size: int = 10
+    database_max_overflow: int = 5
+    database_pool_timeout_seconds: int = 30
+
+    # Monitoring port serving /metrics (Prometheus) and /ready; 0 disables it
+    metrics_port: int = 9100
+    # Seconds between samples of the lane queue depths
+    metrics_queue_depth_interval_seconds: float = 15.0
 
     @classmethod
     def settings_customise_sources(
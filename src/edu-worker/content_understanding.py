@@ -1,17 +1,33 @@
 """Azure Content Understanding client for document analysis."""
 
+import asyncio
+import os
 import time
+from collections.abc import AsyncIterator
 from pathlib import Path
+from typing import BinaryIO
 
-import requests
-from requests.models import Response
+import httpx
 
 DEFAULT_API_VERSION = "2025-05-01-preview"
 DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_MAX_CONNECTIONS = 50
+
+# Size of each read when streaming a file to the analyze endpoint
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Status codes that mean "slow down and try again"
+RETRYABLE_STATUS_CODES = {429, 503}
 
 
 class AzureContentUnderstandingClient:
-    """Client for interacting with the Azure Content Understanding service."""
+    """Async client for interacting with the Azure Content Understanding service.
+
+    A single instance keeps a pooled HTTP/1.1 connection set to the endpoint, so
+    one worker can keep many analyses in flight without a thread per document.
+    All operations are coroutines and can be cancelled; cancelling a poll stops
+    waiting for the operation and releases its connection.
+    """
 
     def __init__(
         self,
@@ -21,6 +37,7 @@ class AzureContentUnderstandingClient:
         token_provider: callable = lambda: None,
         x_ms_useragent: str = "data-extraction-code",
         timeout: int = DEFAULT_TIMEOUT_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ):
         """Constructor for Azure Content Understanding client.
 
@@ -31,6 +48,7 @@ class AzureContentUnderstandingClient:
             token_provider: Optional token provider function
             x_ms_useragent: User agent string
             timeout: Request timeout in seconds
+            max_connections: Size of the connection pool to the endpoint
 
         Raises:
             ValueError: If neither subscription_key nor token_provider is provided,
@@ -50,7 +68,18 @@ class AzureContentUnderstandingClient:
         self._headers = self._get_headers(
             subscription_key, token_provider(), x_ms_useragent
         )
-        self._timeout = timeout
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
 
     def _get_analyze_url(self, endpoint, api_version, analyzer_id):
         return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}:analyze?api-version={api_version}"
@@ -74,45 +103,60 @@ class AzureContentUnderstandingClient:
         headers["x-ms-useragent"] = x_ms_useragent
         return headers
 
-    def begin_analyze_data(self, analyzer_id: str, data: bytes | dict, **kwargs):
-        """Begins the analysis of bytes or dictionary data using the specified analyzer.
+    async def begin_analyze_data(
+        self,
+        analyzer_id: str,
+        data: bytes | BinaryIO | dict,
+        max_retries: int = 5,
+        **kwargs,
+    ) -> httpx.Response:
+        """Begins the analysis of bytes, a file or dictionary data using the specified analyzer.
+
+        Throttled requests (429/503) are retried after the delay the service asks
+        for in ``Retry-After``.
 
         Args:
             analyzer_id: The ID of the analyzer to use.
-            data: The data to analyze, either as bytes or a dictionary.
+            data: The data to analyze, either as bytes, a binary file (streamed
+                from its current position) or a dictionary.
+            max_retries: Maximum number of retries for throttled requests.
             **kwargs: Additional keyword arguments, such as headers.
 
         Returns:
             Response: The response from the analysis request.
 
         Raises:
-            HTTPError: If the HTTP request returned an unsuccessful status code.
+            HTTPStatusError: If the HTTP request returned an unsuccessful status code.
         """
         headers = kwargs.get("headers", {"Content-Type": "application/octet-stream"})
-        headers.update(self._headers)
-        if isinstance(data, dict):
-            response = requests.post(
-                url=self._get_analyze_url(
-                    self._endpoint, self._api_version, analyzer_id
-                ),
-                headers=headers,
-                json=data,
-                timeout=self._timeout,
-            )
-        else:
-            response = requests.post(
-                url=self._get_analyze_url(
-                    self._endpoint, self._api_version, analyzer_id
-                ),
-                headers=headers,
-                data=data,
-                timeout=self._timeout,
-            )
+        url = self._get_analyze_url(self._endpoint, self._api_version, analyzer_id)
+        start_position = None if isinstance(data, bytes | dict) else data.tell()
+
+        for attempt in range(max_retries + 1):
+            if isinstance(data, dict):
+                request_kwargs = {"json": data}
+            elif isinstance(data, bytes):
+                request_kwargs = {"content": data}
+            else:
+                data.seek(start_position)
+                size = data.seek(0, os.SEEK_END) - start_position
+                data.seek(start_position)
+                # An explicit Content-Length avoids chunked transfer encoding
+                headers = {**headers, "Content-Length": str(size)}
+                request_kwargs = {"content": self._iter_file(data)}
+
+            response = await self._client.post(url, headers=headers, **request_kwargs)
+            if (
+                response.status_code not in RETRYABLE_STATUS_CODES
+                or attempt == max_retries
+            ):
+                break
+            await asyncio.sleep(self._get_retry_after(response, default=2**attempt))
 
         response.raise_for_status()
         return response
 
-    def begin_analyze_file(self, analyzer_id: str, file_location: str):
+    async def begin_analyze_file(self, analyzer_id: str, file_location: str):
         """Begins the analysis of a file or URL using the specified analyzer.
 
         Args:
@@ -124,35 +168,47 @@ class AzureContentUnderstandingClient:
 
         Raises:
             ValueError: If the file location is not a valid path or URL.
-            HTTPError: If the HTTP request returned an unsuccessful status code.
+            HTTPStatusError: If the HTTP request returned an unsuccessful status code.
         """
-        data = None
         if Path(file_location).exists():
             with open(file_location, "rb") as file:
-                data = file.read()
-            headers = {"Content-Type": "application/octet-stream"}
+                return await self.begin_analyze_data(
+                    analyzer_id,
+                    file,
+                    headers={"Content-Type": "application/octet-stream"},
+                )
         elif "https://" in file_location or "http://" in file_location:
-            data = {"url": file_location}
-            headers = {"Content-Type": "application/json"}
+            return await self.begin_analyze_data(
+                analyzer_id,
+                {"url": file_location},
+                headers={"Content-Type": "application/json"},
+            )
         else:
             raise ValueError("File location must be a valid path or URL.")
 
-        return self.begin_analyze_data(analyzer_id, data, headers=headers)
-
-    def poll_result(
+    async def poll_result(
         self,
-        response: Response,
+        response: httpx.Response,
         timeout_seconds: int = 180,
-        polling_interval_seconds: int = 2,
+        polling_interval_seconds: float = 1.0,
+        max_polling_interval_seconds: float = 15.0,
+        backoff_factor: float = 1.5,
     ):
         """Polls the result of an asynchronous operation until it completes or times out.
 
+        The wait between polls starts at ``polling_interval_seconds`` and grows by
+        ``backoff_factor`` up to ``max_polling_interval_seconds``. A ``Retry-After``
+        header on any poll response takes precedence over the computed interval.
+
         Args:
             response: The initial response object containing the operation location.
             timeout_seconds: The maximum number of seconds to wait for the operation to complete.
                 Defaults to 180.
-            polling_interval_seconds: The number of seconds to wait between polling attempts.
-                Defaults to 2.
+            polling_interval_seconds: The initial number of seconds to wait between polling
+                attempts. Defaults to 1.
+            max_polling_interval_seconds: Upper bound for the wait between polls.
+                Defaults to 15.
+            backoff_factor: Multiplier applied to the wait after each poll. Defaults to 1.5.
 
         Raises:
             ValueError: If the operation location is not found in the response headers.
@@ -166,24 +222,47 @@ class AzureContentUnderstandingClient:
         if not operation_location:
             raise ValueError("Operation location not found in response headers.")
 
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
-
-        start_time = time.time()
+        interval = self._get_retry_after(response, default=polling_interval_seconds)
+        deadline = time.monotonic() + timeout_seconds
         while True:
-            elapsed_time = time.time() - start_time
-            if elapsed_time > timeout_seconds:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise TimeoutError(
                     f"Operation timed out after {timeout_seconds:.2f} seconds."
                 )
+            await asyncio.sleep(min(interval, remaining))
 
-            response = requests.get(
-                operation_location, headers=self._headers, timeout=self._timeout
-            )
+            response = await self._client.get(operation_location)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                interval = self._get_retry_after(response, default=interval)
+                continue
             response.raise_for_status()
-            status = response.json().get("status").lower()
+
+            result = response.json()
+            status = result.get("status").lower()
             if status == "succeeded":
-                return response.json()
+                return result
             elif status == "failed":
                 raise RuntimeError("Request failed.")
-            time.sleep(polling_interval_seconds)
+
+            interval = self._get_retry_after(
+                response,
+                default=min(interval * backoff_factor, max_polling_interval_seconds),
+            )
+
+    @staticmethod
+    async def _iter_file(file: BinaryIO) -> AsyncIterator[bytes]:
+        """Yield a file's remaining content in chunks."""
+        while chunk := file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    @staticmethod
+    def _get_retry_after(response: httpx.Response, default: float) -> float:
+        """Read the Retry-After delay in seconds from a response, if present."""
+        retry_after = response.headers.get("retry-after")
+        if retry_after is None:
+            return default
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            return default
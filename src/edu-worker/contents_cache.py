@@ -0,0 +1,81 @@
+"""Size-bounded disk cache of document contents, revalidated by ETag."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from edu_core.services.document_contents import ContentsCache
+from metrics import CACHE_REQUESTS
+
+
+class DiskContentsCache(ContentsCache):
+    """Keeps recently used contents blobs on local disk.
+
+    Entries are files named by the hash of their key. The least recently used
+    entries are evicted once the files exceed ``max_bytes``. The index of
+    entries and their ETags lives in memory, so files left by an earlier run
+    are deleted on startup.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        """Initialize the cache and clear the directory.
+
+        Args:
+            directory: Directory holding the cached files; created if missing
+            max_bytes: Total size of the cached files; larger blobs are never
+                cached
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob("*.bin"):
+            path.unlink(missing_ok=True)
+
+        # Key -> (ETag, size), least recently used first
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.bin"
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        etag = entry[0]
+        try:
+            # Outside the lock; an entry evicted meanwhile is simply a miss
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+        return etag, data
+
+    def put(self, key: str, etag: str, data: bytes) -> None:
+        CACHE_REQUESTS.labels(cache="document_contents", result="miss").inc()
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            os.replace(temp_path, path)
+            self._entries[key] = (etag, len(data))
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def mark_fresh(self, key: str) -> None:
+        CACHE_REQUESTS.labels(cache="document_contents", result="hit").inc()
+
+    def _evict(self, key: str) -> None:
+        """Remove an entry and its file; the lock must be held."""
+        self._size -= self._entries.pop(key)[1]
+        self._path(key).unlink(missing_ok=True)
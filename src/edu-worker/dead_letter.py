@@ -0,0 +1,149 @@
+"""Dead-letter queue for messages the worker gave up on."""
+
+import base64
+import contextlib
+import json
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from edu_queue.backends import MessageNotFoundError, MessageQueue, QueueMessage
+from edu_queue.lanes import QueueLane, get_lane
+
+REPLAY_COMMAND = "python -m scripts.replay_dead_letters --message-id {message_id}"
+
+
+def encode_message(body: dict) -> str:
+    """Encode a message body the way the API enqueues tasks (Base64 JSON)."""
+    return base64.b64encode(json.dumps(body).encode("utf-8")).decode("utf-8")
+
+
+def decode_message(content: str) -> dict:
+    """Decode a Base64 JSON message body."""
+    return json.loads(base64.b64decode(content).decode("utf-8"))
+
+
+class DeadLetterQueue:
+    """Queue holding messages that exhausted their attempts.
+
+    Each dead letter wraps the original message content unchanged together
+    with the failure reason, the number of deliveries, and the command that
+    puts it back on the task queue.
+    """
+
+    def __init__(self, queue: MessageQueue):
+        """Initialize the dead-letter queue.
+
+        Args:
+            queue: The dead-letter queue
+        """
+        self.queue = queue
+
+    def send(self, message: QueueMessage, reason: str, error_type: str) -> None:
+        """Dead-letter a message received from the task queue.
+
+        The caller deletes the original message afterwards; if that fails the
+        message is redelivered and dead-lettered again, which is harmless.
+
+        Args:
+            message: The message that failed
+            reason: Human-readable failure reason
+            error_type: Exception class name, or a short failure category
+        """
+        body = {
+            "message_id": message.id,
+            "content": message.content,
+            "reason": reason,
+            "error_type": error_type,
+            "dequeue_count": message.dequeue_count,
+            "inserted_on": message.inserted_on.isoformat()
+            if message.inserted_on
+            else None,
+            "dead_lettered_at": datetime.now(UTC).isoformat(),
+            "replay_command": REPLAY_COMMAND.format(message_id=message.id),
+        }
+        # A time to live of -1 keeps dead letters until an operator acts
+        self.queue.send_message(encode_message(body), time_to_live=-1)
+
+    def peek(self, max_messages: int = 32) -> list[dict]:
+        """Read dead letters without hiding them from other readers.
+
+        Args:
+            max_messages: Maximum number of dead letters to return (at most 32)
+
+        Returns:
+            Dead letter bodies, oldest first
+        """
+        messages = self.queue.peek_messages(max_messages=max_messages)
+        return [decode_message(message.content) for message in messages]
+
+    def replay(
+        self,
+        targets: dict[QueueLane, MessageQueue],
+        message_ids: set[str] | None = None,
+        visibility_timeout: int = 60,
+        on_replay: Callable[[dict], None] | None = None,
+    ) -> list[str]:
+        """Send dead letters back to their lane queues as new messages.
+
+        Replayed messages start again with a dequeue count of zero. Messages
+        whose task type cannot be read go to the bulk lane. Dead letters that
+        do not match are made visible again right away. A scan that outlasts
+        ``visibility_timeout`` receives dead letters again; each original
+        message is still replayed only once.
+
+        Args:
+            targets: Queue of each lane
+            message_ids: Original message IDs to replay, or None for all
+            visibility_timeout: Seconds the scanned dead letters stay hidden
+                while the replay runs
+            on_replay: Called with each decoded task before it is sent, e.g.
+                to requeue the task's failed generation job
+
+        Returns:
+            Original message IDs that were replayed
+        """
+        replayed = []
+        # Latest delivery of each skipped dead letter, by queue message ID
+        skipped: dict[str, QueueMessage] = {}
+        while True:
+            messages = self.queue.receive_messages(
+                max_messages=32, visibility_timeout=visibility_timeout
+            )
+            if not messages:
+                break
+            for message in messages:
+                body = decode_message(message.content)
+                if message_ids is not None and body["message_id"] not in message_ids:
+                    skipped[message.id] = message
+                    continue
+                # A dead letter whose delete failed below is received again
+                # once its visibility timeout expires; it is not sent twice
+                if body["message_id"] not in replayed:
+                    if on_replay is not None:
+                        on_replay(self._decode_task(body["content"]))
+                    lane = self._get_lane(body["content"])
+                    targets[lane].send_message(body["content"])
+                    replayed.append(body["message_id"])
+                with contextlib.suppress(MessageNotFoundError):
+                    # Stale pop receipt: the scan outlasted visibility_timeout
+                    self.queue.delete_message(message)
+
+        for message in skipped.values():
+            with contextlib.suppress(MessageNotFoundError):
+                self.queue.update_message(message, visibility_timeout=0)
+        return replayed
+
+    @staticmethod
+    def _decode_task(content: str) -> dict:
+        try:
+            task = decode_message(content)
+        except ValueError:
+            return {}
+        return task if isinstance(task, dict) else {}
+
+    @classmethod
+    def _get_lane(cls, content: str) -> QueueLane:
+        try:
+            return get_lane(cls._decode_task(content)["type"])
+        except (ValueError, KeyError, TypeError):
+            return QueueLane.BULK
@@ -0,0 +1,139 @@
+"""Content-hash caches for document analysis results and chunk embeddings."""
+
+import hashlib
+
+from edu_db.models import DocumentAnalysisCache, EmbeddingCache
+from extractors.base import PAGE_BREAK
+from metrics import (
+    CACHE_REQUESTS,
+    CONTENT_UNDERSTANDING_PAGES_AVOIDED,
+    EMBEDDING_TOKENS_AVOIDED,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+# Rough characters-per-token ratio used to estimate avoided embedding tokens
+CHARS_PER_TOKEN = 4
+
+
+def content_hash(data: bytes | str) -> str:
+    """Return the hex SHA-256 digest of bytes or UTF-8 text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DocumentCache:
+    """Database-backed cache shared by every upload of the same content.
+
+    Analysis results are keyed by (file hash, analyzer ID) and embeddings by
+    (chunk text hash, embedding model), so re-uploading a document into another
+    project reuses both the Content Understanding output and the vectors.
+
+    Writes join the caller's transaction and are committed with it.
+    """
+
+    def __init__(self, analyzer_id: str, embedding_model: str):
+        """Initialize the cache.
+
+        Args:
+            analyzer_id: Azure Content Understanding analyzer ID
+            embedding_model: Embedding deployment the vectors were produced with
+        """
+        self.analyzer_id = analyzer_id
+        self.embedding_model = embedding_model
+
+    def get_analysis(self, db, file_hash: str) -> dict | None:
+        """Look up a cached analysis result.
+
+        Args:
+            db: Database session
+            file_hash: SHA-256 of the analyzed file
+
+        Returns:
+            Dictionary containing content and summary, or None on a miss
+        """
+        entry = db.get(DocumentAnalysisCache, (file_hash, self.analyzer_id))
+        if entry is None:
+            CACHE_REQUESTS.labels(cache="content_understanding", result="miss").inc()
+            return None
+
+        CACHE_REQUESTS.labels(cache="content_understanding", result="hit").inc()
+        CONTENT_UNDERSTANDING_PAGES_AVOIDED.inc(entry.markdown.count(PAGE_BREAK) + 1)
+        return {"content": entry.markdown, "summary": entry.summary}
+
+    def put_analysis(self, db, file_hash: str, content: str, summary: str) -> None:
+        """Store an analysis result.
+
+        Args:
+            db: Database session
+            file_hash: SHA-256 of the analyzed file
+            content: Extracted markdown
+            summary: Extracted summary
+        """
+        db.execute(
+            insert(DocumentAnalysisCache)
+            .values(
+                content_hash=file_hash,
+                analyzer_id=self.analyzer_id,
+                markdown=content,
+                summary=summary,
+            )
+            .on_conflict_do_nothing()
+        )
+
+    def get_embeddings(self, db, texts: list[str]) -> dict[str, list[float]]:
+        """Look up cached embeddings for chunk texts.
+
+        Args:
+            db: Database session
+            texts: Chunk texts
+
+        Returns:
+            Mapping of chunk text hash to embedding for every cache hit
+        """
+        hashes = {content_hash(text): text for text in texts}
+        if not hashes:
+            return {}
+
+        rows = (
+            db.query(EmbeddingCache.content_hash, EmbeddingCache.embedding_vector)
+            .filter(
+                EmbeddingCache.model == self.embedding_model,
+                EmbeddingCache.content_hash.in_(list(hashes)),
+            )
+            .all()
+        )
+        cached = {row.content_hash: list(row.embedding_vector) for row in rows}
+
+        hits = len(cached)
+        CACHE_REQUESTS.labels(cache="embedding", result="hit").inc(hits)
+        CACHE_REQUESTS.labels(cache="embedding", result="miss").inc(len(hashes) - hits)
+        EMBEDDING_TOKENS_AVOIDED.inc(
+            sum(len(hashes[h]) for h in cached) // CHARS_PER_TOKEN
+        )
+        return cached
+
+    def put_embeddings(self, db, embeddings: dict[str, list[float]]) -> None:
+        """Store embeddings keyed by chunk text hash.
+
+        Args:
+            db: Database session
+            embeddings: Mapping of chunk text hash to embedding
+        """
+        if not embeddings:
+            return
+
+        db.execute(
+            insert(EmbeddingCache)
+            .values(
+                [
+                    {
+                        "content_hash": text_hash,
+                        "model": self.embedding_model,
+                        "embedding_vector": embedding,
+                    }
+                    for text_hash, embedding in embeddings.items()
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
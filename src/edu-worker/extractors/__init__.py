@@ -0,0 +1,20 @@
+"""Local extractors for file types that do not need remote analysis."""
+
+from extractors.base import PAGE_BREAK, BaseExtractor
+from extractors.eml import EmlExtractor
+from extractors.markup import HtmlExtractor, XmlExtractor
+from extractors.office import DocxExtractor, PptxExtractor
+from extractors.registry import ExtractorRegistry
+from extractors.text import PlainTextExtractor
+
+__all__ = [
+    "PAGE_BREAK",
+    "BaseExtractor",
+    "DocxExtractor",
+    "EmlExtractor",
+    "ExtractorRegistry",
+    "HtmlExtractor",
+    "PlainTextExtractor",
+    "PptxExtractor",
+    "XmlExtractor",
+]
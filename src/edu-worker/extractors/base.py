@@ -0,0 +1,55 @@
+"""Base extractor for converting uploaded files to markdown locally."""
+
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+PAGE_BREAK = "<!-- PageBreak -->"
+
+
+class BaseExtractor(ABC):
+    """Abstract base class for in-process text extraction.
+
+    Extractors produce the same contract as Azure Content Understanding:
+    markdown where pages are separated by ``PAGE_BREAK`` markers.
+    """
+
+    file_types: frozenset[str] = frozenset()
+
+    @abstractmethod
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from a file.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content with page break markers between pages
+        """
+        pass
+
+    @staticmethod
+    def decode(data: bytes) -> str:
+        """Decode text of unknown encoding, preferring UTF-8.
+
+        Args:
+            data: Raw text bytes
+
+        Returns:
+            Decoded text
+        """
+        try:
+            return data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            return data.decode("cp1252", errors="replace")
+
+    @staticmethod
+    def join_pages(pages: list[str]) -> str:
+        """Join page contents with page break markers.
+
+        Args:
+            pages: Markdown content of each page
+
+        Returns:
+            Markdown content of the whole document
+        """
+        return f"\n\n{PAGE_BREAK}\n\n".join(page.strip() for page in pages)
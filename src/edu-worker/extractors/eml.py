@@ -0,0 +1,57 @@
+"""Extractor for email messages."""
+
+from email import policy
+from email.parser import BytesParser
+from typing import BinaryIO
+
+from extractors.base import BaseExtractor
+from extractors.markup import html_to_markdown
+
+HEADERS = ("Subject", "From", "To", "Cc", "Date")
+
+
+class EmlExtractor(BaseExtractor):
+    """Extractor for RFC 822 (.eml) messages.
+
+    The main headers are rendered as a short preamble followed by the body,
+    preferring the plain-text part and falling back to the HTML part.
+    """
+
+    file_types = frozenset({"eml"})
+
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from an email message.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content (a single page)
+        """
+        message = BytesParser(policy=policy.default).parse(file)
+
+        lines = []
+        subject = message.get("Subject")
+        if subject:
+            lines.append(f"# {subject}")
+        for header in HEADERS[1:]:
+            value = message.get(header)
+            if value:
+                lines.append(f"**{header}**: {value}")
+
+        body = message.get_body(preferencelist=("plain", "html"))
+        if body is not None:
+            content = body.get_content()
+            if body.get_content_subtype() == "html":
+                content = html_to_markdown(content)
+            lines.append(content.strip())
+
+        attachments = [
+            part.get_filename()
+            for part in message.iter_attachments()
+            if part.get_filename()
+        ]
+        if attachments:
+            lines.append("**Attachments**: " + ", ".join(attachments))
+
+        return "\n\n".join(lines)
@@ -0,0 +1,189 @@
+"""Extractors for HTML and XML files."""
+
+import re
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from typing import BinaryIO
+
+from extractors.base import BaseExtractor
+
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "div",
+    "dl",
+    "fieldset",
+    "figure",
+    "footer",
+    "form",
+    "header",
+    "hr",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "ul",
+}
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+SKIPPED_TAGS = {"head", "script", "style", "noscript", "template", "svg"}
+
+
+class _MarkdownHTMLParser(HTMLParser):
+    """Converts HTML into simple markdown: headings, paragraphs, lists and tables."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[str] = []
+        self._current: list[str] = []
+        self._skip_depth = 0
+        self._list_depth = 0
+        self._row: list[str] | None = None
+        self._cell: list[str] | None = None
+        self._table: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif self._skip_depth:
+            return
+        elif tag in HEADING_TAGS:
+            self._flush()
+            self._current.append("#" * HEADING_TAGS[tag] + " ")
+        elif tag in {"ul", "ol"}:
+            self._flush()
+            self._list_depth += 1
+        elif tag == "li":
+            self._flush()
+            self._current.append("  " * max(self._list_depth - 1, 0) + "- ")
+        elif tag == "br":
+            self._flush()
+        elif tag == "table":
+            self._flush()
+            self._table = []
+        elif tag == "tr":
+            self._row = []
+        elif tag in {"td", "th"}:
+            self._cell = []
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif self._skip_depth:
+            return
+        elif tag in {"ul", "ol"}:
+            self._flush()
+            self._list_depth = max(self._list_depth - 1, 0)
+        elif tag in {"td", "th"} and self._cell is not None and self._row is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == "tr" and self._row is not None and self._table is not None:
+            self._table.append("| " + " | ".join(self._row) + " |")
+            if len(self._table) == 1:
+                self._table.append("|" + " --- |" * len(self._row))
+            self._row = None
+        elif tag == "table" and self._table is not None:
+            self.lines.append("\n".join(self._table))
+            self._table = None
+        elif tag in HEADING_TAGS or tag in BLOCK_TAGS or tag == "li":
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._cell is not None:
+            self._cell.append(data)
+        else:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        text = re.sub(r"\s+", " ", "".join(self._current)).strip()
+        self._current = []
+        # Drop list/heading markers left without any text
+        if not re.fullmatch(r"[-#\s]*", text):
+            self.lines.append(text)
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert an HTML string to markdown.
+
+    Args:
+        html: HTML source
+
+    Returns:
+        Markdown content
+    """
+    parser = _MarkdownHTMLParser()
+    parser.feed(html)
+    parser.close()
+    return "\n\n".join(line for line in parser.lines if line.strip()).strip()
+
+
+class HtmlExtractor(BaseExtractor):
+    """Extractor for HTML documents."""
+
+    file_types = frozenset({"html"})
+
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from an HTML file.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content (HTML has no pages, so a single page)
+        """
+        return html_to_markdown(self.decode(file.read()))
+
+
+class XmlExtractor(BaseExtractor):
+    """Extractor for XML documents.
+
+    Element names become nested headings (up to three levels) and text content
+    becomes paragraphs, which keeps the structure useful for header-based chunking.
+    """
+
+    file_types = frozenset({"xml"})
+
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from an XML file.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content (XML has no pages, so a single page)
+        """
+        root = ET.parse(file).getroot()
+        lines: list[str] = []
+        self._render(root, depth=1, lines=lines)
+        return "\n\n".join(lines)
+
+    def _render(self, element: ET.Element, depth: int, lines: list[str]) -> None:
+        name = element.tag.rsplit("}", 1)[-1]
+        children = list(element)
+        text = " ".join((element.text or "").split())
+
+        if children:
+            if depth <= 3:
+                lines.append(f"{'#' * depth} {name}")
+            if text:
+                lines.append(text)
+            for child in children:
+                self._render(child, depth=depth + 1, lines=lines)
+        elif text:
+            lines.append(f"**{name}**: {text}")
+
+        tail = " ".join((element.tail or "").split())
+        if tail:
+            lines.append(tail)
@@ -0,0 +1,134 @@
+"""Extractors for Office Open XML documents (docx, pptx)."""
+
+from typing import BinaryIO
+
+from docx import Document as DocxDocument
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from pptx import Presentation
+
+from extractors.base import BaseExtractor
+
+
+def _table_to_markdown(rows: list[list[str]]) -> str:
+    """Render table cell texts as a markdown table."""
+    if not rows:
+        return ""
+    width = max(len(row) for row in rows)
+    lines = []
+    for index, row in enumerate(rows):
+        cells = [" ".join(cell.split()) for cell in row] + [""] * (width - len(row))
+        lines.append("| " + " | ".join(cells) + " |")
+        if index == 0:
+            lines.append("|" + " --- |" * width)
+    return "\n".join(lines)
+
+
+class DocxExtractor(BaseExtractor):
+    """Extractor for Word documents.
+
+    Heading styles become markdown headings, list styles become bullets and
+    explicit page breaks become page break markers. Word only knows page
+    boundaries after layout, so documents without explicit breaks are one page.
+    """
+
+    file_types = frozenset({"docx"})
+
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from a Word document.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content with page break markers between pages
+        """
+        document = DocxDocument(file)
+
+        pages: list[list[str]] = [[]]
+        for block in document.iter_inner_content():
+            if isinstance(block, Table):
+                rows = [[cell.text for cell in row.cells] for row in block.rows]
+                pages[-1].append(_table_to_markdown(rows))
+                continue
+
+            text = self._paragraph_to_markdown(block)
+            if text:
+                pages[-1].append(text)
+            if self._has_page_break(block):
+                pages.append([])
+
+        return self.join_pages(["\n\n".join(blocks) for blocks in pages])
+
+    @staticmethod
+    def _paragraph_to_markdown(paragraph: Paragraph) -> str:
+        text = paragraph.text.strip()
+        if not text:
+            return ""
+
+        style_name = (paragraph.style.name if paragraph.style else "") or ""
+        if style_name == "Title":
+            return f"# {text}"
+        if style_name.startswith("Heading"):
+            level = style_name.removeprefix("Heading").strip()
+            depth = int(level) if level.isdigit() else 1
+            return f"{'#' * min(depth, 6)} {text}"
+        if style_name.startswith("List"):
+            return f"- {text}"
+        return text
+
+    @staticmethod
+    def _has_page_break(paragraph: Paragraph) -> bool:
+        for br in paragraph._p.iter(qn("w:br")):
+            if br.get(qn("w:type")) == "page":
+                return True
+        return False
+
+
+class PptxExtractor(BaseExtractor):
+    """Extractor for PowerPoint presentations; every slide becomes a page."""
+
+    file_types = frozenset({"pptx"})
+
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from a presentation.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content with a page break marker between slides
+        """
+        presentation = Presentation(file)
+
+        pages = []
+        for slide in presentation.slides:
+            title_shape = slide.shapes.title
+            blocks = []
+            if title_shape is not None and title_shape.text_frame.text.strip():
+                blocks.append(f"## {title_shape.text_frame.text.strip()}")
+
+            for shape in slide.shapes:
+                if shape == title_shape:
+                    continue
+                if shape.has_text_frame:
+                    for paragraph in shape.text_frame.paragraphs:
+                        text = "".join(run.text for run in paragraph.runs).strip()
+                        if text:
+                            indent = "  " * paragraph.level
+                            blocks.append(f"{indent}- {text}")
+                elif shape.has_table:
+                    rows = [
+                        [cell.text for cell in row.cells] for row in shape.table.rows
+                    ]
+                    blocks.append(_table_to_markdown(rows))
+
+            if slide.has_notes_slide:
+                notes = slide.notes_slide.notes_text_frame.text.strip()
+                if notes:
+                    blocks.append(f"**Notes**: {notes}")
+
+            pages.append("\n".join(blocks))
+
+        return self.join_pages(pages)
@@ -0,0 +1,47 @@
+"""Extractor registry for mapping file types to local extractors."""
+
+from extractors.base import BaseExtractor
+from extractors.eml import EmlExtractor
+from extractors.markup import HtmlExtractor, XmlExtractor
+from extractors.office import DocxExtractor, PptxExtractor
+from extractors.text import PlainTextExtractor
+
+
+class ExtractorRegistry:
+    """Registry for file type to local extractor mapping.
+
+    File types without a registered extractor (PDFs, images, spreadsheets, ...)
+    are analyzed remotely by Azure Content Understanding.
+    """
+
+    def __init__(self, extractors: list[BaseExtractor] | None = None):
+        """Initialize the registry.
+
+        Args:
+            extractors: Extractors to register (defaults to all built-in ones)
+        """
+        if extractors is None:
+            extractors = [
+                PlainTextExtractor(),
+                HtmlExtractor(),
+                XmlExtractor(),
+                EmlExtractor(),
+                DocxExtractor(),
+                PptxExtractor(),
+            ]
+
+        self._extractors: dict[str, BaseExtractor] = {}
+        for extractor in extractors:
+            for file_type in extractor.file_types:
+                self._extractors[file_type] = extractor
+
+    def get_extractor(self, file_type: str) -> BaseExtractor | None:
+        """Get the local extractor for a file type.
+
+        Args:
+            file_type: File extension without the dot
+
+        Returns:
+            Extractor instance, or None if the file type needs remote analysis
+        """
+        return self._extractors.get(file_type.lower())
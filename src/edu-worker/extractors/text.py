@@ -0,0 +1,27 @@
+"""Extractor for plain text and markdown files."""
+
+from typing import BinaryIO
+
+from extractors.base import BaseExtractor
+
+
+class PlainTextExtractor(BaseExtractor):
+    """Extractor for plain text and markdown.
+
+    Markdown is passed through unchanged. Form feed characters, which mark page
+    boundaries in text exported from many tools, become page breaks.
+    """
+
+    file_types = frozenset({"txt", "md"})
+
+    def extract(self, file: BinaryIO) -> str:
+        """Extract markdown from a text file.
+
+        Args:
+            file: Readable binary file positioned at the start of the content
+
+        Returns:
+            Markdown content with page break markers between pages
+        """
+        text = self.decode(file.read()).replace("\r\n", "\n")
+        return self.join_pages(text.split("\f"))
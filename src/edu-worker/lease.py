@@ -0,0 +1,119 @@
+"""Visibility-timeout heartbeat for queue messages held by the worker."""
+
+import asyncio
+
+from edu_queue.backends import MessageNotFoundError, MessageQueue, QueueMessage
+from metrics import LEASE_RENEWALS
+from rich.console import Console
+
+console = Console(force_terminal=True)
+
+
+class MessageLease:
+    """Keeps a received message invisible for as long as the worker holds it.
+
+    Every ``renew_interval`` seconds the message's visibility timeout is reset
+    to ``visibility_timeout`` from now, so a long task is never redelivered to
+    another worker while it is still running, and a crashed worker's messages
+    reappear within one visibility timeout. Each renewal returns a new pop
+    receipt, which ``delete`` uses.
+    """
+
+    def __init__(
+        self,
+        queue: MessageQueue,
+        message: QueueMessage,
+        visibility_timeout: int,
+        renew_interval: float,
+    ):
+        """Initialize the lease.
+
+        Args:
+            queue: Queue the message was received from
+            message: The received message
+            visibility_timeout: Seconds of invisibility granted by each renewal
+            renew_interval: Seconds between renewals; must be well below
+                ``visibility_timeout``
+        """
+        self.queue = queue
+        self.message = message
+        self.visibility_timeout = visibility_timeout
+        self.renew_interval = renew_interval
+        self.lost = False
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start renewing the lease in the background."""
+        self._task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self) -> None:
+        """Stop renewing the lease."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def release(self) -> None:
+        """Stop renewing and make the message visible again right away.
+
+        Used when the worker gives a message back unprocessed, so another
+        worker picks it up without waiting out the visibility timeout.
+        Failures are only logged; the message then reappears on its own.
+        """
+        await self.stop()
+        if self.lost:
+            return
+        async with self._lock:
+            try:
+                await asyncio.to_thread(
+                    self.queue.update_message, self.message, visibility_timeout=0
+                )
+            except Exception as e:
+                console.print(
+                    f"[yellow]Could not release message {self.message.id}: {e}[/yellow]"
+                )
+
+    async def delete(self) -> None:
+        """Stop renewing and delete the message with the latest pop receipt.
+
+        Once the lease is lost the message is left alone: it was deleted
+        already, or redelivered and is now held by another receiver.
+        """
+        await self.stop()
+        if self.lost:
+            return
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self.queue.delete_message, self.message)
+            except MessageNotFoundError as e:
+                self.lost = True
+                console.print(
+                    f"[yellow]Lost lease on message {self.message.id}: {e}[/yellow]"
+                )
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            async with self._lock:
+                try:
+                    # Updates the message's pop receipt in place
+                    await asyncio.to_thread(
+                        self.queue.update_message,
+                        self.message,
+                        visibility_timeout=self.visibility_timeout,
+                    )
+                except MessageNotFoundError as e:
+                    # The pop receipt is stale (the message was redelivered
+                    # or deleted); further renewals cannot succeed
+                    LEASE_RENEWALS.labels(result="lost").inc()
+                    self.lost = True
+                    console.print(
+                        f"[yellow]Lost lease on message {self.message.id}: {e}[/yellow]"
+                    )
+                    return
+                except Exception:
+                    # Transient failure; the next renewal still has time left
+                    LEASE_RENEWALS.labels(result="error").inc()
+                    continue
+                LEASE_RENEWALS.labels(result="renewed").inc()
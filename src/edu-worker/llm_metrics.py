@@ -0,0 +1,61 @@
+"""Latency metrics for every LangChain model call made by the worker."""
+
+import time
+from contextvars import ContextVar
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from metrics import EXTERNAL_CALL_SECONDS
+
+
+class LLMLatencyHandler(BaseCallbackHandler):
+    """Observes the duration of chat model calls in ``EXTERNAL_CALL_SECONDS``."""
+
+    # Only reads the clock; no need to hop to a thread for async calls
+    run_inline = True
+
+    def __init__(self):
+        """Initialize the handler."""
+        self._started: dict[UUID, float] = {}
+
+    def on_chat_model_start(
+        self, serialized: dict[str, Any], messages: list, *, run_id: UUID, **kwargs
+    ) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(
+        self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs
+    ) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        self._observe(run_id, "success")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._observe(run_id, "error")
+
+    def _observe(self, run_id: UUID, result: str) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        EXTERNAL_CALL_SECONDS.labels(
+            service="azure_openai", operation="chat", result=result
+        ).observe(time.perf_counter() - started)
+
+
+_llm_latency_handler: ContextVar[LLMLatencyHandler | None] = ContextVar(
+    "edu_worker_llm_latency_handler", default=None
+)
+# LangChain adds the handler in the variable to every run's callbacks, so
+# calls made inside the shared agents are measured without passing it along
+register_configure_hook(_llm_latency_handler, inheritable=True)
+
+
+def install_llm_latency_metrics() -> None:
+    """Measure model calls made from this context and the tasks it starts.
+
+    Call it in ``main()`` before the scheduler starts handling messages.
+    """
+    _llm_latency_handler.set(LLMLatencyHandler())
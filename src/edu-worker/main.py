@@ -1,67 +1,517 @@
 import asyncio
-import base64
+import binascii
 import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from azure.storage.queue import QueueClient, QueueMessage
+from chunking import ChunkingEngine
 from config import get_settings
+from contents_cache import DiskContentsCache
+from dead_letter import DeadLetterQueue, decode_message
+from edu_core.events import init_event_bus, publish_event
+from edu_core.schemas.events import ProjectEvent, ProjectEventType, ProjectResourceType
+from edu_core.schemas.generation_jobs import GenerationJobStatus
+from edu_core.services.generation_jobs import GenerationJobService
 from edu_core.services.search import SearchService
 from edu_db.session import init_db
+from edu_queue.backends import QueueMessage, create_queue_backend
+from edu_queue.claim_check import (
+    AzureBlobPayloadStore,
+    PayloadStore,
+    check_out,
+    release,
+)
+from edu_queue.lanes import QueueLane, get_lane_queue_name
 from edu_queue.schemas import QueueTaskMessage, TaskType
+from edu_queue.service import QueueService
+from lease import MessageLease
+from llm_metrics import install_llm_latency_metrics
+from memory_budget import MemoryBudget
+from metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    MESSAGE_OVERHEAD_SECONDS,
+    MESSAGES_DEAD_LETTERED,
+    TASK_DURATION_SECONDS,
+    TASK_ERRORS,
+    WORKER_STARTUP_SECONDS,
+)
+from monitoring import sample_queue_depths, start_monitoring_server
+from processors.base import BaseProcessor
 from processors.registry import ProcessorRegistry
 from rich.console import Console
+from scheduler import Lane, LaneScheduler
 
 console = Console(force_terminal=True)
 
+jobs = GenerationJobService()
+
+# Generation task types with the resource they fill and its payload key
+GENERATED_RESOURCES = {
+    TaskType.FLASHCARD_GENERATION: (ProjectResourceType.FLASHCARD_GROUP, "group_id"),
+    TaskType.QUIZ_GENERATION: (ProjectResourceType.QUIZ, "quiz_id"),
+    TaskType.NOTE_GENERATION: (ProjectResourceType.NOTE, "note_id"),
+    TaskType.MIND_MAP_GENERATION: (ProjectResourceType.MIND_MAP, "mind_map_id"),
+}
+
+
+class InvalidMessageError(ValueError):
+    """A message that can never be processed, however often it is retried."""
+
+
+class TaskTimeoutError(TimeoutError):
+    """A task ran longer than its task type's timeout and was cancelled."""
+
 
 async def process_message(
     msg: QueueMessage,
     registry: ProcessorRegistry,
+    payload_store: PayloadStore,
+    task_timeouts: dict[str, float],
+    default_task_timeout: float,
 ):
     """Process a queue message using the appropriate processor.
 
+    Processors are shared by concurrent messages and stay open for the life
+    of the worker; the registry closes them at shutdown.
+
     Args:
         msg: The queue message to process
         registry: ProcessorRegistry for getting processors
+        payload_store: Store holding the messages behind claim checks
+        task_timeouts: Seconds a task may run, by task type
+        default_task_timeout: Seconds for task types not in ``task_timeouts``
+
+    Raises:
+        InvalidMessageError: If the message cannot be decoded, has an
+            unknown task type, or its claim-checked payload is gone
+        TaskTimeoutError: If the processor ran out of time; it is cancelled,
+            its target marked as failed, and the attempt is retried like any
+            other failure
     """
-    with console.status("[bold green]Processing message...[/bold green]"):
-        # Decode message
-        content = json.loads(base64.b64decode(msg.content).decode("utf-8"))
+    start = time.perf_counter()
+
+    # Decode message, downloading it if it was sent as a claim check
+    try:
+        content = await check_out(payload_store, decode_message(msg.content))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise InvalidMessageError(f"Malformed message body: {e}") from e
+    except KeyError as e:
+        raise InvalidMessageError(f"Message payload {e} no longer exists") from e
 
-        # Parse using schema (TypedDict for type checking)
-        task_message: QueueTaskMessage = content
+    # Parse using schema (TypedDict for type checking)
+    task_message: QueueTaskMessage = content
 
+    try:
         task_type_str = task_message["type"]
         task_data = task_message["data"]
+    except (KeyError, TypeError) as e:
+        raise InvalidMessageError(f"Message is missing {e}") from e
+
+    # Convert string to TaskType enum
+    try:
+        task_type = TaskType(task_type_str)
+    except ValueError as e:
+        raise InvalidMessageError(f"Unknown task type: {task_type_str}") from e
+
+    console.log(
+        f"Received task: {task_type} for project: {task_data.get('project_id', 'N/A')}"
+    )
+
+    # Get processor for this task type
+    processor = registry.get_processor(task_type)
+    MESSAGE_OVERHEAD_SECONDS.labels(task_type=task_type.value).observe(
+        time.perf_counter() - start
+    )
+
+    # Process the task, cancelling the processor once its time is up
+    timeout = task_timeouts.get(task_type.value, default_task_timeout)
+    try:
+        async with asyncio.timeout(timeout) as deadline:
+            await processor.process(task_data)
+    except TimeoutError as e:
+        if not deadline.expired():
+            raise  # Raised by the processor itself
+        # The cancelled processor never reached its own error handling
+        await mark_failed(processor, task_data)
+        raise TaskTimeoutError(
+            f"{task_type.value} did not finish within {timeout:g}s"
+        ) from e
+
+    console.log(f"Completed task: {task_type}")
+
+
+def get_task_type(msg: QueueMessage) -> str:
+    """Return a message's task type for metric labels, or "unknown"."""
+    try:
+        return TaskType(decode_message(msg.content)["type"]).value
+    except Exception:
+        return "unknown"
+
+
+def observe_task(
+    task_type: str, result: str, started: float, error: Exception | None = None
+) -> None:
+    """Record a processing attempt's duration and, if it failed, its error.
+
+    Args:
+        task_type: Task type label
+        result: ``succeeded``, ``failed`` or ``invalid``
+        started: ``time.perf_counter()`` when processing started
+        error: The exception the attempt failed with, if any
+    """
+    TASK_DURATION_SECONDS.labels(task_type=task_type, result=result).observe(
+        time.perf_counter() - started
+    )
+    if error is not None:
+        TASK_ERRORS.labels(task_type=task_type, error_type=type(error).__name__).inc()
+
+
+async def mark_failed(processor: BaseProcessor, payload: dict) -> None:
+    """Leave the target of a task in a failed state; failures are only logged.
+
+    Args:
+        processor: Processor of the task type
+        payload: The task payload
+    """
+    try:
+        await asyncio.to_thread(processor.mark_failed, payload)
+    except Exception as e:
+        console.print(f"[yellow]Could not mark task target as failed: {e}[/yellow]")
+
+
+async def fail_target(msg: QueueMessage, registry: ProcessorRegistry) -> None:
+    """Leave the target of a message's task in a failed state.
+
+    Undecodable messages and unknown task types are ignored.
+
+    Args:
+        msg: The queue message
+        registry: ProcessorRegistry for getting processors
+    """
+    try:
+        content = decode_message(msg.content)
+        processor = registry.get_processor(TaskType(content["type"]))
+        payload = content["data"]
+    except Exception:
+        return
+    await mark_failed(processor, payload)
+
+
+def get_job_id(msg: QueueMessage) -> str | None:
+    """Return the ID of the generation job tracking a message, if any."""
+    try:
+        return decode_message(msg.content)["data"].get("job_id")
+    except Exception:
+        return None
+
+
+async def update_job(
+    update: Callable[..., bool], job_id: str | None, *args: str
+) -> None:
+    """Apply a state change to a generation job; failures are only logged.
+
+    Args:
+        update: GenerationJobService transition, e.g. ``jobs.start``
+        job_id: The job ID, or None if the message is not tracked
+        *args: Further arguments of the transition
+    """
+    if job_id is None:
+        return
+    try:
+        await asyncio.to_thread(update, job_id, *args)
+    except Exception as e:
+        console.print(f"[yellow]Could not update generation job {job_id}: {e}[/yellow]")
+
+
+async def release_payload(msg: QueueMessage, payload_store: PayloadStore) -> None:
+    """Delete the payload of a finished claim-checked message, if any.
+
+    Failures are only logged; an orphaned payload is harmless.
+    """
+    try:
+        await release(payload_store, decode_message(msg.content))
+    except Exception as e:
+        console.print(f"[yellow]Could not delete payload of {msg.id}: {e}[/yellow]")
+
+
+async def start_job(job_id: str | None) -> bool:
+    """Mark a message's generation job as running.
+
+    Returns:
+        False if the job is already finished, so the task is stale: it was
+        superseded by a newer request for its target, or an earlier delivery
+        completed it. True otherwise, including when the job could not be
+        read; the task then runs as usual.
+    """
+    if job_id is None:
+        return True
+    try:
+        if await asyncio.to_thread(jobs.start, job_id):
+            return True
+        job = await asyncio.to_thread(jobs.get_job, job_id)
+    except Exception as e:
+        console.print(f"[yellow]Could not update generation job {job_id}: {e}[/yellow]")
+        return True
+    return not job.status.is_finished
+
+
+async def publish_generation_finished(
+    msg: QueueMessage, status: GenerationJobStatus, error: str | None = None
+) -> None:
+    """Tell clients watching the project that a generation task finished.
 
-        # Convert string to TaskType enum
-        try:
-            task_type = TaskType(task_type_str)
-        except (ValueError, KeyError) as e:
-            raise ValueError(f"Unknown task type: {task_type_str}") from e
+    Args:
+        msg: The generation task's message; other messages are ignored
+        status: ``succeeded`` or ``failed``
+        error: Failure reason, if any
+    """
+    try:
+        content = decode_message(msg.content)
+        resource = GENERATED_RESOURCES.get(TaskType(content["type"]))
+        data = content["data"]
+        project_id = data["project_id"]
+    except Exception:
+        return
+    if resource is None:
+        return
+
+    resource_type, id_key = resource
+    event = ProjectEvent(
+        type=ProjectEventType.GENERATION_FINISHED,
+        project_id=project_id,
+        resource_type=resource_type,
+        resource_id=data.get(id_key),
+        status=status.value,
+        error=error,
+    )
+    await asyncio.to_thread(publish_event, event)
+
+
+async def handle_message(
+    lease: MessageLease,
+    registry: ProcessorRegistry,
+    dead_letters: DeadLetterQueue,
+    payload_store: PayloadStore,
+    max_attempts: int,
+    task_timeouts: dict[str, float],
+    default_task_timeout: float,
+):
+    """Process a message and delete it from the queue once it succeeded.
+
+    A failed message becomes visible again one visibility timeout after its
+    last lease renewal and is retried. Once it has been delivered
+    ``max_attempts`` times, or straight away if it can never succeed, it is
+    moved to the dead-letter queue instead. If the worker shuts down first,
+    the message is released by the scheduler and its job is marked for retry.
 
-        console.log(
-            f"Received task: {task_type} for project: {task_data.get('project_id', 'N/A')}"
+    Args:
+        lease: Lease on the message to process, already renewing
+        registry: ProcessorRegistry for getting processors
+        dead_letters: Queue receiving messages that are given up on
+        payload_store: Store holding the messages behind claim checks; a
+            payload is deleted with its message, but kept for dead letters
+        max_attempts: Deliveries allowed before a message is dead-lettered
+        task_timeouts: Seconds a task may run, by task type
+        default_task_timeout: Seconds for task types not in ``task_timeouts``
+    """
+    msg = lease.message
+    job_id = get_job_id(msg)
+    if msg.dequeue_count > max_attempts:
+        # Earlier deliveries never finished, e.g. the worker was killed
+        await dead_letter(
+            lease,
+            registry,
+            dead_letters,
+            reason=f"Delivered {msg.dequeue_count} times without completing",
+            error_type="MaxAttemptsExceeded",
+            category="max_attempts",
         )
+        return
 
-        # Get processor for this task type
-        processor = registry.get_processor(task_type)
+    if not await start_job(job_id):
+        console.log(f"Skipping stale message {msg.id}: job {job_id} already finished")
+        await lease.delete()
+        await release_payload(msg, payload_store)
+        return
 
-        # Process the task
-        await processor.process(task_data)
+    task_type = get_task_type(msg)
+    started = time.perf_counter()
+    try:
+        await process_message(
+            msg, registry, payload_store, task_timeouts, default_task_timeout
+        )
+    except asyncio.CancelledError:
+        # The drain deadline passed; the scheduler releases the message
+        await update_job(jobs.retry, job_id, "Interrupted by worker shutdown")
+        if msg.dequeue_count >= max_attempts:
+            # The redelivery will be dead-lettered
+            await fail_target(msg, registry)
+        raise
+    except InvalidMessageError as e:
+        observe_task(task_type, "invalid", started, e)
+        console.print(f"[bold red]Invalid message {msg.id}: {e}[/bold red]")
+        await dead_letter(
+            lease,
+            registry,
+            dead_letters,
+            str(e),
+            type(e).__name__,
+            category="invalid",
+        )
+        return
+    except Exception as e:
+        observe_task(task_type, "failed", started, e)
+        console.print(f"[bold red]Error processing message: {e}[/bold red]")
+        if msg.dequeue_count >= max_attempts and not lease.lost:
+            await dead_letter(
+                lease,
+                registry,
+                dead_letters,
+                str(e),
+                type(e).__name__,
+                category="failed",
+            )
+        else:
+            # Message reappears after the visibility timeout (retry mechanism)
+            await lease.stop()
+            if not lease.lost:
+                await update_job(jobs.retry, job_id, str(e))
+        return
 
-        console.log(f"Completed task: {task_type}")
+    observe_task(task_type, "succeeded", started)
+    await update_job(jobs.succeed, job_id)
+    try:
+        await lease.delete()  # Done!
+    except Exception as e:
+        # A redelivery is skipped as its job succeeded, or resumes from the
+        # document's checkpoints
+        console.print(f"[yellow]Could not delete message {msg.id}: {e}[/yellow]")
+    await release_payload(msg, payload_store)
+    await publish_generation_finished(msg, GenerationJobStatus.SUCCEEDED)
 
 
-def main():
+async def dead_letter(
+    lease: MessageLease,
+    registry: ProcessorRegistry,
+    dead_letters: DeadLetterQueue,
+    reason: str,
+    error_type: str,
+    category: str,
+):
+    """Move a message to the dead-letter queue and delete the original.
+
+    The task's target is marked as failed, as its processor may have been
+    cancelled or never run on the final attempt.
+
+    Args:
+        lease: Lease on the message
+        registry: ProcessorRegistry for getting processors
+        dead_letters: The dead-letter queue
+        reason: Failure reason recorded with the message
+        error_type: Exception class name or failure category
+        category: Metric label for the dead-letter reason
+    """
+    msg = lease.message
+    try:
+        await asyncio.to_thread(dead_letters.send, msg, reason, error_type)
+        await lease.delete()
+    except Exception as e:
+        console.print(
+            f"[bold red]Error dead-lettering message {msg.id}: {e}[/bold red]"
+        )
+        await lease.stop()
+        return
+
+    MESSAGES_DEAD_LETTERED.labels(reason=category).inc()
+    await fail_target(msg, registry)
+    await update_job(jobs.fail, get_job_id(msg), reason)
+    await publish_generation_finished(msg, GenerationJobStatus.FAILED, reason)
+    console.print(
+        f"[yellow]Dead-lettered message {msg.id} after {msg.dequeue_count} "
+        f"attempt(s): {reason}[/yellow]"
+    )
+
+
+async def main():
+    started_at = time.perf_counter()
     settings = get_settings()
 
+    # Blocking SDK calls run on the default executor; size it for the number
+    # of messages in flight rather than the CPU count
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=settings.worker_io_threads, thread_name_prefix="io"
+        )
+    )
+    # CPU-bound parsing gets its own threads so it cannot starve the I/O pool
+    cpu_executor = ThreadPoolExecutor(
+        max_workers=settings.worker_cpu_threads, thread_name_prefix="cpu"
+    )
+
     # Initialize database connection
-    init_db(settings.database_url)
+    init_db(
+        settings.database_url,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout_seconds,
+        on_checkout_wait=DB_POOL_CHECKOUT_WAIT.observe,
+    )
+    # Document status changes and finished generations are pushed to clients
+    event_bus = init_event_bus(settings.event_bus, database_url=settings.database_url)
+
+    # Expose metrics for scraping and autoscaling, and a readiness probe
+    # that passes once the worker polls its queues
+    ready = threading.Event()
+    monitoring_server = (
+        start_monitoring_server(settings.metrics_port, is_ready=ready.is_set)
+        if settings.metrics_port
+        else None
+    )
+    # Model calls made while handling messages are timed
+    install_llm_latency_metrics()
+
+    queue_backend = create_queue_backend(
+        settings.queue_backend,
+        azure_storage_connection_string=settings.azure_storage_connection_string,
+        database_url=settings.database_url,
+    )
+    lanes = [
+        Lane(
+            name=lane,
+            queue=queue_backend.get_queue(
+                get_lane_queue_name(settings.azure_storage_queue_name, lane)
+            ),
+            weight=settings.worker_lane_weights[lane.value],
+            max_concurrency=settings.worker_lane_max_concurrency[lane.value],
+            prefetch_count=settings.worker_prefetch_count,
+        )
+        for lane in QueueLane
+        if settings.worker_lane_weights.get(lane.value, 0) > 0
+    ]
+    for lane in lanes:
+        await asyncio.to_thread(lane.queue.ensure_exists)
+    dead_letters = DeadLetterQueue(
+        queue_backend.get_queue(settings.azure_storage_dead_letter_queue_name)
+    )
+    await asyncio.to_thread(dead_letters.queue.ensure_exists)
+
+    payload_store = AzureBlobPayloadStore(
+        settings.azure_storage_connection_string,
+        settings.azure_storage_queue_payloads_container_name,
+    )
 
-    queue = QueueClient.from_connection_string(
-        settings.azure_storage_connection_string, settings.azure_storage_queue_name
+    # Indexed documents queue a topic graph precomputation on the bulk lane
+    queue_service = (
+        QueueService(queue_backend, settings.azure_storage_queue_name)
+        if settings.topic_graph_precompute
+        else None
     )
 
     search_service = SearchService(
@@ -71,6 +521,31 @@ def main():
         azure_openai_api_version=settings.azure_openai_api_version,
     )
 
+    # Contents read again by later generations are kept on local disk
+    contents_cache = (
+        DiskContentsCache(
+            settings.contents_cache_dir
+            or os.path.join(tempfile.gettempdir(), "edu-worker-contents"),
+            max_bytes=settings.contents_cache_max_bytes,
+        )
+        if settings.contents_cache_max_bytes > 0
+        else None
+    )
+
+    # Large documents are chunked in a process pool; spawn avoids forking
+    # a process that already runs threads
+    chunking_executor = ProcessPoolExecutor(
+        max_workers=settings.chunking_max_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    chunking_engine = ChunkingEngine(
+        chunk_size=settings.chunk_size_tokens,
+        chunk_overlap=settings.chunk_overlap_tokens,
+        encoding_name=settings.chunking_encoding_name,
+        executor=chunking_executor,
+        parallel_page_threshold=settings.chunking_parallel_page_threshold,
+    )
+
     # Create processor registry
     registry = ProcessorRegistry(
         search_service=search_service,
@@ -83,44 +558,89 @@ def main():
         azure_cu_endpoint=settings.azure_cu_endpoint,
         azure_cu_key=settings.azure_cu_key,
         azure_cu_analyzer_id=settings.azure_cu_analyzer_id,
+        azure_cu_max_connections=settings.azure_cu_max_connections,
+        azure_cu_poll_timeout_seconds=settings.azure_cu_poll_timeout_seconds,
         azure_openai_embedding_deployment=settings.azure_openai_embedding_deployment,
+        memory_budget=MemoryBudget(settings.document_memory_budget_bytes),
+        document_spool_max_memory_bytes=settings.document_spool_max_memory_bytes,
+        chunking_engine=chunking_engine,
+        embedding_batch_size=settings.embedding_batch_size,
+        pdf_shard_min_pages=settings.pdf_shard_min_pages,
+        pdf_shard_pages=settings.pdf_shard_pages,
+        pdf_shard_concurrency=settings.pdf_shard_concurrency,
+        pdf_shard_max_retries=settings.pdf_shard_max_retries,
+        cpu_executor=cpu_executor,
+        contents_download_concurrency=settings.contents_download_concurrency,
+        contents_cache=contents_cache,
+        queue_service=queue_service,
     )
 
-    console.print("[bold green]Worker started. Polling queue...[/bold green]")
+    depth_sampler = asyncio.create_task(
+        sample_queue_depths(
+            lanes,
+            dead_letters.queue,
+            settings.metrics_queue_depth_interval_seconds,
+        )
+    )
+
+    startup_seconds = time.perf_counter() - started_at
+    WORKER_STARTUP_SECONDS.set(startup_seconds)
+    console.print(
+        f"[bold green]Worker started in {startup_seconds:.2f}s. "
+        "Polling queue...[/bold green]"
+    )
 
-    def process_in_thread(msg: QueueMessage):
-        """Run async process_message in a thread"""
-        try:
-            asyncio.run(process_message(msg, registry))
-            queue.delete_message(msg)  # Done!
-        except Exception as e:
-            console.print(f"[bold red]Error processing message: {e}[/bold red]")
-            # Message reappears after timeout (retry mechanism)
+    async def handle(lease: MessageLease):
+        await handle_message(
+            lease,
+            registry,
+            dead_letters,
+            payload_store,
+            settings.worker_max_attempts,
+            settings.worker_task_timeout_seconds,
+            settings.worker_default_task_timeout_seconds,
+        )
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        while True:
-            # Get messages (visibility_timeout hides it from other workers for 5 mins)
-            messages = queue.receive_messages(visibility_timeout=300, max_messages=5)
+    scheduler = LaneScheduler(
+        lanes=lanes,
+        handle=handle,
+        max_concurrency=settings.worker_max_concurrency,
+        visibility_timeout=settings.worker_visibility_timeout_seconds,
+        lease_renew_interval_seconds=settings.worker_lease_renew_interval_seconds,
+        poll_interval_seconds=settings.worker_poll_interval_seconds,
+        drain_timeout_seconds=settings.worker_drain_timeout_seconds,
+    )
 
-            # Convert ItemPaged to list
-            messages_list = list(messages) if messages else []
+    def drain():
+        if scheduler.stopping:
+            return
+        console.print("[yellow]Shutting down: draining in-flight messages[/yellow]")
+        ready.clear()
+        scheduler.stop()
 
-            if messages_list:
-                # Submit all messages to thread pool
-                futures = {
-                    executor.submit(process_in_thread, msg): msg
-                    for msg in messages_list
-                }
+    # Container platforms send SIGTERM before killing a replica
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, drain)
 
-                # Wait for completion (non-blocking check)
-                for future in as_completed(futures):
-                    try:
-                        future.result()  # This will raise if there was an exception
-                    except Exception as e:
-                        console.print(f"[bold red]Thread error: {e}[/bold red]")
-            else:
-                time.sleep(1)  # Prevent tight loop when no messages
+    ready.set()
+    try:
+        await scheduler.run()
+    finally:
+        ready.clear()
+        depth_sampler.cancel()
+        await registry.aclose()
+        # Drained by now; joining the chunking processes keeps them from
+        # outliving the worker
+        cpu_executor.shutdown(cancel_futures=True)
+        chunking_executor.shutdown(cancel_futures=True)
+        if queue_service is not None:
+            await queue_service.aclose()
+        await payload_store.aclose()
+        queue_backend.close()
+        event_bus.close()
+        if monitoring_server is not None:
+            monitoring_server.shutdown()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Worker-wide memory ceiling for in-flight document content."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from metrics import DOCUMENT_BYTES_IN_FLIGHT
+
+
+class MemoryBudget:
+    """Byte-weighted semaphore shared by every document processed in a worker.
+
+    All messages run on the worker's single event loop, so waiting for budget
+    suspends the task instead of blocking a thread. A single document larger
+    than the whole budget is admitted on its own.
+    """
+
+    def __init__(self, limit_bytes: int):
+        """Initialize the budget.
+
+        Args:
+            limit_bytes: Maximum number of document bytes in flight at once
+        """
+        self.limit_bytes = limit_bytes
+        self._in_use = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, nbytes: int):
+        """Reserve budget for a document for the duration of the context.
+
+        Args:
+            nbytes: Size of the document in bytes
+        """
+        reserved = min(nbytes, self.limit_bytes)
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._in_use + reserved <= self.limit_bytes
+            )
+            self._in_use += reserved
+            DOCUMENT_BYTES_IN_FLIGHT.set(self._in_use)
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_use -= reserved
+                DOCUMENT_BYTES_IN_FLIGHT.set(self._in_use)
+                self._condition.notify_all()
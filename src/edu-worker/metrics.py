@@ -0,0 +1,157 @@
+"""Prometheus metrics exported by the worker."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+CACHE_REQUESTS = Counter(
+    "edu_worker_cache_requests_total",
+    "Lookups against the content-hash caches",
+    ["cache", "result"],
+)
+
+CONTENT_UNDERSTANDING_PAGES_AVOIDED = Counter(
+    "edu_worker_content_understanding_pages_avoided_total",
+    "Pages that did not need a Content Understanding analysis thanks to the cache",
+)
+
+EMBEDDING_TOKENS_AVOIDED = Counter(
+    "edu_worker_embedding_tokens_avoided_total",
+    "Estimated embedding tokens that were served from the cache",
+)
+
+DOCUMENT_BYTES_IN_FLIGHT = Gauge(
+    "edu_worker_document_bytes_in_flight",
+    "Document bytes currently reserved against the worker memory budget",
+)
+
+DOCUMENT_EXTRACTIONS = Counter(
+    "edu_worker_document_extractions_total",
+    "Documents whose text was obtained locally, from the cache or remotely",
+    ["method"],
+)
+
+PDF_SHARD_ANALYSES = Counter(
+    "edu_worker_pdf_shard_analyses_total",
+    "Page-range shards of large PDFs served from the cache, analyzed or failed",
+    ["result"],
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "edu_worker_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+
+PROCESSOR_CONSTRUCTION_SECONDS = Histogram(
+    "edu_worker_processor_construction_seconds",
+    "Time spent building a processor and the clients it needs",
+    ["task_type"],
+)
+
+MESSAGE_OVERHEAD_SECONDS = Histogram(
+    "edu_worker_message_overhead_seconds",
+    "Time spent on a message outside the processor's own work",
+    ["task_type"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+WORKER_STARTUP_SECONDS = Gauge(
+    "edu_worker_startup_seconds",
+    "Time from process start until the worker began polling the queue",
+)
+
+LEASE_RENEWALS = Counter(
+    "edu_worker_lease_renewals_total",
+    "Visibility timeout renewals of held queue messages",
+    ["result"],
+)
+
+MESSAGES_DEAD_LETTERED = Counter(
+    "edu_worker_messages_dead_lettered_total",
+    "Messages moved to the dead-letter queue",
+    ["reason"],
+)
+
+LANE_WAIT_SECONDS = Histogram(
+    "edu_worker_lane_wait_seconds",
+    "Time from enqueueing a message until the worker started processing it",
+    ["lane"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900, 3600),
+)
+
+LANE_MESSAGES_BUFFERED = Gauge(
+    "edu_worker_lane_messages_buffered",
+    "Received messages waiting for a processing slot",
+    ["lane"],
+)
+
+LANE_MESSAGES_RUNNING = Gauge(
+    "edu_worker_lane_messages_running",
+    "Messages currently being processed",
+    ["lane"],
+)
+
+QUEUE_DEPTH = Gauge(
+    "edu_worker_queue_depth",
+    "Approximate messages in the lane's queue, including held ones",
+    ["lane"],
+)
+
+DEAD_LETTER_QUEUE_DEPTH = Gauge(
+    "edu_worker_dead_letter_queue_depth",
+    "Approximate messages in the dead-letter queue",
+)
+
+TASK_DURATION_SECONDS = Histogram(
+    "edu_worker_task_duration_seconds",
+    "Time spent processing a message, by task type and outcome",
+    ["task_type", "result"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+
+TASK_ERRORS = Counter(
+    "edu_worker_task_errors_total",
+    "Failed processing attempts, by task type and exception class",
+    ["task_type", "error_type"],
+)
+
+EXTERNAL_CALL_SECONDS = Histogram(
+    "edu_worker_external_call_seconds",
+    "Latency of calls to Azure OpenAI and Content Understanding",
+    ["service", "operation", "result"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+@contextmanager
+def time_external_call(service: str, operation: str) -> Iterator[None]:
+    """Observe the duration of the enclosed call in ``EXTERNAL_CALL_SECONDS``.
+
+    Args:
+        service: Called service, e.g. "azure_openai"
+        operation: Operation of the service, e.g. "embeddings"
+    """
+    start = time.perf_counter()
+    result = "error"
+    try:
+        yield
+        result = "success"
+    finally:
+        EXTERNAL_CALL_SECONDS.labels(
+            service=service, operation=operation, result=result
+        ).observe(time.perf_counter() - start)
+
+
+def observe_contents_download(seconds: float, succeeded: bool) -> None:
+    """Record a download of processed document contents.
+
+    Passed as ``on_download`` to ``DocumentContentsService``.
+    """
+    EXTERNAL_CALL_SECONDS.labels(
+        service="blob_storage",
+        operation="download_contents",
+        result="success" if succeeded else "error",
+    ).observe(seconds)
@@ -0,0 +1,109 @@
+"""Side-port HTTP endpoints for scraping and probes, and queue sampling."""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from edu_queue.backends import MessageQueue
+from metrics import DEAD_LETTER_QUEUE_DEPTH, QUEUE_DEPTH
+from prometheus_client import make_wsgi_app
+from rich.console import Console
+from scheduler import Lane
+
+console = Console(force_terminal=True)
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """Serves each request on its own thread, so a slow scrape never blocks."""
+
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    """Skips the access log; probes would flood the console."""
+
+    def log_message(self, format, *args):
+        return None
+
+
+def start_monitoring_server(port: int, is_ready: Callable[[], bool]) -> WSGIServer:
+    """Serve ``/metrics`` and ``/ready`` on a background thread.
+
+    ``/metrics`` is the Prometheus exposition of the worker's metrics.
+    ``/ready`` answers 200 while ``is_ready()`` is true and 503 otherwise,
+    for readiness probes; any other path is a liveness check answering 200.
+
+    Args:
+        port: Port to listen on, on all interfaces
+        is_ready: Whether the worker is accepting messages; called from the
+            server thread
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+    metrics_app = make_wsgi_app()
+
+    def app(environ, start_response):
+        path = environ.get("PATH_INFO", "/")
+        if path == "/metrics":
+            return metrics_app(environ, start_response)
+        if path == "/ready":
+            ready = is_ready()
+            status = "200 OK" if ready else "503 Service Unavailable"
+            start_response(status, [("Content-Type", "text/plain")])
+            return [b"ready\n" if ready else b"not ready\n"]
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok\n"]
+
+    server = make_server(
+        "",
+        port,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=_QuietHandler,
+    )
+    thread = threading.Thread(
+        target=server.serve_forever, name="monitoring", daemon=True
+    )
+    thread.start()
+    return server
+
+
+async def sample_queue_depths(
+    lanes: list[Lane], dead_letter_queue: MessageQueue, interval_seconds: float
+) -> None:
+    """Publish the approximate depth of each lane's queue until cancelled.
+
+    Autoscalers read ``edu_worker_queue_depth`` to size the worker pool on
+    the real backlog. A failed sample keeps the previous value and is
+    retried on the next interval.
+
+    Args:
+        lanes: Lanes whose queues are sampled
+        dead_letter_queue: Dead-letter queue, sampled as well
+        interval_seconds: Seconds between samples
+    """
+    while True:
+        for lane in lanes:
+            try:
+                depth = await asyncio.to_thread(lane.queue.approximate_message_count)
+            except Exception as e:
+                console.print(
+                    f"[yellow]Could not sample depth of {lane.queue.name}: {e}[/yellow]"
+                )
+                continue
+            QUEUE_DEPTH.labels(lane=lane.name.value).set(depth)
+
+        try:
+            depth = await asyncio.to_thread(dead_letter_queue.approximate_message_count)
+        except Exception as e:
+            console.print(
+                f"[yellow]Could not sample depth of {dead_letter_queue.name}: "
+                f"{e}[/yellow]"
+            )
+        else:
+            DEAD_LETTER_QUEUE_DEPTH.set(depth)
+
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,71 @@
+"""Split large PDFs into page-range shards for parallel analysis."""
+
+import io
+from typing import BinaryIO
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PdfReadError
+
+
+def open_pdf(file: BinaryIO) -> PdfReader | None:
+    """Open a PDF for sharding.
+
+    Encrypted or unreadable files are not sharded; they are sent to Content
+    Understanding whole, which reports its own error if it cannot read them.
+
+    Args:
+        file: Readable binary file positioned at the start of the content
+
+    Returns:
+        A reader over the file, or None if the file cannot be sharded
+    """
+    try:
+        reader = PdfReader(file)
+        if reader.is_encrypted:
+            return None
+        # Reading the page count parses the page tree, surfacing broken files
+        len(reader.pages)
+        return reader
+    except (PdfReadError, ValueError, OSError):
+        return None
+    finally:
+        file.seek(0)
+
+
+def page_ranges(page_count: int, pages_per_shard: int) -> list[tuple[int, int]]:
+    """Cover a document with contiguous page ranges.
+
+    Args:
+        page_count: Number of pages in the document
+        pages_per_shard: Maximum pages per range
+
+    Returns:
+        (start, stop) pairs of 0-based page indexes, stop exclusive, in order
+    """
+    return [
+        (start, min(start + pages_per_shard, page_count))
+        for start in range(0, page_count, pages_per_shard)
+    ]
+
+
+def write_shard(reader: PdfReader, start: int, stop: int) -> bytes:
+    """Write a page range of a PDF as a standalone PDF.
+
+    ``PdfReader`` is not thread-safe, so callers must not write shards of the
+    same reader concurrently.
+
+    Args:
+        reader: Reader over the source PDF
+        start: Index of the first page
+        stop: Index after the last page
+
+    Returns:
+        The shard's PDF bytes
+    """
+    writer = PdfWriter()
+    for index in range(start, stop):
+        writer.add_page(reader.pages[index])
+
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
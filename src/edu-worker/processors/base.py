@@ -1,10 +1,17 @@
 """Base processor for handling queue tasks."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from typing import TypeVar
 
+from edu_ai.agents.utils import StageCallback
+from edu_core.schemas.generation_jobs import GenerationStage
+from edu_core.services.generation_jobs import GenerationJobService
 from edu_db.session import get_session_factory
+from rich.console import Console
+
+console = Console(force_terminal=True)
 
 T = TypeVar("T")
 
@@ -36,6 +43,53 @@ class BaseProcessor[T](ABC):
         finally:
             db.close()
 
+    def _stage_callback(self, payload) -> StageCallback | None:
+        """Return a callback recording stages on the payload's generation job.
+
+        Job updates are best effort; a failed update never fails the task.
+
+        Args:
+            payload: Task payload, optionally carrying a ``job_id``
+
+        Returns:
+            The callback, or None if the task is not tracked by a job
+        """
+        job_id = payload.get("job_id")
+        if not job_id:
+            return None
+
+        async def on_stage(stage: GenerationStage) -> None:
+            try:
+                await asyncio.to_thread(
+                    GenerationJobService().enter_stage, job_id, stage
+                )
+            except Exception as e:
+                console.print(
+                    f"[yellow]Could not update generation job {job_id}: {e}[/yellow]"
+                )
+
+        return on_stage
+
+    async def aclose(self) -> None:
+        """Release network clients held by the processor.
+
+        Processors owning pooled connections override this; the default is a no-op.
+        """
+        return None
+
+    def mark_failed(self, payload: T) -> None:
+        """Leave the task's target in a failed state.
+
+        The worker calls this when ``process`` was cancelled before its own
+        error handling ran, or the message is dead-lettered. Processors whose
+        targets record a status override it; the default is a no-op.
+
+        Args:
+            payload: The task payload; a claim-checked message may only carry
+                its envelope
+        """
+        return None
+
     @abstractmethod
     async def process(self, payload: T) -> None:
         """Process the task payload.
@@ -4,10 +4,10 @@ from datetime import datetime
 
 from edu_db.models import Chat
 from edu_queue.schemas import ChatTitleGenerationData
+from langchain_openai import AzureChatOpenAI
 from rich.console import Console
 
 from processors.base import BaseProcessor
-from processors.llm import create_llm_non_streaming
 
 console = Console(force_terminal=True)
 
@@ -15,22 +15,13 @@ console = Console(force_terminal=True)
 class ChatTitleProcessor(BaseProcessor[ChatTitleGenerationData]):
     """Processor for generating chat titles."""
 
-    def __init__(
-        self,
-        azure_openai_chat_deployment: str,
-        azure_openai_endpoint: str,
-        azure_openai_api_version: str,
-    ):
+    def __init__(self, llm: AzureChatOpenAI):
         """Initialize the processor.
 
         Args:
-            azure_openai_chat_deployment: Azure OpenAI chat deployment name
-            azure_openai_endpoint: Azure OpenAI endpoint URL
-            azure_openai_api_version: Azure OpenAI API version
+            llm: Chat model shared by the worker
         """
-        self.azure_openai_chat_deployment = azure_openai_chat_deployment
-        self.azure_openai_endpoint = azure_openai_endpoint
-        self.azure_openai_api_version = azure_openai_api_version
+        self.llm = llm
 
     async def process(self, payload: ChatTitleGenerationData) -> None:
         """Generate and update chat title.
@@ -38,14 +29,6 @@ class ChatTitleProcessor(BaseProcessor[ChatTitleGenerationData]):
         Args:
             payload: Chat title generation data
         """
-        # Initialize LLM for title generation
-        llm = create_llm_non_streaming(
-            self.azure_openai_chat_deployment,
-            self.azure_openai_endpoint,
-            self.azure_openai_api_version,
-            temperature=0.25,
-        )
-
         # Generate title
         try:
             prompt = f"""Generate a concise, descriptive title (max 5 words) for a chat based on this conversation:
@@ -55,7 +38,7 @@ Assistant: "{payload["ai_response"]}"
 
 Only respond with the title, nothing else. Do not use quotes."""
 
-            response = await llm.ainvoke(prompt)
+            response = await self.llm.ainvoke(prompt)
             title = response.content.strip()
 
             # Remove quotes if present
@@ -1,69 +1,134 @@
 """Processor for document processing tasks."""
 
 import asyncio
+import hashlib
+import io
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
 from contextlib import suppress
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
 from uuid import uuid4
 
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+import httpx
+from azure.core.credentials import TokenCredential
+from azure.identity import get_bearer_token_provider
 from azure.storage.blob import BlobServiceClient
+from chunking import ChunkingEngine
 from content_understanding import AzureContentUnderstandingClient
-from edu_core.schemas.documents import DocumentStatus
-from edu_db.models import Document, DocumentSegment
-from edu_queue.schemas import DocumentProcessingData
-from langchain_openai import AzureOpenAIEmbeddings
-from langchain_text_splitters import (
-    MarkdownHeaderTextSplitter,
-    RecursiveCharacterTextSplitter,
+from document_cache import DocumentCache, content_hash
+from edu_ai.agents.outline_agent import DocumentOutlineAgent
+from edu_ai.agents.summary_agent import DocumentSummaryAgent
+from edu_core.events import publish_event
+from edu_core.schemas.documents import DocumentProcessingStage, DocumentStatus
+from edu_core.schemas.events import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectResourceType,
 )
+from edu_core.services.document_contents import DocumentContentsService
+from edu_db.models import Document, DocumentSegment
+from edu_queue.schemas import DocumentProcessingData, TaskType
+from edu_queue.service import QueueService
+from extractors import PAGE_BREAK, ExtractorRegistry
+from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from memory_budget import MemoryBudget
+from metrics import DOCUMENT_EXTRACTIONS, PDF_SHARD_ANALYSES, time_external_call
+from pdf_shards import open_pdf, page_ranges, write_shard
 from rich.console import Console
+from sqlalchemy import func, update
 
 from processors.base import BaseProcessor
 
 console = Console(force_terminal=True)
 
+# Completed-stage values in processing order (None: nothing completed yet)
+STAGE_ORDER = [None, *(stage.value for stage in DocumentProcessingStage)]
+
 
 class DocumentProcessor(BaseProcessor[DocumentProcessingData]):
-    """Processor for processing documents with Azure Content Understanding."""
+    """Processor for processing documents with Azure Content Understanding.
+
+    Formats that can be parsed in-process (plain text, markup, email, docx and
+    pptx) bypass Content Understanding and use a local extractor instead.
+    """
 
     def __init__(
         self,
-        azure_storage_connection_string: str,
+        blob_service_client: BlobServiceClient,
         azure_storage_input_container_name: str,
         azure_storage_output_container_name: str,
         azure_cu_endpoint: str,
         azure_cu_key: str,
         azure_cu_analyzer_id: str,
+        azure_cu_max_connections: int,
+        azure_cu_poll_timeout_seconds: int,
         azure_openai_embedding_deployment: str,
         azure_openai_endpoint: str,
         azure_openai_api_version: str,
+        credential: TokenCredential,
+        llm: AzureChatOpenAI,
+        memory_budget: MemoryBudget,
+        spool_max_memory_bytes: int,
+        chunking_engine: ChunkingEngine,
+        embedding_batch_size: int,
+        pdf_shard_min_pages: int,
+        pdf_shard_pages: int,
+        pdf_shard_concurrency: int,
+        pdf_shard_max_retries: int,
+        cpu_executor: Executor,
+        contents_service: DocumentContentsService,
+        queue_service: QueueService | None = None,
     ):
         """Initialize the processor.
 
         Args:
-            azure_storage_connection_string: Azure Storage connection string
+            blob_service_client: Blob service client shared by the worker
             azure_storage_input_container_name: Input container name
             azure_storage_output_container_name: Output container name
             azure_cu_endpoint: Azure Content Understanding endpoint
             azure_cu_key: Azure Content Understanding subscription key
             azure_cu_analyzer_id: Azure Content Understanding analyzer ID
+            azure_cu_max_connections: Connection pool size for Content Understanding
+            azure_cu_poll_timeout_seconds: Maximum wait for a single analysis
             azure_openai_embedding_deployment: Azure OpenAI embedding deployment
             azure_openai_endpoint: Azure OpenAI endpoint
             azure_openai_api_version: Azure OpenAI API version
+            credential: Azure credential shared by the worker
+            llm: Chat model used to summarize documents that come back from
+                analysis without a summary
+            memory_budget: Worker-wide budget for in-flight document bytes
+            spool_max_memory_bytes: Bytes of a download kept in memory before
+                spilling to a temporary file
+            chunking_engine: Token-aware splitter shared by the worker
+            embedding_batch_size: Segments embedded and committed per batch
+            pdf_shard_min_pages: Page count from which PDFs are analyzed in shards
+            pdf_shard_pages: Pages per PDF shard
+            pdf_shard_concurrency: Shards of one PDF analyzed at the same time
+            pdf_shard_max_retries: Retries of a failed shard before the
+                document fails
+            cpu_executor: Executor for CPU-bound parsing (local extraction and
+                PDF sharding), kept apart from the threads doing blocking I/O
+            contents_service: Reads the analyzed markdown checkpointed by an
+                earlier delivery
+            queue_service: Sends a topic graph precomputation task to the bulk
+                lane once a document is indexed; None disables it
         """
-        self.blob_service_client = BlobServiceClient.from_connection_string(
-            azure_storage_connection_string
-        )
+        self.blob_service_client = blob_service_client
         self.input_container = azure_storage_input_container_name
         self.output_container = azure_storage_output_container_name
 
         self.cu_client = AzureContentUnderstandingClient(
             endpoint=azure_cu_endpoint,
             subscription_key=azure_cu_key,
+            max_connections=azure_cu_max_connections,
         )
+        self.cu_poll_timeout_seconds = azure_cu_poll_timeout_seconds
 
         token_provider = get_bearer_token_provider(
-            DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
+            credential, "https://cognitiveservices.azure.com/.default"
         )
         self.embeddings = AzureOpenAIEmbeddings(
             azure_deployment=azure_openai_embedding_deployment,
@@ -72,10 +137,41 @@ class DocumentProcessor(BaseProcessor[DocumentProcessingData]):
             azure_ad_token_provider=token_provider,
         )
         self.analyzer_id = azure_cu_analyzer_id
+        self.memory_budget = memory_budget
+        self.spool_max_memory_bytes = spool_max_memory_bytes
+        self.cache = DocumentCache(
+            analyzer_id=azure_cu_analyzer_id,
+            embedding_model=azure_openai_embedding_deployment,
+        )
+        self.extractors = ExtractorRegistry()
+        self.chunking_engine = chunking_engine
+        self.embedding_batch_size = embedding_batch_size
+        self.pdf_shard_min_pages = pdf_shard_min_pages
+        self.pdf_shard_pages = pdf_shard_pages
+        self.pdf_shard_concurrency = pdf_shard_concurrency
+        self.pdf_shard_max_retries = pdf_shard_max_retries
+        self.cpu_executor = cpu_executor
+        self.contents_service = contents_service
+        self.queue_service = queue_service
+        self.summary_agent = DocumentSummaryAgent(llm=llm)
+        self.outline_agent = DocumentOutlineAgent(llm=llm)
+
+    async def aclose(self) -> None:
+        """Close the Content Understanding connection pool."""
+        await self.cu_client.aclose()
 
     async def process(self, payload: DocumentProcessingData) -> None:
         """Process document asynchronously: analyze, index, and create embeddings.
 
+        Each stage is checkpointed on the document (``processing_stage``), with
+        the analyzed markdown persisted as ``contents.txt``. A redelivered message
+        resumes after the last completed stage, so a failure during embedding
+        never repeats the Content Understanding analysis. Stage transitions are
+        compare-and-set updates, which keeps duplicate deliveries idempotent.
+
+        Database sessions are only held for short reads and writes, never across
+        downloads, Content Understanding polling or embedding calls.
+
         Args:
             payload: Document processing data
 
@@ -85,303 +181,827 @@ class DocumentProcessor(BaseProcessor[DocumentProcessingData]):
         document_id = payload["document_id"]
         project_id = payload["project_id"]
 
-        with self._get_db_session() as db:
-            try:
-                # Get document to find blob name
+        try:
+            with self._get_db_session() as db:
                 document = db.query(Document).filter(Document.id == document_id).first()
                 if not document:
                     raise ValueError(f"Document {document_id} not found")
 
-                # Get blob from input container
-                file_extension = (
-                    document.file_type if document.file_type != "unknown" else ""
-                )
-                if file_extension:
-                    blob_name = f"{project_id}/{document_id}.{file_extension}"
-                else:
-                    blob_name = f"{project_id}/{document_id}"
+                stage = document.processing_stage
+                if (
+                    stage != DocumentProcessingStage.INDEXED.value
+                    and document.status == DocumentStatus.FAILED.value
+                ):
+                    document.status = (
+                        DocumentStatus.PROCESSED.value
+                        if self._has_reached(stage, DocumentProcessingStage.STORED)
+                        else DocumentStatus.PROCESSING.value
+                    )
+                    self._publish_status(
+                        db,
+                        document_id=document_id,
+                        project_id=project_id,
+                        status=document.status,
+                    )
+
+            if stage == DocumentProcessingStage.INDEXED.value:
+                console.log(f"Document {document_id} already indexed, skipping")
+                # An earlier delivery may have stopped before the outline
+                await self._generate_outline(document_id=document_id)
+                return
+            if stage is not None:
+                console.log(f"Resuming document {document_id} after stage {stage}")
+
+            blob_name = self._get_blob_name(document)
+            contents_blob_name = DocumentContentsService.get_blob_name(
+                project_id, document_id
+            )
 
+            # Step 1: Extract text and checkpoint it as contents.txt
+            if self._has_reached(stage, DocumentProcessingStage.ANALYZED):
+                analyzed_content = await self.contents_service.load(
+                    project_id, document_id
+                )
+                analyzed_summary = document.summary
+            else:
                 blob_client = self.blob_service_client.get_blob_client(
                     container=self.input_container, blob=blob_name
                 )
-                file_content = blob_client.download_blob().readall()
-
-                # Step 1: Extract text using Content Understanding
-                analyzed_result = await asyncio.to_thread(
-                    self._analyze_document, file_content=file_content
+                analyzed_result = await self._get_analysis(
+                    document=document, blob_client=blob_client
                 )
                 analyzed_content = analyzed_result["content"]
                 analyzed_summary = analyzed_result["summary"]
 
-                # Step 2: Move blob from input to output and create contents.txt
                 await asyncio.to_thread(
-                    self._move_blob_to_output,
+                    self._upload_contents,
+                    blob_name=contents_blob_name,
                     content=analyzed_content,
-                    project_id=project_id,
-                    document_id=document_id,
-                    db=db,
                 )
-
-                # Step 3: Update document status to processed
-                self._update_document_processed_status(
-                    db=db,
+                stage = self._advance_stage(
                     document_id=document_id,
+                    project_id=project_id,
+                    expected=stage,
+                    stage=DocumentProcessingStage.ANALYZED,
                     summary=analyzed_summary,
+                    processed_text_blob_name=contents_blob_name,
                 )
 
-                # Step 4: Create segments and embeddings
-                await self._create_segments_and_embeddings(
-                    db=db, document_id=document_id, content=analyzed_content
+            # Step 2: Move the original blob from input to output
+            if not self._has_reached(stage, DocumentProcessingStage.STORED):
+                await asyncio.to_thread(self._move_blob_to_output, blob_name=blob_name)
+                stage = self._advance_stage(
+                    document_id=document_id,
+                    project_id=project_id,
+                    expected=stage,
+                    stage=DocumentProcessingStage.STORED,
+                    status=DocumentStatus.PROCESSED.value,
+                    processed_at=datetime.now(),
                 )
 
-                # Step 5: Mark document as indexed
-                self._mark_document_indexed(db=db, document_id=document_id)
-
-                console.log(f"Processed document {document_id}")
-            except Exception:
-                self._mark_document_failed(db=db, document_id=document_id)
-                raise
+            # Step 3: Split into segments
+            if not self._has_reached(stage, DocumentProcessingStage.SEGMENTED):
+                pages = await self.chunking_engine.asplit_pages(analyzed_content)
+                with self._get_db_session() as db:
+                    stage = self._create_document_segments(
+                        db=db, document_id=document_id, pages=pages, expected=stage
+                    )
+
+            # Step 4: Embed the segments that have no vector yet, page by page;
+            # the document is searchable as soon as the first batch is stored
+            await self._generate_embeddings_for_segments(
+                document_id=document_id, project_id=project_id
+            )
 
-    def _analyze_document(self, file_content: bytes) -> dict:
-        """Analyze document using Azure Content Understanding.
+            # Step 5: Mark document as indexed
+            stage = self._advance_stage(
+                document_id=document_id,
+                project_id=project_id,
+                expected=stage,
+                stage=DocumentProcessingStage.INDEXED,
+                status=DocumentStatus.INDEXED.value,
+                indexing_progress=100,
+            )
 
-        Args:
-            file_content: The file content as bytes
+            # Step 6: Summarize locally extracted documents once they are
+            # already searchable, so the LLM call never delays indexing
+            if analyzed_summary is None:
+                await self._generate_summary(
+                    document_id=document_id, content=analyzed_content
+                )
 
-        Returns:
-            Dictionary containing content and summary
-        """
-        response = self.cu_client.begin_analyze_data(
-            analyzer_id=self.analyzer_id, data=file_content
-        )
-        result = self.cu_client.poll_result(response=response)
+            # Step 7: Outline the document for topic graphs, which read the
+            # outlines instead of the full text
+            await self._generate_outline(document_id=document_id)
 
-        contents_item = result["result"]["contents"][0]
+            # Step 8: Refresh the project's cached topic graph in the background
+            await self._request_topic_graph(project_id=project_id)
 
-        content = contents_item["markdown"]
-        summary = contents_item["fields"]["Summary"]["valueString"]
+            console.log(f"Processed document {document_id}")
+        except Exception:
+            self._mark_document_failed(document_id=document_id)
+            raise
 
-        return {
-            "content": content,
-            "summary": summary,
-        }
+    async def _request_topic_graph(self, project_id: str) -> None:
+        """Queue precomputation of the project's topic graph, if enabled.
 
-    def _move_blob_to_output(
-        self, content: str, project_id: str, document_id: str, db
-    ) -> None:
-        """Move original blob from input to output and create processed contents file.
+        Failures are only logged; the graph is then built on first use.
 
         Args:
-            content: The processed content
             project_id: The project ID
-            document_id: The document ID
-            db: Database session
         """
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if not document:
-            raise ValueError(f"Document {document_id} not found")
+        if self.queue_service is None:
+            return
+        try:
+            await self.queue_service.send_message(
+                {
+                    "type": TaskType.TOPIC_GRAPH_GENERATION,
+                    "data": {"project_id": project_id},
+                }
+            )
+        except Exception as e:
+            console.print(
+                f"[yellow]Could not queue topic graph for project {project_id}: "
+                f"{e}[/yellow]"
+            )
+
+    @staticmethod
+    def _get_blob_name(document: Document) -> str:
+        """Get the name of a document's original blob.
+
+        Args:
+            document: The document
 
+        Returns:
+            Blob name, identical in the input and output containers
+        """
         file_extension = document.file_type if document.file_type != "unknown" else ""
         if file_extension:
-            original_blob_name = f"{project_id}/{document_id}.{file_extension}"
-        else:
-            original_blob_name = f"{project_id}/{document_id}"
+            return f"{document.project_id}/{document.id}.{file_extension}"
+        return f"{document.project_id}/{document.id}"
 
-        contents_blob_name = f"{project_id}/{document_id}.contents.txt"
+    @staticmethod
+    def _has_reached(stage: str | None, target: DocumentProcessingStage) -> bool:
+        """Check whether a processing stage is at or past the target stage.
 
-        # Copy original blob from input to output container
-        input_blob_client = self.blob_service_client.get_blob_client(
-            container=self.input_container,
-            blob=original_blob_name,
-        )
-        output_blob_client = self.blob_service_client.get_blob_client(
-            container=self.output_container,
-            blob=original_blob_name,
+        Args:
+            stage: Current processing stage value, None if nothing completed
+            target: Stage to compare against
+
+        Returns:
+            True if the target stage has been completed
+        """
+        return stage is not None and STAGE_ORDER.index(stage) >= STAGE_ORDER.index(
+            target.value
         )
 
-        blob_data = input_blob_client.download_blob().readall()
-        output_blob_client.upload_blob(blob_data, overwrite=True)
+    def _advance_stage(
+        self,
+        document_id: str,
+        project_id: str,
+        expected: str | None,
+        stage: DocumentProcessingStage,
+        **values,
+    ) -> str:
+        """Record a completed stage if the document is still at the expected stage.
+
+        The update is a compare-and-set, so when a duplicate delivery of the same
+        message got there first, this one leaves the row alone and carries on
+        from the stage that delivery recorded. A status change is published
+        to the project's event stream.
 
-        # Create contents.txt file with processed content
-        contents_blob_client = self.blob_service_client.get_blob_client(
-            container=self.output_container,
-            blob=contents_blob_name,
+        Args:
+            document_id: The document ID
+            project_id: The project ID
+            expected: Stage the caller started from
+            stage: Stage that has just been completed
+            **values: Further document columns to set with the stage
+
+        Returns:
+            The document's processing stage after the update
+        """
+        with self._get_db_session() as db:
+            advanced = self._compare_and_set_stage(
+                db=db, document_id=document_id, expected=expected, stage=stage, **values
+            )
+            if advanced and "status" in values:
+                self._publish_status(
+                    db,
+                    document_id=document_id,
+                    project_id=project_id,
+                    status=values["status"],
+                    progress=values.get("indexing_progress"),
+                )
+            db.commit()
+            if advanced:
+                return stage.value
+
+            current = (
+                db.query(Document.processing_stage)
+                .filter(Document.id == document_id)
+                .scalar()
+            )
+        console.log(
+            f"Document {document_id} was advanced to {current} by another delivery"
         )
-        contents_blob_client.upload_blob(content.encode("utf-8"), overwrite=True)
+        return current
 
-        # Delete the original blob from input container
-        with suppress(Exception):
-            input_blob_client.delete_blob()
+    @staticmethod
+    def _compare_and_set_stage(
+        db,
+        document_id: str,
+        expected: str | None,
+        stage: DocumentProcessingStage,
+        **values,
+    ) -> bool:
+        """Update the stage without committing; returns whether the row matched."""
+        result = db.execute(
+            update(Document)
+            .where(
+                Document.id == document_id,
+                Document.processing_stage.is_not_distinct_from(expected),
+            )
+            .values(processing_stage=stage.value, **values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
 
-        db.commit()
+    async def _get_analysis(self, document: Document, blob_client) -> dict:
+        """Get the analysis result for a document, reusing cached results.
 
-    async def _create_segments_and_embeddings(
-        self, db, document_id: str, content: str
-    ) -> None:
-        """Create document segments and generate embeddings.
+        Plain-text formats and Office documents with a local extractor are parsed
+        in-process and come back without a summary; everything else goes through
+        Azure Content Understanding. PDFs with at least ``pdf_shard_min_pages``
+        pages are analyzed in page-range shards and also come back without a
+        summary. The input blob is only downloaded on a cache
+        miss. It is streamed into a
+        spooled temporary file (spilling to disk above the configured threshold)
+        while being hashed, and the download is admitted through the worker's
+        memory budget so concurrent large documents cannot exhaust RAM.
 
         Args:
-            db: Database session
-            document_id: The document ID
-            content: The document content
+            document: The document being processed (detached from its session)
+            blob_client: Blob client for the input blob
+
+        Returns:
+            Dictionary containing content and summary
         """
-        # Split text into chunks
-        chunks = self.split_markdown_with_headers(text=content)
+        extractor = self.extractors.get_extractor(document.file_type)
+
+        if extractor is None and document.content_hash:
+            with self._get_db_session() as db:
+                cached = self.cache.get_analysis(db=db, file_hash=document.content_hash)
+            if cached is not None:
+                console.log(f"Reusing cached analysis for document {document.id}")
+                DOCUMENT_EXTRACTIONS.labels(method="cache").inc()
+                return cached
+
+        properties = await asyncio.to_thread(blob_client.get_blob_properties)
+        async with self.memory_budget.reserve(properties.size):
+            with SpooledTemporaryFile(max_size=self.spool_max_memory_bytes) as file:
+                file_hash = await asyncio.to_thread(
+                    self._download_blob_to_file, blob_client=blob_client, file=file
+                )
+
+                if document.content_hash != file_hash:
+                    known_hash = document.content_hash
+                    document.content_hash = file_hash
+                    with self._get_db_session() as db:
+                        db.execute(
+                            update(Document)
+                            .where(Document.id == document.id)
+                            .values(content_hash=file_hash)
+                        )
+                        cached = None
+                        if known_hash is None and extractor is None:
+                            cached = self.cache.get_analysis(db=db, file_hash=file_hash)
+                    if cached is not None:
+                        DOCUMENT_EXTRACTIONS.labels(method="cache").inc()
+                        return cached
+
+                if extractor is not None:
+                    content = await self._run_cpu_bound(extractor.extract, file)
+                    DOCUMENT_EXTRACTIONS.labels(method="local").inc()
+                    return {"content": content, "summary": None}
+
+                reader = None
+                if document.file_type == "pdf":
+                    reader = await self._run_cpu_bound(open_pdf, file)
+                if reader is not None and len(reader.pages) >= self.pdf_shard_min_pages:
+                    analyzed_result = await self._analyze_pdf_shards(
+                        reader=reader, file_hash=file_hash
+                    )
+                else:
+                    analyzed_result = await self._analyze_document(file=file)
+                DOCUMENT_EXTRACTIONS.labels(method="content_understanding").inc()
+
+        with self._get_db_session() as db:
+            self.cache.put_analysis(
+                db=db,
+                file_hash=file_hash,
+                content=analyzed_result["content"],
+                summary=analyzed_result["summary"],
+            )
+        return analyzed_result
 
-        # Create segments in database
-        self._create_document_segments(document_id=document_id, chunks=chunks, db=db)
+    async def _run_cpu_bound(self, func: Callable, *args):
+        """Run a CPU-bound function on the CPU executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.cpu_executor, func, *args)
 
-        # Generate embeddings for all segments
-        await self._generate_embeddings_for_segments(document_id=document_id, db=db)
+    async def _generate_summary(self, document_id: str, content: str) -> None:
+        """Generate and store a summary for a document extracted locally.
 
-    async def _generate_embeddings_for_segments(self, db, document_id: str) -> None:
-        """Generate embeddings for document segments with rate limiting.
+        A failed summary does not fail the document; it simply stays without one.
 
         Args:
-            db: Database session
             document_id: The document ID
+            content: The document markdown
         """
-        segments = (
-            db.query(DocumentSegment)
-            .filter(
-                DocumentSegment.document_id == document_id,
-                DocumentSegment.embedding_vector.is_(None),
+        with self._get_db_session() as db:
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if not document or document.summary:
+                return
+            language_code = document.project.language_code if document.project else "en"
+
+        try:
+            summary = await self.summary_agent.summarize(
+                content=content, language_code=language_code
+            )
+            with self._get_db_session() as db:
+                db.execute(
+                    update(Document)
+                    .where(Document.id == document_id)
+                    .values(summary=summary)
+                )
+        except Exception as e:
+            console.print(
+                f"[yellow]Error summarizing document {document_id}: {e}[/yellow]"
             )
-            .all()
-        )
 
+    async def _generate_outline(self, document_id: str) -> None:
+        """Generate and store the topic outline of an indexed document.
+
+        A failed outline does not fail the document; topic graphs then use an
+        excerpt of its text instead.
+
+        Args:
+            document_id: The document ID
+        """
+        with self._get_db_session() as db:
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if not document or document.outline is not None:
+                return
+            language_code = document.project.language_code if document.project else "en"
+            segments = (
+                db.query(DocumentSegment.position, DocumentSegment.content)
+                .filter(DocumentSegment.document_id == document_id)
+                .order_by(DocumentSegment.position)
+                .all()
+            )
         if not segments:
             return
 
-        texts = [str(segment.content) for segment in segments]
+        try:
+            outline = await self.outline_agent.outline(
+                segments=[(position, content) for position, content in segments],
+                language_code=language_code,
+            )
+            with self._get_db_session() as db:
+                db.execute(
+                    update(Document)
+                    .where(Document.id == document_id)
+                    .values(outline=outline.model_dump(mode="json"))
+                )
+        except Exception as e:
+            console.print(
+                f"[yellow]Error outlining document {document_id}: {e}[/yellow]"
+            )
 
-        embeddings_list = await self.embeddings.aembed_documents(texts)
+    @staticmethod
+    def _download_blob_to_file(blob_client, file: BinaryIO) -> str:
+        """Stream a blob into a file chunk by chunk, hashing it on the way.
 
-        batch_num = len(embeddings_list) // 20 + 1
-        for i in range(batch_num):
-            start_index = i * 20
-            end_index = min((i + 1) * 20, len(embeddings_list))
-            batch_segments = segments[start_index:end_index]
-            batch_embeddings = embeddings_list[start_index:end_index]
+        Args:
+            blob_client: Blob client to download from
+            file: Writable binary file to receive the content
 
-            for segment, embedding in zip(
-                batch_segments, batch_embeddings, strict=False
-            ):
-                segment.embedding_vector = embedding
+        Returns:
+            Hex-encoded SHA-256 digest of the blob content
+        """
+        digest = hashlib.sha256()
+        for chunk in blob_client.download_blob().chunks():
+            digest.update(chunk)
+            file.write(chunk)
+        file.seek(0)
+        return digest.hexdigest()
+
+    async def _analyze_document(self, file: BinaryIO) -> dict:
+        """Analyze document using Azure Content Understanding.
 
-            db.commit()
+        Args:
+            file: Readable binary file positioned at the start of the content
 
-            if i < batch_num - 1:
-                await asyncio.sleep(1)
+        Returns:
+            Dictionary containing content and summary
+        """
+        # Measured from submission until the result is ready
+        with time_external_call("content_understanding", "analyze"):
+            response = await self.cu_client.begin_analyze_data(
+                analyzer_id=self.analyzer_id, data=file
+            )
+            result = await self.cu_client.poll_result(
+                response=response, timeout_seconds=self.cu_poll_timeout_seconds
+            )
 
-        db.commit()
+        contents_item = result["result"]["contents"][0]
 
-    @staticmethod
-    def split_markdown_with_headers(
-        text: str,
-        chunk_size: int = 1000,
-        chunk_overlap: int = 200,
-        length_function=len,
-        delimiter: str = "<!-- PageBreak -->",
-    ) -> list[str]:
-        """Split markdown text into chunks using headers and page breaks.
+        content = contents_item["markdown"]
+        summary = contents_item["fields"]["Summary"]["valueString"]
+
+        return {
+            "content": content,
+            "summary": summary,
+        }
+
+    async def _analyze_pdf_shards(self, reader, file_hash: str) -> dict:
+        """Analyze a large PDF as page-range shards and stitch the markdown.
+
+        Shards are written from the reader only when a concurrency slot frees
+        up, so at most ``pdf_shard_concurrency`` shards are held in memory. Each
+        shard is cached under a key derived from the file hash and its page
+        range, and retried on its own, so a failure or a redelivered message
+        only re-analyzes the shards that have not succeeded yet.
 
         Args:
-            text: The text to split
-            chunk_size: Maximum size of each chunk
-            chunk_overlap: Overlap between chunks
-            length_function: Function to calculate length
-            delimiter: Page break delimiter
+            reader: PdfReader over the downloaded file
+            file_hash: SHA-256 of the whole file
 
         Returns:
-            List of text chunks
+            Dictionary containing content and a None summary
+
+        Raises:
+            httpx.HTTPError, TimeoutError, RuntimeError: If a shard still fails
+                after ``pdf_shard_max_retries`` retries
         """
-        pages = [p.strip() for p in text.split(delimiter) if p.strip()]
+        ranges = page_ranges(len(reader.pages), self.pdf_shard_pages)
+        semaphore = asyncio.Semaphore(self.pdf_shard_concurrency)
+        # PdfReader is not thread-safe; shards are written one at a time
+        reader_lock = asyncio.Lock()
+
+        async def analyze_shard(start: int, stop: int) -> str:
+            shard_hash = content_hash(f"{file_hash}:pages={start + 1}-{stop}")
+            with self._get_db_session() as db:
+                cached = self.cache.get_analysis(db=db, file_hash=shard_hash)
+            if cached is not None:
+                PDF_SHARD_ANALYSES.labels(result="cache").inc()
+                return cached["content"]
+
+            async with semaphore:
+                async with reader_lock:
+                    write = asyncio.ensure_future(
+                        self._run_cpu_bound(write_shard, reader, start, stop)
+                    )
+                    try:
+                        data = await asyncio.shield(write)
+                    except asyncio.CancelledError:
+                        # The thread keeps reading the file; it must finish
+                        # before the caller closes the file
+                        await asyncio.wait([write])
+                        raise
+                result = await self._retry_shard(
+                    lambda: self._analyze_document(file=io.BytesIO(data)),
+                    description=f"pages {start + 1}-{stop}",
+                )
 
-        header_splitter = MarkdownHeaderTextSplitter(
-            headers_to_split_on=[("#", "h1"), ("##", "h2"), ("###", "h3")]
-        )
-        chunker = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=length_function,
+            with self._get_db_session() as db:
+                self.cache.put_analysis(
+                    db=db,
+                    file_hash=shard_hash,
+                    content=result["content"],
+                    summary=result["summary"],
+                )
+            return result["content"]
+
+        console.log(
+            f"Analyzing {len(reader.pages)} pages in {len(ranges)} shards "
+            f"of up to {self.pdf_shard_pages} pages"
         )
+        try:
+            # A failed shard cancels the others, and all of them have finished
+            # before the temporary file is closed
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(analyze_shard(start, stop))
+                    for start, stop in ranges
+                ]
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+        content = f"\n{PAGE_BREAK}\n".join(task.result().strip() for task in tasks)
+        return {"content": content, "summary": None}
+
+    async def _retry_shard(self, analyze: Callable, description: str) -> dict:
+        """Run a shard analysis, retrying transient failures with backoff.
+
+        Args:
+            analyze: Coroutine function performing one attempt
+            description: Shard description for log messages
 
-        chunks: list[str] = []
-        for page in pages:
-            sections = header_splitter.split_text(page)
+        Returns:
+            The analysis result of the first successful attempt
+        """
+        for attempt in range(self.pdf_shard_max_retries + 1):
             try:
-                chunks.extend(
-                    [d.page_content for d in chunker.split_documents(sections)]
+                result = await analyze()
+                PDF_SHARD_ANALYSES.labels(result="analyzed").inc()
+                return result
+            except (httpx.HTTPError, TimeoutError, RuntimeError) as e:
+                PDF_SHARD_ANALYSES.labels(result="failed").inc()
+                if attempt == self.pdf_shard_max_retries:
+                    raise
+                console.print(
+                    f"[yellow]Retrying shard ({description}) after error: {e}[/yellow]"
                 )
-            except AttributeError:
-                for sec in sections:
-                    chunks.extend(chunker.split_text(sec.page_content))
-        return chunks
+                await asyncio.sleep(2**attempt)
 
-    @staticmethod
-    def _update_document_processed_status(db, document_id: str, summary: str) -> None:
-        """Update document status to processed.
+    def _upload_contents(self, blob_name: str, content: str) -> None:
+        """Store the analyzed markdown in the output container.
 
         Args:
-            db: Database session
-            document_id: The document ID
-            summary: Document summary
+            blob_name: Name of the contents blob
+            content: The analyzed markdown
         """
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if document:
-            document.status = DocumentStatus.PROCESSED.value
-            document.processed_at = datetime.now()
-            document.summary = summary
-            db.commit()
+        contents_blob_client = self.blob_service_client.get_blob_client(
+            container=self.output_container,
+            blob=blob_name,
+        )
+        contents_blob_client.upload_blob(content.encode("utf-8"), overwrite=True)
+
+    def _move_blob_to_output(self, blob_name: str) -> None:
+        """Move original blob from input to output.
+
+        Safe to repeat: if the input blob is already gone but the output copy
+        exists, an earlier delivery finished the move.
+
+        Args:
+            blob_name: Name of the original blob
+
+        Raises:
+            ValueError: If the blob exists in neither container
+        """
+        # Copy original blob from input to output container server-side, so the
+        # bytes never pass through the worker
+        input_blob_client = self.blob_service_client.get_blob_client(
+            container=self.input_container,
+            blob=blob_name,
+        )
+        output_blob_client = self.blob_service_client.get_blob_client(
+            container=self.output_container,
+            blob=blob_name,
+        )
+
+        if not input_blob_client.exists():
+            if output_blob_client.exists():
+                return
+            raise ValueError(f"Blob {blob_name} not found")
+
+        copy = output_blob_client.start_copy_from_url(input_blob_client.url)
+        self._wait_for_copy(output_blob_client, copy)
+
+        # Delete the original blob from input container
+        with suppress(Exception):
+            input_blob_client.delete_blob()
 
     @staticmethod
-    def _mark_document_indexed(db, document_id: str) -> None:
-        """Mark document as indexed.
+    def _wait_for_copy(
+        blob_client,
+        copy: dict,
+        timeout_seconds: int = 300,
+        polling_interval_seconds: float = 0.5,
+    ) -> None:
+        """Wait for a server-side blob copy to finish.
+
+        Args:
+            blob_client: Blob client of the copy destination
+            copy: Copy properties returned by start_copy_from_url
+            timeout_seconds: Maximum number of seconds to wait
+            polling_interval_seconds: Seconds to wait between status checks
+
+        Raises:
+            TimeoutError: If the copy does not finish in time
+            RuntimeError: If the copy fails or is aborted
+        """
+        status = copy["copy_status"]
+        start_time = time.monotonic()
+        while status == "pending":
+            if time.monotonic() - start_time > timeout_seconds:
+                blob_client.abort_copy(copy["copy_id"])
+                raise TimeoutError(
+                    f"Blob copy timed out after {timeout_seconds:.2f} seconds."
+                )
+            time.sleep(polling_interval_seconds)
+            status = blob_client.get_blob_properties().copy.status
+
+        if status != "success":
+            raise RuntimeError(f"Blob copy finished with status '{status}'.")
+
+    async def _generate_embeddings_for_segments(
+        self, document_id: str, project_id: str
+    ) -> None:
+        """Embed document segments progressively, in page order.
+
+        Segments without a vector are embedded in batches of
+        ``embedding_batch_size`` following their position in the document. Each
+        batch is committed together with the document's indexing progress, and
+        the document is marked partially indexed after the first batch, so search
+        serves the first pages while later ones are still being embedded.
+
+        Vectors already computed for identical chunk text with the same model are
+        reused from the embedding cache; only the misses are sent to Azure OpenAI.
+        No database session is held while the embedding requests are in flight.
 
         Args:
-            db: Database session
             document_id: The document ID
+            project_id: The project ID
         """
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if document:
-            document.status = DocumentStatus.INDEXED.value
-            db.commit()
+        with self._get_db_session() as db:
+            total = (
+                db.query(func.count(DocumentSegment.id))
+                .filter(DocumentSegment.document_id == document_id)
+                .scalar()
+            )
+            segments = (
+                db.query(DocumentSegment.id, DocumentSegment.content)
+                .filter(
+                    DocumentSegment.document_id == document_id,
+                    DocumentSegment.embedding_vector.is_(None),
+                )
+                .order_by(DocumentSegment.position)
+                .all()
+            )
+        if not segments:
+            return
 
-    @staticmethod
-    def _mark_document_failed(db, document_id: str) -> None:
+        embedded = total - len(segments)
+        for start in range(0, len(segments), self.embedding_batch_size):
+            batch = segments[start : start + self.embedding_batch_size]
+            texts = [str(segment.content) for segment in batch]
+            text_hashes = [content_hash(text) for text in texts]
+
+            with self._get_db_session() as db:
+                cached = self.cache.get_embeddings(db=db, texts=texts)
+
+            missing = {
+                text_hash: text
+                for text_hash, text in zip(text_hashes, texts, strict=True)
+                if text_hash not in cached
+            }
+            computed = {}
+            if missing:
+                with time_external_call("azure_openai", "embeddings"):
+                    new_embeddings = await self.embeddings.aembed_documents(
+                        list(missing.values())
+                    )
+                computed = dict(zip(missing.keys(), new_embeddings, strict=True))
+                cached.update(computed)
+
+            embedded += len(batch)
+            # Cache entries, vectors and progress are committed together
+            with self._get_db_session() as db:
+                self.cache.put_embeddings(db=db, embeddings=computed)
+                db.execute(
+                    update(DocumentSegment),
+                    [
+                        {"id": segment.id, "embedding_vector": cached[text_hash]}
+                        for segment, text_hash in zip(batch, text_hashes, strict=True)
+                    ],
+                )
+                progress = embedded * 100 // total
+                result = db.execute(
+                    update(Document)
+                    .where(
+                        Document.id == document_id,
+                        Document.status != DocumentStatus.INDEXED.value,
+                    )
+                    .values(
+                        status=DocumentStatus.PARTIALLY_INDEXED.value,
+                        indexing_progress=progress,
+                    )
+                )
+                if result.rowcount:
+                    self._publish_status(
+                        db,
+                        document_id=document_id,
+                        project_id=project_id,
+                        status=DocumentStatus.PARTIALLY_INDEXED.value,
+                        progress=progress,
+                    )
+
+    def mark_failed(self, payload: DocumentProcessingData) -> None:
+        """Mark the payload's document as failed.
+
+        Args:
+            payload: Document processing data
+        """
+        document_id = payload.get("document_id")
+        if document_id:
+            self._mark_document_failed(document_id=document_id)
+
+    def _mark_document_failed(self, document_id: str) -> None:
         """Mark document as failed.
 
+        The processing stage is left untouched so a redelivery can resume.
+        Indexed documents and documents already marked failed are left alone.
+
         Args:
-            db: Database session
             document_id: The document ID
         """
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if document:
-            document.status = DocumentStatus.FAILED.value
-            db.commit()
+        with self._get_db_session() as db:
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if document and document.status not in (
+                DocumentStatus.INDEXED.value,
+                DocumentStatus.FAILED.value,
+            ):
+                document.status = DocumentStatus.FAILED.value
+                self._publish_status(
+                    db,
+                    document_id=document_id,
+                    project_id=document.project_id,
+                    status=document.status,
+                )
 
     @staticmethod
-    def _create_document_segments(
+    def _publish_status(
         db,
         document_id: str,
-        chunks: list[str],
+        project_id: str,
+        status: str,
+        progress: int | None = None,
     ) -> None:
-        """Create document segments in database.
+        """Publish a document status change, delivered when ``db`` commits."""
+        publish_event(
+            ProjectEvent(
+                type=ProjectEventType.DOCUMENT_STATUS_CHANGED,
+                project_id=project_id,
+                resource_type=ProjectResourceType.DOCUMENT,
+                resource_id=document_id,
+                status=status,
+                progress=progress,
+            ),
+            db=db,
+        )
+
+    @staticmethod
+    def _create_document_segments(
+        db,
+        document_id: str,
+        pages: list[tuple[int, list[str]]],
+        expected: str | None,
+    ) -> str:
+        """Create document segments and record the segmented stage atomically.
+
+        Segments left behind by an interrupted run are replaced. If a duplicate
+        delivery has already segmented the document, nothing is written.
 
         Args:
             db: Database session
             document_id: The document ID
-            chunks: List of text chunks
+            pages: (page number, chunks) pairs in page order
+            expected: Stage the caller started from
+
+        Returns:
+            The document's processing stage after the update
         """
+        db.query(DocumentSegment).filter(
+            DocumentSegment.document_id == document_id
+        ).delete(synchronize_session=False)
+        chunks = [(page_number, chunk) for page_number, page in pages for chunk in page]
         segments = [
             DocumentSegment(
                 id=str(uuid4()),
                 document_id=document_id,
                 content=chunk,
                 content_type="text",
+                page_number=page_number,
+                position=position,
             )
-            for chunk in chunks
+            for position, (page_number, chunk) in enumerate(chunks)
         ]
         db.add_all(segments)
-        db.commit()
+        db.flush()
+
+        if DocumentProcessor._compare_and_set_stage(
+            db=db,
+            document_id=document_id,
+            expected=expected,
+            stage=DocumentProcessingStage.SEGMENTED,
+        ):
+            db.commit()
+            return DocumentProcessingStage.SEGMENTED.value
+
+        db.rollback()
+        return (
+            db.query(Document.processing_stage)
+            .filter(Document.id == document_id)
+            .scalar()
+        )
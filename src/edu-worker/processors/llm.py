@@ -1,5 +1,6 @@
 """LLM helper utilities for worker processes."""
 
+from azure.core.credentials import TokenCredential
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from langchain_openai import AzureChatOpenAI
 
@@ -10,6 +11,7 @@ def create_llm(
     azure_openai_api_version: str,
     streaming: bool = True,
     temperature: float = 0.25,
+    credential: TokenCredential | None = None,
 ) -> AzureChatOpenAI:
     """Create an AzureChatOpenAI instance for worker processes.
 
@@ -19,11 +21,13 @@ def create_llm(
         azure_openai_api_version: Azure OpenAI API version
         streaming: Whether to enable streaming
         temperature: Temperature for the LLM
+        credential: Credential to authenticate with; a new
+            DefaultAzureCredential when omitted
 
     Returns:
         Configured AzureChatOpenAI instance
     """
-    credential = DefaultAzureCredential()
+    credential = credential or DefaultAzureCredential()
     token_provider = get_bearer_token_provider(
         credential, "https://cognitiveservices.azure.com/.default"
     )
@@ -47,6 +51,7 @@ def create_llm_non_streaming(
     azure_openai_endpoint: str,
     azure_openai_api_version: str,
     temperature: float = 0.25,
+    credential: TokenCredential | None = None,
 ) -> AzureChatOpenAI:
     """Create a non-streaming AzureChatOpenAI instance for worker processes.
 
@@ -55,6 +60,7 @@ def create_llm_non_streaming(
         azure_openai_endpoint: Azure OpenAI endpoint URL
         azure_openai_api_version: Azure OpenAI API version
         temperature: Temperature for the LLM
+        credential: Credential to authenticate with
 
     Returns:
         Configured non-streaming AzureChatOpenAI instance
@@ -65,4 +71,5 @@ def create_llm_non_streaming(
         azure_openai_api_version,
         streaming=False,
         temperature=temperature,
+        credential=credential,
     )
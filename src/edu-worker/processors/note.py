@@ -1,13 +1,12 @@
 """Processor for note generation tasks."""
 
-from azure.storage.blob import BlobServiceClient
 from edu_ai.agents.note_agent import NoteAgent
 from edu_ai.agents.topic_graph_agent import TopicGraphAgent
 from edu_queue.schemas import NoteGenerationData
+from langchain_openai import AzureChatOpenAI
 from rich.console import Console
 
 from processors.base import BaseProcessor
-from processors.llm import create_llm_non_streaming
 
 console = Console(force_terminal=True)
 
@@ -18,28 +17,21 @@ class NoteProcessor(BaseProcessor[NoteGenerationData]):
     def __init__(
         self,
         search_service,
-        azure_openai_chat_deployment: str,
-        azure_openai_endpoint: str,
-        azure_openai_api_version: str,
-        azure_storage_connection_string: str,
-        azure_storage_output_container_name: str,
+        llm: AzureChatOpenAI,
+        topic_graph_agent: TopicGraphAgent,
     ):
         """Initialize the processor.
 
         Args:
             search_service: SearchService for RAG
-            azure_openai_chat_deployment: Azure OpenAI chat deployment name
-            azure_openai_endpoint: Azure OpenAI endpoint URL
-            azure_openai_api_version: Azure OpenAI API version
-            azure_storage_connection_string: Azure Storage connection string
-            azure_storage_output_container_name: Output container name
+            llm: Chat model shared by the worker
+            topic_graph_agent: TopicGraphAgent shared by the worker
         """
-        self.search_service = search_service
-        self.azure_openai_chat_deployment = azure_openai_chat_deployment
-        self.azure_openai_endpoint = azure_openai_endpoint
-        self.azure_openai_api_version = azure_openai_api_version
-        self.azure_storage_connection_string = azure_storage_connection_string
-        self.azure_storage_output_container_name = azure_storage_output_container_name
+        self.note_agent = NoteAgent(
+            search_service=search_service,
+            llm=llm,
+            topic_graph_agent=topic_graph_agent,
+        )
 
     async def process(self, payload: NoteGenerationData) -> None:
         """Generate note content using AI and populate the note.
@@ -51,34 +43,12 @@ class NoteProcessor(BaseProcessor[NoteGenerationData]):
             NotFoundError: If note or project not found
         """
         # Generate note using AI
-        llm = create_llm_non_streaming(
-            self.azure_openai_chat_deployment,
-            self.azure_openai_endpoint,
-            self.azure_openai_api_version,
-        )
-
-        blob_service_client = BlobServiceClient.from_connection_string(
-            self.azure_storage_connection_string
-        )
-
-        topic_graph_agent = TopicGraphAgent(
-            search_service=self.search_service,
-            llm=llm,
-            blob_service_client=blob_service_client,
-            output_container=self.azure_storage_output_container_name,
-        )
-
-        note_agent = NoteAgent(
-            search_service=self.search_service,
-            llm=llm,
-            topic_graph_agent=topic_graph_agent,
-        )
-
-        await note_agent.generate_and_save(
+        await self.note_agent.generate_and_save(
             project_id=payload["project_id"],
             topic=payload.get("topic"),
             custom_instructions=payload.get("custom_instructions"),
             note_id=payload["note_id"],
+            on_stage=self._stage_callback(payload),
         )
 
         console.log(f"Populated note {payload['note_id']}")
@@ -1,19 +1,52 @@
 """Processor registry for mapping task types to processors."""
 
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from functools import cached_property
+
+from azure.identity import DefaultAzureCredential
+from azure.storage.blob import BlobServiceClient
+from chunking import ChunkingEngine
+from edu_ai.agents.topic_graph_agent import TopicGraphAgent
+from edu_core.services.document_contents import (
+    ContentsCache,
+    DocumentContentsService,
+)
 from edu_core.services.search import SearchService
 from edu_queue.schemas import TaskType
+from edu_queue.service import QueueService
+from langchain_openai import AzureChatOpenAI
+from memory_budget import MemoryBudget
+from metrics import PROCESSOR_CONSTRUCTION_SECONDS, observe_contents_download
+from rich.console import Console
 
 from processors.base import BaseProcessor
 from processors.chat_title import ChatTitleProcessor
 from processors.document import DocumentProcessor
 from processors.flashcard import FlashcardProcessor
+from processors.llm import create_llm_non_streaming
 from processors.mind_map import MindMapProcessor
 from processors.note import NoteProcessor
 from processors.quiz import QuizProcessor
+from processors.topic_graph import TopicGraphProcessor
+
+console = Console(force_terminal=True)
+
+# Size of each ranged GET when streaming blobs
+BLOB_CHUNK_SIZE = 4 * 1024 * 1024
 
 
 class ProcessorRegistry:
-    """Registry for task type to processor mapping."""
+    """Registry for task type to processor mapping.
+
+    Each processor is built on the first message of its task type and reused
+    for every later message. The credential, blob client, chat model and
+    topic graph agent are built once and shared by all processors; they are
+    safe to use from concurrent tasks. So is the async document contents
+    service, which must only be used from the worker's event loop.
+    """
 
     def __init__(
         self,
@@ -27,7 +60,21 @@ class ProcessorRegistry:
         azure_cu_endpoint: str,
         azure_cu_key: str,
         azure_cu_analyzer_id: str,
+        azure_cu_max_connections: int,
+        azure_cu_poll_timeout_seconds: int,
         azure_openai_embedding_deployment: str,
+        memory_budget: MemoryBudget,
+        document_spool_max_memory_bytes: int,
+        chunking_engine: ChunkingEngine,
+        embedding_batch_size: int,
+        pdf_shard_min_pages: int,
+        pdf_shard_pages: int,
+        pdf_shard_concurrency: int,
+        pdf_shard_max_retries: int,
+        cpu_executor: Executor,
+        contents_download_concurrency: int = 8,
+        contents_cache: ContentsCache | None = None,
+        queue_service: QueueService | None = None,
     ):
         """Initialize the registry with required services.
 
@@ -42,7 +89,23 @@ class ProcessorRegistry:
             azure_cu_endpoint: Azure Content Understanding endpoint
             azure_cu_key: Azure Content Understanding subscription key
             azure_cu_analyzer_id: Azure Content Understanding analyzer ID
+            azure_cu_max_connections: Connection pool size for Content Understanding
+            azure_cu_poll_timeout_seconds: Maximum wait for a single analysis
             azure_openai_embedding_deployment: Azure OpenAI embedding deployment
+            memory_budget: Worker-wide budget for in-flight document bytes
+            document_spool_max_memory_bytes: In-memory spool size per download
+            chunking_engine: Token-aware splitter shared by document processors
+            embedding_batch_size: Segments embedded and committed per batch
+            pdf_shard_min_pages: Page count from which PDFs are analyzed in shards
+            pdf_shard_pages: Pages per PDF shard
+            pdf_shard_concurrency: Shards of one PDF analyzed at the same time
+            pdf_shard_max_retries: Retries of a failed shard
+            cpu_executor: Executor for CPU-bound document parsing
+            contents_download_concurrency: Document contents downloaded at
+                the same time when a task loads several
+            contents_cache: Optional local cache of downloaded contents
+            queue_service: Sends a topic graph precomputation task for each
+                indexed document; None disables precomputation
         """
         self.search_service = search_service
         self.azure_openai_chat_deployment = azure_openai_chat_deployment
@@ -54,10 +117,36 @@ class ProcessorRegistry:
         self.azure_cu_endpoint = azure_cu_endpoint
         self.azure_cu_key = azure_cu_key
         self.azure_cu_analyzer_id = azure_cu_analyzer_id
+        self.azure_cu_max_connections = azure_cu_max_connections
+        self.azure_cu_poll_timeout_seconds = azure_cu_poll_timeout_seconds
         self.azure_openai_embedding_deployment = azure_openai_embedding_deployment
+        self.memory_budget = memory_budget
+        self.document_spool_max_memory_bytes = document_spool_max_memory_bytes
+        self.chunking_engine = chunking_engine
+        self.embedding_batch_size = embedding_batch_size
+        self.pdf_shard_min_pages = pdf_shard_min_pages
+        self.pdf_shard_pages = pdf_shard_pages
+        self.pdf_shard_concurrency = pdf_shard_concurrency
+        self.pdf_shard_max_retries = pdf_shard_max_retries
+        self.cpu_executor = cpu_executor
+        self.contents_download_concurrency = contents_download_concurrency
+        self.contents_cache = contents_cache
+        self.queue_service = queue_service
+
+        self._factories: dict[TaskType, Callable[[], BaseProcessor]] = {
+            TaskType.CHAT_TITLE_GENERATION: self._create_chat_title_processor,
+            TaskType.FLASHCARD_GENERATION: self._create_flashcard_processor,
+            TaskType.QUIZ_GENERATION: self._create_quiz_processor,
+            TaskType.NOTE_GENERATION: self._create_note_processor,
+            TaskType.MIND_MAP_GENERATION: self._create_mind_map_processor,
+            TaskType.DOCUMENT_PROCESSING: self._create_document_processor,
+            TaskType.TOPIC_GRAPH_GENERATION: self._create_topic_graph_processor,
+        }
+        self._processors: dict[TaskType, BaseProcessor] = {}
+        self._lock = threading.Lock()
 
     def get_processor(self, task_type: TaskType) -> BaseProcessor:
-        """Get processor for a task type.
+        """Get processor for a task type, building it on first use.
 
         Args:
             task_type: The task type
@@ -68,59 +157,122 @@ class ProcessorRegistry:
         Raises:
             ValueError: If task type is unknown
         """
-        processors = {
-            TaskType.CHAT_TITLE_GENERATION: ChatTitleProcessor(
-                self.azure_openai_chat_deployment,
-                self.azure_openai_endpoint,
-                self.azure_openai_api_version,
-            ),
-            TaskType.FLASHCARD_GENERATION: FlashcardProcessor(
-                self.search_service,
-                self.azure_openai_chat_deployment,
-                self.azure_openai_endpoint,
-                self.azure_openai_api_version,
-                self.azure_storage_connection_string,
-                self.azure_storage_output_container_name,
-            ),
-            TaskType.QUIZ_GENERATION: QuizProcessor(
-                self.search_service,
-                self.azure_openai_chat_deployment,
-                self.azure_openai_endpoint,
-                self.azure_openai_api_version,
-                self.azure_storage_connection_string,
-                self.azure_storage_output_container_name,
-            ),
-            TaskType.NOTE_GENERATION: NoteProcessor(
-                self.search_service,
-                self.azure_openai_chat_deployment,
-                self.azure_openai_endpoint,
-                self.azure_openai_api_version,
-                self.azure_storage_connection_string,
-                self.azure_storage_output_container_name,
-            ),
-            TaskType.MIND_MAP_GENERATION: MindMapProcessor(
-                self.search_service,
-                self.azure_openai_chat_deployment,
-                self.azure_openai_endpoint,
-                self.azure_openai_api_version,
-                self.azure_storage_connection_string,
-                self.azure_storage_output_container_name,
-            ),
-            TaskType.DOCUMENT_PROCESSING: DocumentProcessor(
-                azure_storage_connection_string=self.azure_storage_connection_string,
-                azure_storage_input_container_name=self.azure_storage_input_container_name,
-                azure_storage_output_container_name=self.azure_storage_output_container_name,
-                azure_cu_endpoint=self.azure_cu_endpoint,
-                azure_cu_key=self.azure_cu_key,
-                azure_cu_analyzer_id=self.azure_cu_analyzer_id,
-                azure_openai_embedding_deployment=self.azure_openai_embedding_deployment,
-                azure_openai_endpoint=self.azure_openai_endpoint,
-                azure_openai_api_version=self.azure_openai_api_version,
-            ),
-        }
+        processor = self._processors.get(task_type)
+        if processor is not None:
+            return processor
 
-        processor = processors.get(task_type)
-        if not processor:
+        factory = self._factories.get(task_type)
+        if not factory:
             raise ValueError(f"Unknown task type: {task_type}")
 
+        with self._lock:
+            processor = self._processors.get(task_type)
+            if processor is None:
+                start = time.perf_counter()
+                processor = factory()
+                elapsed = time.perf_counter() - start
+                PROCESSOR_CONSTRUCTION_SECONDS.labels(
+                    task_type=task_type.value
+                ).observe(elapsed)
+                console.log(f"Created processor for {task_type} in {elapsed:.3f}s")
+                self._processors[task_type] = processor
         return processor
+
+    async def aclose(self) -> None:
+        """Close every processor built so far and the shared clients."""
+        with self._lock:
+            processors = list(self._processors.values())
+            self._processors.clear()
+        for processor in processors:
+            await processor.aclose()
+        if "blob_service_client" in self.__dict__:
+            self.blob_service_client.close()
+        if "contents_service" in self.__dict__:
+            await self.contents_service.aclose()
+
+    # Shared clients; only created while holding the lock in get_processor
+
+    @cached_property
+    def credential(self) -> DefaultAzureCredential:
+        return DefaultAzureCredential()
+
+    @cached_property
+    def blob_service_client(self) -> BlobServiceClient:
+        return BlobServiceClient.from_connection_string(
+            self.azure_storage_connection_string,
+            max_single_get_size=BLOB_CHUNK_SIZE,
+            max_chunk_get_size=BLOB_CHUNK_SIZE,
+        )
+
+    @cached_property
+    def contents_service(self) -> DocumentContentsService:
+        return DocumentContentsService(
+            self.azure_storage_connection_string,
+            self.azure_storage_output_container_name,
+            max_concurrency=self.contents_download_concurrency,
+            on_download=observe_contents_download,
+            cache=self.contents_cache,
+        )
+
+    @cached_property
+    def llm(self) -> AzureChatOpenAI:
+        return create_llm_non_streaming(
+            self.azure_openai_chat_deployment,
+            self.azure_openai_endpoint,
+            self.azure_openai_api_version,
+            credential=self.credential,
+        )
+
+    @cached_property
+    def topic_graph_agent(self) -> TopicGraphAgent:
+        return TopicGraphAgent(
+            search_service=self.search_service,
+            llm=self.llm,
+            contents_service=self.contents_service,
+        )
+
+    def _create_chat_title_processor(self) -> ChatTitleProcessor:
+        return ChatTitleProcessor(self.llm)
+
+    def _create_flashcard_processor(self) -> FlashcardProcessor:
+        return FlashcardProcessor(self.search_service, self.llm, self.topic_graph_agent)
+
+    def _create_quiz_processor(self) -> QuizProcessor:
+        return QuizProcessor(self.search_service, self.llm, self.topic_graph_agent)
+
+    def _create_note_processor(self) -> NoteProcessor:
+        return NoteProcessor(self.search_service, self.llm, self.topic_graph_agent)
+
+    def _create_mind_map_processor(self) -> MindMapProcessor:
+        return MindMapProcessor(self.search_service, self.llm, self.topic_graph_agent)
+
+    def _create_topic_graph_processor(self) -> TopicGraphProcessor:
+        return TopicGraphProcessor(self.topic_graph_agent)
+
+    def _create_document_processor(self) -> DocumentProcessor:
+        return DocumentProcessor(
+            blob_service_client=self.blob_service_client,
+            azure_storage_input_container_name=self.azure_storage_input_container_name,
+            azure_storage_output_container_name=self.azure_storage_output_container_name,
+            azure_cu_endpoint=self.azure_cu_endpoint,
+            azure_cu_key=self.azure_cu_key,
+            azure_cu_analyzer_id=self.azure_cu_analyzer_id,
+            azure_cu_max_connections=self.azure_cu_max_connections,
+            azure_cu_poll_timeout_seconds=self.azure_cu_poll_timeout_seconds,
+            azure_openai_embedding_deployment=self.azure_openai_embedding_deployment,
+            azure_openai_endpoint=self.azure_openai_endpoint,
+            azure_openai_api_version=self.azure_openai_api_version,
+            credential=self.credential,
+            llm=self.llm,
+            memory_budget=self.memory_budget,
+            spool_max_memory_bytes=self.document_spool_max_memory_bytes,
+            chunking_engine=self.chunking_engine,
+            embedding_batch_size=self.embedding_batch_size,
+            pdf_shard_min_pages=self.pdf_shard_min_pages,
+            pdf_shard_pages=self.pdf_shard_pages,
+            pdf_shard_concurrency=self.pdf_shard_concurrency,
+            pdf_shard_max_retries=self.pdf_shard_max_retries,
+            cpu_executor=self.cpu_executor,
+            contents_service=self.contents_service,
+            queue_service=self.queue_service,
+        )
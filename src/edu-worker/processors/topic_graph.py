@@ -0,0 +1,65 @@
+"""Processor for precomputing project topic graphs."""
+
+from edu_ai.agents.topic_graph_agent import TopicGraphAgent
+from edu_core.schemas.documents import DocumentStatus
+from edu_db.models import Document
+from edu_queue.schemas import TopicGraphGenerationData
+from rich.console import Console
+
+from processors.base import BaseProcessor
+
+console = Console(force_terminal=True)
+
+# Document states that end in indexing, i.e. the document set is still changing
+PENDING_STATUSES = (
+    DocumentStatus.UPLOADED.value,
+    DocumentStatus.PROCESSING.value,
+    DocumentStatus.PROCESSED.value,
+    DocumentStatus.PARTIALLY_INDEXED.value,
+)
+
+
+class TopicGraphProcessor(BaseProcessor[TopicGraphGenerationData]):
+    """Fills the topic graph cache once a project's documents are indexed.
+
+    Generations without a topic or custom instructions then reuse the cached
+    graph instead of sending every document to the model again.
+    """
+
+    def __init__(self, topic_graph_agent: TopicGraphAgent):
+        """Initialize the processor.
+
+        Args:
+            topic_graph_agent: TopicGraphAgent shared by the worker
+        """
+        self.topic_graph_agent = topic_graph_agent
+
+    async def process(self, payload: TopicGraphGenerationData) -> None:
+        """Generate and cache the project's topic graph.
+
+        Skipped while other documents of the project are still being
+        processed; the task sent when the last of them is indexed builds the
+        graph for the final document set instead.
+
+        Args:
+            payload: Topic graph generation data
+        """
+        project_id = payload["project_id"]
+        with self._get_db_session() as db:
+            pending = (
+                db.query(Document.id)
+                .filter(
+                    Document.project_id == project_id,
+                    Document.status.in_(PENDING_STATUSES),
+                )
+                .count()
+            )
+        if pending:
+            console.log(
+                f"Skipping topic graph for project {project_id}: "
+                f"{pending} document(s) still processing"
+            )
+            return
+
+        await self.topic_graph_agent.generate_topic_graph(project_id=project_id)
+        console.log(f"Cached topic graph for project {project_id}")
@@ -0,0 +1,283 @@
+"""Weighted scheduling of queue messages across lanes."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from edu_queue.backends import MessageQueue, QueueMessage
+from edu_queue.lanes import QueueLane
+from lease import MessageLease
+from metrics import LANE_MESSAGES_BUFFERED, LANE_MESSAGES_RUNNING, LANE_WAIT_SECONDS
+from rich.console import Console
+
+console = Console(force_terminal=True)
+
+# Azure Storage Queues return at most 32 messages per receive call; other
+# backends use the same batch size
+MAX_MESSAGES_PER_RECEIVE = 32
+
+
+class Lane:
+    """One lane's queue, scheduling weight, concurrency cap and local buffer."""
+
+    def __init__(
+        self,
+        name: QueueLane,
+        queue: MessageQueue,
+        weight: int,
+        max_concurrency: int,
+        prefetch_count: int,
+    ):
+        """Initialize the lane.
+
+        Args:
+            name: The lane
+            queue: Queue backing the lane
+            weight: Share of free slots given to the lane when several lanes
+                have messages waiting
+            max_concurrency: Maximum messages of this lane processed at once
+            prefetch_count: Messages received ahead of a free slot
+        """
+        self.name = name
+        self.queue = queue
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        self.prefetch_count = prefetch_count
+        self.buffer: deque[tuple[MessageLease, float]] = deque()
+        self.running = 0
+        # Smooth weighted round-robin state
+        self.current_weight = 0
+        # Messages held by this lane, whether running or buffered
+        self.held = asyncio.Semaphore(max_concurrency + prefetch_count)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the lane has a buffered message and room to run it."""
+        return bool(self.buffer) and self.running < self.max_concurrency
+
+
+class LaneScheduler:
+    """Runs messages from several lanes under one concurrency limit.
+
+    Each lane has a prefetcher that keeps its buffer topped up. Whenever a slot
+    is free, the next message comes from the ready lane picked by smooth
+    weighted round-robin. A lane never runs more than its own cap, so a burst
+    in one lane leaves the remaining slots to the others.
+
+    ``stop`` drains the scheduler: no more messages are received, buffered
+    ones are released to other workers, and running ones get
+    ``drain_timeout_seconds`` to finish before they are cancelled and
+    released as well.
+    """
+
+    def __init__(
+        self,
+        lanes: list[Lane],
+        handle: Callable[[MessageLease], Awaitable[None]],
+        max_concurrency: int,
+        visibility_timeout: int,
+        lease_renew_interval_seconds: float,
+        poll_interval_seconds: float,
+        drain_timeout_seconds: float = 60.0,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            lanes: Lanes to consume
+            handle: Coroutine processing one leased message
+            max_concurrency: Maximum number of messages processed at once
+            visibility_timeout: Seconds a received message is hidden from others
+            lease_renew_interval_seconds: Seconds between visibility renewals
+            poll_interval_seconds: Longest wait before polling an empty lane
+                again; backends with notifications wake up sooner
+            drain_timeout_seconds: Seconds running messages may take to
+                finish after ``stop``
+        """
+        self.lanes = lanes
+        self.handle = handle
+        self.visibility_timeout = visibility_timeout
+        self.lease_renew_interval_seconds = lease_renew_interval_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.drain_timeout_seconds = drain_timeout_seconds
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._changed = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    @property
+    def stopping(self) -> bool:
+        """Whether ``stop`` was called."""
+        return self._stopping.is_set()
+
+    def stop(self) -> None:
+        """Stop receiving messages and make ``run`` drain and return."""
+        self._stopping.set()
+        self._changed.set()
+
+    async def run(self) -> None:
+        """Receive and process messages until ``stop`` is called, then drain."""
+        prefetchers = [asyncio.create_task(self._prefetch(lane)) for lane in self.lanes]
+        try:
+            while await self._until_stopped(self._slots.acquire()):
+                lane = await self._next_lane()
+                if lane is None:
+                    break
+                lease, buffered_at = lane.buffer.popleft()
+                lane.running += 1
+                self._observe(lane, lease.message, buffered_at)
+
+                task = asyncio.create_task(self._run(lane, lease))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            if not self.stopping:
+                # Not a drain, e.g. the worker crashed; abandon everything
+                for prefetcher in prefetchers:
+                    prefetcher.cancel()
+
+        # Prefetchers finish a receive in progress, so nothing is dropped
+        await asyncio.gather(*prefetchers, return_exceptions=True)
+        await self._drain()
+
+    async def _drain(self) -> None:
+        """Release buffered messages and wait for running ones to finish."""
+        buffered = [lease for lane in self.lanes for lease, _ in lane.buffer]
+        for lane in self.lanes:
+            lane.buffer.clear()
+            LANE_MESSAGES_BUFFERED.labels(lane=lane.name.value).set(0)
+        await asyncio.gather(*(lease.release() for lease in buffered))
+        if not self._tasks:
+            return
+
+        console.print(
+            f"[yellow]Draining: waiting up to {self.drain_timeout_seconds:g}s "
+            f"for {len(self._tasks)} running message(s)[/yellow]"
+        )
+        _, pending = await asyncio.wait(
+            set(self._tasks), timeout=self.drain_timeout_seconds
+        )
+        if pending:
+            console.print(
+                f"[yellow]Cancelling {len(pending)} message(s) still running at "
+                "the drain deadline[/yellow]"
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _until_stopped(self, awaitable: Awaitable) -> bool:
+        """Await ``awaitable`` unless ``stop`` is called first.
+
+        Returns:
+            Whether the awaitable finished; it is cancelled otherwise
+        """
+        if self.stopping:
+            return False
+        task = asyncio.ensure_future(awaitable)
+        stopping = asyncio.create_task(self._stopping.wait())
+        try:
+            await asyncio.wait({task, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopping.cancel()
+        if task.done():
+            task.result()
+            return True
+        task.cancel()
+        return False
+
+    async def _next_lane(self) -> Lane | None:
+        """Wait for a ready lane and pick one by smooth weighted round-robin.
+
+        Returns:
+            The lane, or None once the scheduler is stopping
+        """
+        while True:
+            if self.stopping:
+                return None
+            ready = [lane for lane in self.lanes if lane.ready]
+            if ready:
+                break
+            self._changed.clear()
+            await self._changed.wait()
+
+        for lane in ready:
+            lane.current_weight += lane.weight
+        chosen = max(ready, key=lambda lane: lane.current_weight)
+        chosen.current_weight -= sum(lane.weight for lane in ready)
+        return chosen
+
+    async def _run(self, lane: Lane, lease: MessageLease) -> None:
+        try:
+            await self.handle(lease)
+        except asyncio.CancelledError:
+            # Cut short by the drain deadline; let another worker take it now
+            await lease.release()
+            raise
+        finally:
+            await lease.stop()
+            lane.running -= 1
+            lane.held.release()
+            self._slots.release()
+            LANE_MESSAGES_RUNNING.labels(lane=lane.name.value).set(lane.running)
+            self._changed.set()
+
+    async def _prefetch(self, lane: Lane) -> None:
+        def receive(max_messages: int) -> list[QueueMessage]:
+            return lane.queue.receive_messages(
+                max_messages=max_messages,
+                visibility_timeout=self.visibility_timeout,
+            )
+
+        while not self.stopping:
+            # Wait for one free slot, then claim every other free slot
+            if not await self._until_stopped(lane.held.acquire()):
+                return
+            wanted = 1
+            while wanted < MAX_MESSAGES_PER_RECEIVE and not lane.held.locked():
+                await lane.held.acquire()
+                wanted += 1
+
+            try:
+                messages = await asyncio.to_thread(receive, wanted)
+            except Exception as e:
+                console.print(
+                    f"[bold red]Error receiving from lane {lane.name.value}: "
+                    f"{e}[/bold red]"
+                )
+                messages = []
+
+            for msg in messages:
+                lease = MessageLease(
+                    lane.queue,
+                    msg,
+                    self.visibility_timeout,
+                    self.lease_renew_interval_seconds,
+                )
+                lease.start()
+                lane.buffer.append((lease, time.monotonic()))
+            for _ in range(wanted - len(messages)):
+                lane.held.release()
+
+            LANE_MESSAGES_BUFFERED.labels(lane=lane.name.value).set(len(lane.buffer))
+            if messages:
+                self._changed.set()
+            else:
+                await self._until_stopped(
+                    lane.queue.wait_for_messages(self.poll_interval_seconds)
+                )
+
+    @staticmethod
+    def _observe(lane: Lane, msg: QueueMessage, buffered_at: float) -> None:
+        """Record how long a message waited before it started."""
+        if msg.inserted_on is not None:
+            inserted_on = msg.inserted_on
+            if inserted_on.tzinfo is None:
+                inserted_on = inserted_on.replace(tzinfo=UTC)
+            wait = (datetime.now(UTC) - inserted_on).total_seconds()
+        else:
+            wait = time.monotonic() - buffered_at
+        LANE_WAIT_SECONDS.labels(lane=lane.name.value).observe(max(wait, 0.0))
+        LANE_MESSAGES_BUFFERED.labels(lane=lane.name.value).set(len(lane.buffer))
+        LANE_MESSAGES_RUNNING.labels(lane=lane.name.value).set(lane.running)
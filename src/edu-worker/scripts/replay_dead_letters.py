@@ -0,0 +1,85 @@
+"""List dead-lettered worker tasks or put them back on their lane queues.
+
+Run from src/edu-worker:
+    python -m scripts.replay_dead_letters --list
+    python -m scripts.replay_dead_letters --message-id <id> [--message-id <id>]
+    python -m scripts.replay_dead_letters --all
+"""
+
+import argparse
+
+from config import get_settings
+from dead_letter import DeadLetterQueue, decode_message
+from edu_core.services.generation_jobs import GenerationJobService
+from edu_db.session import init_db
+from edu_queue.backends import create_queue_backend
+from edu_queue.lanes import QueueLane, get_lane_queue_name
+from rich.console import Console
+
+console = Console(force_terminal=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--list", action="store_true", help="show dead letters")
+    group.add_argument(
+        "--message-id",
+        action="append",
+        help="original message ID to replay (repeatable)",
+    )
+    group.add_argument("--all", action="store_true", help="replay every dead letter")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    backend = create_queue_backend(
+        settings.queue_backend,
+        azure_storage_connection_string=settings.azure_storage_connection_string,
+        database_url=settings.database_url,
+    )
+    dead_letters = DeadLetterQueue(
+        backend.get_queue(settings.azure_storage_dead_letter_queue_name)
+    )
+
+    if args.list:
+        for body in dead_letters.peek():
+            task = decode_message(body["content"])
+            console.print(
+                f"[bold]{body['message_id']}[/bold] {task.get('type')} "
+                f"after {body['dequeue_count']} attempts at "
+                f"{body['dead_lettered_at']}\n"
+                f"  {body['error_type']}: {body['reason']}"
+            )
+        return
+
+    targets = {
+        lane: backend.get_queue(
+            get_lane_queue_name(settings.azure_storage_queue_name, lane)
+        )
+        for lane in QueueLane
+    }
+    # A dead-lettered task's job failed; the worker would skip the replayed
+    # task as stale unless the job is queued again first
+    init_db(settings.database_url)
+    jobs = GenerationJobService()
+
+    def requeue_job(task: dict) -> None:
+        data = task.get("data")
+        job_id = data.get("job_id") if isinstance(data, dict) else None
+        if job_id and not jobs.requeue(job_id):
+            console.print(f"[yellow]Job {job_id} was not requeued[/yellow]")
+
+    message_ids = None if args.all else set(args.message_id)
+    replayed = dead_letters.replay(
+        targets=targets, message_ids=message_ids, on_replay=requeue_job
+    )
+    for message_id in replayed:
+        console.log(f"Replayed message {message_id}")
+
+    if message_ids is not None and (missing := message_ids - set(replayed)):
+        console.print(f"[yellow]Not found: {', '.join(sorted(missing))}[/yellow]")
+    console.print(f"[bold green]Replayed {len(replayed)} message(s)[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
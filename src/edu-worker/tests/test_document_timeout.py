@@ -0,0 +1,158 @@
+"""Tests for documents whose processing is cancelled.
+
+Run from src/edu-worker:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+import main
+from dead_letter import encode_message
+from edu_core.schemas.documents import DocumentStatus
+from edu_db.models import Document
+from edu_queue.backends import QueueMessage
+from edu_queue.schemas import TaskType
+from processors import base, document
+from processors.document import DocumentProcessor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+MAX_ATTEMPTS = 3
+
+
+class FakeLease:
+    """Lease that records deletion instead of talking to a queue."""
+
+    def __init__(self, message: QueueMessage):
+        self.message = message
+        self.lost = False
+        self.deleted = False
+
+    async def delete(self) -> None:
+        self.deleted = True
+
+    async def stop(self) -> None:
+        return None
+
+
+class FakeDeadLetterQueue:
+    """Records dead letters instead of sending them."""
+
+    def __init__(self):
+        self.reasons = []
+
+    def send(self, message: QueueMessage, reason: str, error_type: str) -> None:
+        self.reasons.append(reason)
+
+
+class FakeRegistry:
+    def __init__(self, processor):
+        self.processor = processor
+
+    def get_processor(self, task_type: TaskType):
+        return self.processor
+
+
+async def hang(**kwargs):
+    """Stand in for a Content Understanding analysis that never finishes."""
+    await asyncio.Event().wait()
+
+
+class DocumentTimeoutTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # One shared connection, as the document updates run in worker threads
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Document.__table__.create(engine)
+        self.session_factory = sessionmaker(bind=engine)
+        with self.session_factory() as db:
+            db.add(
+                Document(
+                    id="document",
+                    owner_id="user",
+                    project_id="project",
+                    file_name="notes.pdf",
+                    file_type="pdf",
+                    file_size=1,
+                    status=DocumentStatus.UPLOADED.value,
+                )
+            )
+            db.commit()
+
+        self.events = []
+        for patcher in (
+            patch.object(base, "get_session_factory", lambda: self.session_factory),
+            patch.object(
+                document, "publish_event", lambda event, db: self.events.append(event)
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.blob_service_client = MagicMock()
+        processor.input_container = "input"
+        processor._get_analysis = hang
+        self.registry = FakeRegistry(processor)
+        self.dead_letters = FakeDeadLetterQueue()
+
+    def _lease(self, dequeue_count: int) -> FakeLease:
+        content = encode_message(
+            {
+                "type": TaskType.DOCUMENT_PROCESSING.value,
+                "data": {"project_id": "project", "document_id": "document"},
+            }
+        )
+        return FakeLease(
+            QueueMessage(id="message", content=content, dequeue_count=dequeue_count)
+        )
+
+    async def _handle(self, lease: FakeLease) -> None:
+        await main.handle_message(
+            lease,
+            self.registry,
+            self.dead_letters,
+            payload_store=MagicMock(),
+            max_attempts=MAX_ATTEMPTS,
+            task_timeouts={TaskType.DOCUMENT_PROCESSING.value: 0.05},
+            default_task_timeout=60,
+        )
+
+    def _status(self) -> str:
+        with self.session_factory() as db:
+            return db.get(Document, "document").status
+
+    async def test_timeout_on_the_last_attempt_fails_the_document(self):
+        lease = self._lease(dequeue_count=MAX_ATTEMPTS)
+        await self._handle(lease)
+
+        self.assertEqual(self._status(), DocumentStatus.FAILED.value)
+        self.assertTrue(lease.deleted)
+        self.assertEqual(len(self.dead_letters.reasons), 1)
+        self.assertEqual(
+            self.events[-1].status,
+            DocumentStatus.FAILED.value,
+        )
+        # Marked once, though both the timeout and the dead letter mark it
+        failures = [e for e in self.events if e.status == DocumentStatus.FAILED.value]
+        self.assertEqual(len(failures), 1)
+
+    async def test_dead_lettering_an_unfinished_delivery_fails_the_document(self):
+        with self.session_factory() as db:
+            db.get(Document, "document").status = DocumentStatus.PROCESSING.value
+            db.commit()
+
+        await self._handle(self._lease(dequeue_count=MAX_ATTEMPTS + 1))
+
+        self.assertEqual(self._status(), DocumentStatus.FAILED.value)
+        self.assertEqual(len(self.dead_letters.reasons), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
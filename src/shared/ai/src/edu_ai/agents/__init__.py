@@ -2,8 +2,10 @@ from .flashcard_agent import FlashcardAgent
 from .mind_map_agent import MindMapAgent
 from .note_agent import NoteAgent
 from .quiz_agent import QuizAgent
+from .summary_agent import DocumentSummaryAgent
 
 __all__ = [
+    "DocumentSummaryAgent",
     "FlashcardAgent",
     "MindMapAgent",
     "NoteAgent",
@@ -3,12 +3,13 @@ from typing import Any
 from uuid import uuid4
 
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.generation_jobs import GenerationStage
 from edu_db.models import Flashcard, FlashcardGroup, Project
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
 
 from edu_ai.agents.topic_graph_agent import TopicGraphAgent
-from edu_ai.agents.utils import generate, get_db_session
+from edu_ai.agents.utils import StageCallback, generate, get_db_session, report_stage
 
 
 class FlashcardGenerationResult(BaseModel):
@@ -53,6 +54,7 @@ class FlashcardAgent:
         group_id: str | None = None,
         count: int | None = None,
         difficulty: str | None = None,
+        on_stage: StageCallback | None = None,
         **kwargs: Any,
     ) -> FlashcardGroup:
         """Generate flashcards and save to the database.
@@ -64,6 +66,7 @@ class FlashcardAgent:
             group_id: The flashcard group ID to populate (required)
             count: Optional count of flashcards to generate
             difficulty: Optional difficulty level
+            on_stage: Optional callback receiving each stage as it starts
 
         Returns:
             Updated FlashcardGroup model
@@ -75,6 +78,7 @@ class FlashcardAgent:
         if not group_id:
             raise ValueError("group_id is required for flashcard generation")
 
+        # Short read: no session is held during the LLM calls below
         with get_db_session() as db:
             # Find existing flashcard group
             project = db.query(Project).filter(Project.id == project_id).first()
@@ -94,39 +98,55 @@ class FlashcardAgent:
             if not group:
                 raise NotFoundError(f"Flashcard group {group_id} not found")
 
-            generation_topic = topic
-            if self.topic_graph_agent:
-                topic_graph = await self.topic_graph_agent.generate_topic_graph(
-                    project_id=project_id,
-                    topic=topic,
-                    custom_instructions=custom_instructions,
-                )
-                if topic_graph.root_topics:
-                    topics = []
-                    for root_topic in topic_graph.root_topics:
-                        topics.append(root_topic.topic)
-                        for subtopic in root_topic.subtopics:
-                            topics.append(subtopic.topic)
-                    generation_topic = ", ".join(topics)
-
-            # Generate flashcards using AI
-            kwargs = {}
-            if count is not None:
-                kwargs["count"] = count
-            if difficulty is not None:
-                kwargs["difficulty"] = difficulty
-
-            result = await generate(
-                llm=self.llm,
-                search_service=self.search_service,
-                output_model=self.output_model,
-                prompt_template=self.prompt_template,
+        await report_stage(on_stage, GenerationStage.SEARCHING)
+        generation_topic = topic
+        if self.topic_graph_agent:
+            topic_graph = await self.topic_graph_agent.generate_topic_graph(
                 project_id=project_id,
-                topic=generation_topic or "",
-                language_code=language_code,
+                topic=topic,
                 custom_instructions=custom_instructions,
-                **kwargs,
             )
+            if topic_graph.root_topics:
+                topics = []
+                for root_topic in topic_graph.root_topics:
+                    topics.append(root_topic.topic)
+                    for subtopic in root_topic.subtopics:
+                        topics.append(subtopic.topic)
+                generation_topic = ", ".join(topics)
+
+        await report_stage(on_stage, GenerationStage.GENERATING)
+        # Generate flashcards using AI
+        kwargs = {}
+        if count is not None:
+            kwargs["count"] = count
+        if difficulty is not None:
+            kwargs["difficulty"] = difficulty
+
+        result = await generate(
+            llm=self.llm,
+            search_service=self.search_service,
+            output_model=self.output_model,
+            prompt_template=self.prompt_template,
+            project_id=project_id,
+            topic=generation_topic or "",
+            language_code=language_code,
+            custom_instructions=custom_instructions,
+            **kwargs,
+        )
+
+        await report_stage(on_stage, GenerationStage.SAVING)
+        # Short write with the generated content
+        with get_db_session() as db:
+            group = (
+                db.query(FlashcardGroup)
+                .filter(
+                    FlashcardGroup.id == group_id,
+                    FlashcardGroup.project_id == project_id,
+                )
+                .first()
+            )
+            if not group:
+                raise NotFoundError(f"Flashcard group {group_id} not found")
 
             # Update group with generated name and description
             group.name = result.name
@@ -3,12 +3,13 @@ from typing import Any
 from uuid import uuid4
 
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.generation_jobs import GenerationStage
 from edu_db.models import MindMap, Project
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
 
 from edu_ai.agents.topic_graph_agent import TopicGraphAgent
-from edu_ai.agents.utils import generate, get_db_session
+from edu_ai.agents.utils import StageCallback, generate, get_db_session, report_stage
 
 
 class MindMapNodeData(BaseModel):
@@ -65,12 +66,16 @@ class MindMapAgent:
         custom_instructions: str | None = None,
         mind_map_id: str | None = None,
         user_id: str | None = None,
+        on_stage: StageCallback | None = None,
+        create: bool = False,
         **kwargs: Any,
     ) -> MindMap:
         """Generate mind map content and save to the database.
 
         If mind_map_id is provided, updates existing mind map.
-        Otherwise, creates a new mind map (requires user_id).
+        Otherwise, creates a new mind map (requires user_id). A new mind map
+        is only written together with its content, so a failed generation
+        leaves no empty mind map behind.
 
         Args:
             project_id: The project ID
@@ -78,6 +83,9 @@ class MindMapAgent:
             custom_instructions: Optional custom instructions
             mind_map_id: Optional mind map ID to populate (if None, creates new)
             user_id: Required if creating new mind map
+            on_stage: Optional callback receiving each stage as it starts
+            create: Create the mind map under mind_map_id instead of updating
+                it; an earlier delivery of the task may have created it already
 
         Returns:
             Updated or created MindMap model
@@ -86,42 +94,16 @@ class MindMapAgent:
             NotFoundError: If mind_map_id is provided but mind map not found
             ValueError: If creating new mind map but user_id not provided
         """
-        with get_db_session() as db:
+        if not user_id:
             if mind_map_id:
-                # Update existing mind map
-                if not user_id:
-                    raise ValueError(
-                        "user_id is required when updating existing mind map"
-                    )
-
-                mind_map = (
-                    db.query(MindMap)
-                    .filter(
-                        MindMap.id == mind_map_id,
-                        MindMap.project_id == project_id,
-                        MindMap.user_id == user_id,
-                    )
-                    .first()
-                )
-                if not mind_map:
-                    raise NotFoundError(f"Mind map {mind_map_id} not found")
-            else:
-                # Create new mind map
-                if not user_id:
-                    raise ValueError("user_id is required when creating new mind map")
+                raise ValueError("user_id is required when updating existing mind map")
+            raise ValueError("user_id is required when creating new mind map")
 
-                mind_map = MindMap(
-                    id=str(uuid4()),
-                    user_id=user_id,
-                    project_id=project_id,
-                    title="Generating...",
-                    description="Mind map is being generated",
-                    map_data={"nodes": [], "edges": []},
-                    generated_at=datetime.now(),
-                    updated_at=datetime.now(),
-                )
-                db.add(mind_map)
-                db.flush()
+        # Short read: no session is held during the LLM calls below
+        with get_db_session() as db:
+            if mind_map_id and not create:
+                # Make sure the mind map to update exists
+                self._get_mind_map(db, mind_map_id, project_id, user_id)
 
             # Get project language code
             project = db.query(Project).filter(Project.id == project_id).first()
@@ -129,32 +111,52 @@ class MindMapAgent:
                 raise NotFoundError(f"Project {project_id} not found")
             language_code = project.language_code
 
-            generation_topic = topic
-            if self.topic_graph_agent:
-                topic_graph = await self.topic_graph_agent.generate_topic_graph(
-                    project_id=project_id,
-                    topic=topic,
-                    custom_instructions=custom_instructions,
-                )
-                if topic_graph.root_topics:
-                    topics = []
-                    for root_topic in topic_graph.root_topics:
-                        topics.append(root_topic.topic)
-                        for subtopic in root_topic.subtopics:
-                            topics.append(subtopic.topic)
-                    generation_topic = ", ".join(topics)
-
-            # Generate mind map using AI
-            result = await generate(
-                llm=self.llm,
-                search_service=self.search_service,
-                output_model=self.output_model,
-                prompt_template=self.prompt_template,
+        await report_stage(on_stage, GenerationStage.SEARCHING)
+        generation_topic = topic
+        if self.topic_graph_agent:
+            topic_graph = await self.topic_graph_agent.generate_topic_graph(
                 project_id=project_id,
-                topic=generation_topic or "",
-                language_code=language_code,
+                topic=topic,
                 custom_instructions=custom_instructions,
             )
+            if topic_graph.root_topics:
+                topics = []
+                for root_topic in topic_graph.root_topics:
+                    topics.append(root_topic.topic)
+                    for subtopic in root_topic.subtopics:
+                        topics.append(subtopic.topic)
+                generation_topic = ", ".join(topics)
+
+        await report_stage(on_stage, GenerationStage.GENERATING)
+        # Generate mind map using AI
+        result = await generate(
+            llm=self.llm,
+            search_service=self.search_service,
+            output_model=self.output_model,
+            prompt_template=self.prompt_template,
+            project_id=project_id,
+            topic=generation_topic or "",
+            language_code=language_code,
+            custom_instructions=custom_instructions,
+        )
+
+        await report_stage(on_stage, GenerationStage.SAVING)
+        # Short write with the generated content
+        with get_db_session() as db:
+            if mind_map_id and not create:
+                # Update existing mind map
+                mind_map = self._get_mind_map(db, mind_map_id, project_id, user_id)
+            elif mind_map_id and (existing := db.get(MindMap, mind_map_id)):
+                mind_map = existing
+            else:
+                # Create new mind map
+                mind_map = MindMap(
+                    id=mind_map_id or str(uuid4()),
+                    user_id=user_id,
+                    project_id=project_id,
+                    generated_at=datetime.now(),
+                )
+                db.add(mind_map)
 
             # Convert agent result to map_data format
             map_data = {
@@ -185,3 +187,32 @@ class MindMapAgent:
 
             db.flush()
             return mind_map
+
+    @staticmethod
+    def _get_mind_map(db, mind_map_id: str, project_id: str, user_id: str) -> MindMap:
+        """Get a mind map owned by the user in the project.
+
+        Args:
+            db: Database session
+            mind_map_id: The mind map ID
+            project_id: The project ID
+            user_id: The owner's user ID
+
+        Returns:
+            The MindMap model
+
+        Raises:
+            NotFoundError: If the mind map is not found
+        """
+        mind_map = (
+            db.query(MindMap)
+            .filter(
+                MindMap.id == mind_map_id,
+                MindMap.project_id == project_id,
+                MindMap.user_id == user_id,
+            )
+            .first()
+        )
+        if not mind_map:
+            raise NotFoundError(f"Mind map {mind_map_id} not found")
+        return mind_map
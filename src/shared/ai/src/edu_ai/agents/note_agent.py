@@ -2,12 +2,13 @@ from datetime import datetime
 from typing import Any
 
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.generation_jobs import GenerationStage
 from edu_db.models import Note, Project
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
 
 from edu_ai.agents.topic_graph_agent import TopicGraphAgent
-from edu_ai.agents.utils import generate, get_db_session
+from edu_ai.agents.utils import StageCallback, generate, get_db_session, report_stage
 
 
 class NoteGenerationResult(BaseModel):
@@ -38,6 +39,7 @@ class NoteAgent:
         topic: str | None = None,
         custom_instructions: str | None = None,
         note_id: str | None = None,
+        on_stage: StageCallback | None = None,
         **kwargs: Any,
     ) -> Note:
         """Generate note content and save to the database.
@@ -47,6 +49,7 @@ class NoteAgent:
             topic: Optional topic for generation
             custom_instructions: Optional custom instructions
             note_id: The note ID to populate (required)
+            on_stage: Optional callback receiving each stage as it starts
 
         Returns:
             Updated Note model
@@ -58,6 +61,7 @@ class NoteAgent:
         if not note_id:
             raise ValueError("note_id is required for note generation")
 
+        # Short read: no session is held during the LLM calls below
         with get_db_session() as db:
             # Find existing note
             note = (
@@ -77,32 +81,48 @@ class NoteAgent:
                 raise NotFoundError(f"Project {project_id} not found")
             language_code = project.language_code
 
-            generation_topic = topic
-            if self.topic_graph_agent:
-                topic_graph = await self.topic_graph_agent.generate_topic_graph(
-                    project_id=project_id,
-                    topic=topic,
-                    custom_instructions=custom_instructions,
-                )
-                if topic_graph.root_topics:
-                    topics = []
-                    for root_topic in topic_graph.root_topics:
-                        topics.append(root_topic.topic)
-                        for subtopic in root_topic.subtopics:
-                            topics.append(subtopic.topic)
-                    generation_topic = ", ".join(topics)
-
-            # Generate note using AI
-            result = await generate(
-                llm=self.llm,
-                search_service=self.search_service,
-                output_model=self.output_model,
-                prompt_template=self.prompt_template,
+        await report_stage(on_stage, GenerationStage.SEARCHING)
+        generation_topic = topic
+        if self.topic_graph_agent:
+            topic_graph = await self.topic_graph_agent.generate_topic_graph(
                 project_id=project_id,
-                topic=generation_topic or "",
-                language_code=language_code,
+                topic=topic,
                 custom_instructions=custom_instructions,
             )
+            if topic_graph.root_topics:
+                topics = []
+                for root_topic in topic_graph.root_topics:
+                    topics.append(root_topic.topic)
+                    for subtopic in root_topic.subtopics:
+                        topics.append(subtopic.topic)
+                generation_topic = ", ".join(topics)
+
+        await report_stage(on_stage, GenerationStage.GENERATING)
+        # Generate note using AI
+        result = await generate(
+            llm=self.llm,
+            search_service=self.search_service,
+            output_model=self.output_model,
+            prompt_template=self.prompt_template,
+            project_id=project_id,
+            topic=generation_topic or "",
+            language_code=language_code,
+            custom_instructions=custom_instructions,
+        )
+
+        await report_stage(on_stage, GenerationStage.SAVING)
+        # Short write with the generated content
+        with get_db_session() as db:
+            note = (
+                db.query(Note)
+                .filter(
+                    Note.id == note_id,
+                    Note.project_id == project_id,
+                )
+                .first()
+            )
+            if not note:
+                raise NotFoundError(f"Note {note_id} not found")
 
             # Update note with generated content
             note.title = result.title
@@ -0,0 +1,133 @@
+import asyncio
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_openai import AzureChatOpenAI
+from pydantic import BaseModel, Field
+
+from edu_ai.prompts.prompts_utils import render_prompt
+
+
+class OutlineTopic(BaseModel):
+    """Model for a topic in a document outline."""
+
+    topic: str = Field(..., description="The name of the topic.")
+    first_segment: int = Field(
+        ..., description="Number of the first segment covering the topic."
+    )
+    last_segment: int = Field(
+        ..., description="Number of the last segment covering the topic."
+    )
+    subtopics: list["OutlineTopic"] = Field(
+        default=[], description="A list of subtopics."
+    )
+
+
+class DocumentOutline(BaseModel):
+    """Model for the outline of one document."""
+
+    topics: list[OutlineTopic] = Field(
+        ..., description="The document's topics in order of appearance."
+    )
+
+    def render(self) -> str:
+        """Render the outline as an indented list, without segment ranges."""
+
+        def lines(topics: list[OutlineTopic], depth: int) -> list[str]:
+            rendered = []
+            for topic in topics:
+                rendered.append(f"{'  ' * depth}- {topic.topic}")
+                rendered.extend(lines(topic.subtopics, depth + 1))
+            return rendered
+
+        return "\n".join(lines(self.topics, 0))
+
+
+class DocumentOutlineAgent:
+    """Outlines documents at index time, so topic graphs need not read them.
+
+    Segments are sent in windows of at most ``max_input_chars``; the window
+    outlines are concatenated in document order.
+    """
+
+    output_model = DocumentOutline
+    prompt_template = "document_outline_prompt"
+
+    def __init__(
+        self,
+        llm: AzureChatOpenAI,
+        max_input_chars: int = 48_000,
+        max_concurrency: int = 4,
+    ):
+        self.llm = llm
+        self.max_input_chars = max_input_chars
+        self.max_concurrency = max_concurrency
+
+    async def outline(
+        self, segments: list[tuple[int, str]], language_code: str = "en"
+    ) -> DocumentOutline:
+        """Generate the outline of a document.
+
+        Args:
+            segments: ``(position, content)`` of the document's segments, in
+                order; positions are the segment numbers in the outline
+            language_code: Language of the topic names
+
+        Returns:
+            The outline
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def outline_window(window: list[tuple[int, str]]) -> DocumentOutline:
+            async with semaphore:
+                return await self._outline_window(window, language_code)
+
+        outlines = await asyncio.gather(
+            *(outline_window(window) for window in self._windows(segments))
+        )
+        return DocumentOutline(
+            topics=[topic for outline in outlines for topic in outline.topics]
+        )
+
+    def _windows(self, segments: list[tuple[int, str]]) -> list[list[tuple[int, str]]]:
+        """Split segments into consecutive windows of bounded size."""
+        windows: list[list[tuple[int, str]]] = []
+        window: list[tuple[int, str]] = []
+        size = 0
+        for position, content in segments:
+            if window and size + len(content) > self.max_input_chars:
+                windows.append(window)
+                window, size = [], 0
+            window.append((position, content[: self.max_input_chars]))
+            size += len(content)
+        if window:
+            windows.append(window)
+        return windows
+
+    async def _outline_window(
+        self, window: list[tuple[int, str]], language_code: str
+    ) -> DocumentOutline:
+        """Outline one window, clamping segment ranges to the window."""
+        parser = JsonOutputParser(pydantic_object=self.output_model)
+        prompt = render_prompt(
+            self.prompt_template,
+            document_content="\n\n".join(
+                f"[Segment {position}]\n{content}" for position, content in window
+            ),
+            format_instructions=parser.get_format_instructions(),
+            language_code=language_code or "en",
+        )
+        response = await self.llm.ainvoke(prompt)
+        outline = self.output_model(**parser.parse(response.content))
+
+        first, last = window[0][0], window[-1][0]
+
+        def clamp(topics: list[OutlineTopic]) -> None:
+            for topic in topics:
+                topic.first_segment = min(max(topic.first_segment, first), last)
+                topic.last_segment = min(
+                    max(topic.last_segment, topic.first_segment), last
+                )
+                clamp(topic.subtopics)
+
+        clamp(outline.topics)
+        return outline
@@ -3,12 +3,13 @@ from typing import Any
 from uuid import uuid4
 
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.generation_jobs import GenerationStage
 from edu_db.models import Project, Quiz, QuizQuestion
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
 
 from edu_ai.agents.topic_graph_agent import TopicGraphAgent
-from edu_ai.agents.utils import generate, get_db_session
+from edu_ai.agents.utils import StageCallback, generate, get_db_session, report_stage
 
 
 class QuizQuestionGenerationResult(BaseModel):
@@ -57,6 +58,7 @@ class QuizAgent:
         custom_instructions: str | None = None,
         quiz_id: str | None = None,
         count: int | None = None,
+        on_stage: StageCallback | None = None,
         **kwargs: Any,
     ) -> Quiz:
         """Generate quiz questions and save to the database.
@@ -67,6 +69,7 @@ class QuizAgent:
             custom_instructions: Optional custom instructions
             quiz_id: The quiz ID to populate (required)
             count: Optional count of questions to generate
+            on_stage: Optional callback receiving each stage as it starts
 
         Returns:
             Updated Quiz model
@@ -78,6 +81,7 @@ class QuizAgent:
         if not quiz_id:
             raise ValueError("quiz_id is required for quiz generation")
 
+        # Short read: no session is held during the LLM calls below
         with get_db_session() as db:
             # Find existing quiz
             quiz = (
@@ -97,37 +101,53 @@ class QuizAgent:
                 raise NotFoundError(f"Project {project_id} not found")
             language_code = project.language_code
 
-            generation_topic = topic
-            if self.topic_graph_agent:
-                topic_graph = await self.topic_graph_agent.generate_topic_graph(
-                    project_id=project_id,
-                    topic=topic,
-                    custom_instructions=custom_instructions,
-                )
-                if topic_graph.root_topics:
-                    topics = []
-                    for root_topic in topic_graph.root_topics:
-                        topics.append(root_topic.topic)
-                        for subtopic in root_topic.subtopics:
-                            topics.append(subtopic.topic)
-                    generation_topic = ", ".join(topics)
-
-            # Generate quiz using AI
-            kwargs = {}
-            if count is not None:
-                kwargs["count"] = count
-
-            result = await generate(
-                llm=self.llm,
-                search_service=self.search_service,
-                output_model=self.output_model,
-                prompt_template=self.prompt_template,
+        await report_stage(on_stage, GenerationStage.SEARCHING)
+        generation_topic = topic
+        if self.topic_graph_agent:
+            topic_graph = await self.topic_graph_agent.generate_topic_graph(
                 project_id=project_id,
-                topic=generation_topic or "",
-                language_code=language_code,
+                topic=topic,
                 custom_instructions=custom_instructions,
-                **kwargs,
             )
+            if topic_graph.root_topics:
+                topics = []
+                for root_topic in topic_graph.root_topics:
+                    topics.append(root_topic.topic)
+                    for subtopic in root_topic.subtopics:
+                        topics.append(subtopic.topic)
+                generation_topic = ", ".join(topics)
+
+        await report_stage(on_stage, GenerationStage.GENERATING)
+        # Generate quiz using AI
+        kwargs = {}
+        if count is not None:
+            kwargs["count"] = count
+
+        result = await generate(
+            llm=self.llm,
+            search_service=self.search_service,
+            output_model=self.output_model,
+            prompt_template=self.prompt_template,
+            project_id=project_id,
+            topic=generation_topic or "",
+            language_code=language_code,
+            custom_instructions=custom_instructions,
+            **kwargs,
+        )
+
+        await report_stage(on_stage, GenerationStage.SAVING)
+        # Short write with the generated content
+        with get_db_session() as db:
+            quiz = (
+                db.query(Quiz)
+                .filter(
+                    Quiz.id == quiz_id,
+                    Quiz.project_id == project_id,
+                )
+                .first()
+            )
+            if not quiz:
+                raise NotFoundError(f"Quiz {quiz_id} not found")
 
             # Update quiz with generated name and description
             quiz.name = result.name
@@ -0,0 +1,33 @@
+from langchain_openai import AzureChatOpenAI
+
+from edu_ai.prompts.prompts_utils import render_prompt
+
+
+class DocumentSummaryAgent:
+    """Summarizes documents whose text was extracted without Content Understanding."""
+
+    prompt_template = "document_summary_prompt"
+
+    def __init__(self, llm: AzureChatOpenAI, max_input_chars: int = 48_000):
+        self.llm = llm
+        self.max_input_chars = max_input_chars
+
+    async def summarize(self, content: str, language_code: str = "en") -> str:
+        """Generate a short summary of a document.
+
+        Only the beginning of very long documents is sent to the model.
+
+        Args:
+            content: The document markdown
+            language_code: Language of the summary
+
+        Returns:
+            The summary text
+        """
+        prompt = render_prompt(
+            self.prompt_template,
+            document_content=content[: self.max_input_chars],
+            language_code=language_code or "en",
+        )
+        response = await self.llm.ainvoke(prompt)
+        return response.content.strip()
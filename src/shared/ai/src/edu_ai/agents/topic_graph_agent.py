@@ -1,14 +1,20 @@
-from contextlib import suppress
+import hashlib
+import json
+import logging
 from typing import Any
 
-from azure.storage.blob import BlobServiceClient
 from edu_core.schemas.documents import DocumentStatus
-from edu_db.models import Document, Project
+from edu_core.services.document_contents import DocumentContentsService
+from edu_db.models import Document, Project, TopicGraphCache
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
+from sqlalchemy.dialects.postgresql import insert
 
+from edu_ai.agents.outline_agent import DocumentOutline
 from edu_ai.agents.utils import generate, get_db_session
 
+logger = logging.getLogger(__name__)
+
 
 class Topic(BaseModel):
     """Model for a topic in the topic graph."""
@@ -25,7 +31,37 @@ class TopicGraph(BaseModel):
     )
 
 
+def _hash(value: Any) -> str:
+    """Return the hex SHA-256 digest of a value's canonical JSON."""
+    canonical = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def get_document_set_hash(documents: list[tuple[str, bool]]) -> str:
+    """Return a hash identifying a set of documents, independent of order.
+
+    Args:
+        documents: ``(document_id, has_outline)`` of each document; a graph
+            built before a document's outline was stored is not reused
+    """
+    return _hash(sorted(documents))
+
+
 class TopicGraphAgent:
+    """Builds a topic graph from all indexed documents of a project.
+
+    The graph is reduced from the outlines generated for each document at
+    index time, so its cost grows with the number of documents rather than
+    their length. Documents without an outline contribute an excerpt of
+    their text instead.
+
+    Graphs are cached per project, keyed by the set of indexed documents,
+    topic, custom instructions and project language. A cached graph is
+    reused until a document is indexed or removed, which changes the key.
+    """
+
     output_model = TopicGraph
     prompt_template = "topic_graph_prompt"
 
@@ -33,13 +69,13 @@ class TopicGraphAgent:
         self,
         search_service: Any,
         llm: AzureChatOpenAI,
-        blob_service_client: BlobServiceClient,
-        output_container: str,
+        contents_service: DocumentContentsService | None,
+        max_excerpt_chars: int = 8_000,
     ):
         self.search_service = search_service
         self.llm = llm
-        self.blob_service_client = blob_service_client
-        self.output_container = output_container
+        self.contents_service = contents_service
+        self.max_excerpt_chars = max_excerpt_chars
 
     async def generate_topic_graph(
         self,
@@ -48,7 +84,7 @@ class TopicGraphAgent:
         custom_instructions: str | None = None,
         **kwargs: Any,
     ) -> TopicGraph:
-        """Generate a topic graph for a given project.
+        """Generate a topic graph for a given project, or reuse a cached one.
 
         Args:
             project_id: The project ID.
@@ -59,46 +95,110 @@ class TopicGraphAgent:
         Returns:
             The generated topic graph.
         """
+        # Short read: no session is held during the downloads and LLM call
         with get_db_session() as db:
             project = db.query(Project).filter(Project.id == project_id).first()
             if not project:
                 raise ValueError(f"Project {project_id} not found")
+            language_code = project.language_code
 
             documents = (
-                db.query(Document)
+                db.query(Document.id, Document.file_name, Document.outline)
                 .filter(
                     Document.project_id == project_id,
                     Document.status == DocumentStatus.INDEXED.value,
                 )
+                .order_by(Document.uploaded_at)
                 .all()
             )
 
             if not documents:
                 return TopicGraph(root_topics=[])
 
-            document_contents = []
-            if self.blob_service_client:
-                for doc in documents:
-                    blob_name = f"{project_id}/{doc.id}.contents.txt"
-                    blob_client = self.blob_service_client.get_blob_client(
-                        container=self.output_container, blob=blob_name
-                    )
-                    with suppress(Exception):
-                        document_contents.append(
-                            blob_client.download_blob().readall().decode("utf-8")
-                        )
-
-            full_content = "\n\n".join(document_contents)
-
-            return await generate(
-                llm=self.llm,
-                search_service=self.search_service,
-                output_model=self.output_model,
-                prompt_template=self.prompt_template,
-                project_id=project_id,
-                topic=topic or "",
-                language_code=project.language_code,
-                custom_instructions=custom_instructions,
-                document_content=full_content,
-                **kwargs,
+            document_set_hash = get_document_set_hash(
+                [(document.id, document.outline is not None) for document in documents]
+            )
+            cache_key = _hash(
+                {
+                    "documents": document_set_hash,
+                    "topic": topic or "",
+                    "custom_instructions": custom_instructions or "",
+                    "language_code": language_code,
+                    "kwargs": kwargs,
+                }
+            )
+            entry = db.get(TopicGraphCache, (project_id, cache_key))
+            if entry is not None:
+                logger.info("Reusing cached topic graph for project %s", project_id)
+                return TopicGraph.model_validate(entry.graph)
+
+        # Excerpts of documents without an outline are downloaded concurrently
+        excerpts = {}
+        missing = [document.id for document in documents if document.outline is None]
+        if missing and self.contents_service:
+            excerpts = await self.contents_service.load_many(
+                project_id, missing, max_chars=self.max_excerpt_chars
             )
+
+        document_contents = []
+        for document in documents:
+            if document.outline is not None:
+                content = DocumentOutline.model_validate(document.outline).render()
+            else:
+                content = excerpts.get(document.id)
+            if content:
+                document_contents.append(f"## {document.file_name}\n{content}")
+
+        full_content = "\n\n".join(document_contents)
+
+        topic_graph = await generate(
+            llm=self.llm,
+            search_service=self.search_service,
+            output_model=self.output_model,
+            prompt_template=self.prompt_template,
+            project_id=project_id,
+            topic=topic or "",
+            language_code=language_code,
+            custom_instructions=custom_instructions,
+            document_content=full_content,
+            **kwargs,
+        )
+        self._store(project_id, cache_key, document_set_hash, topic_graph)
+        return topic_graph
+
+    @staticmethod
+    def _store(
+        project_id: str, cache_key: str, document_set_hash: str, topic_graph: TopicGraph
+    ) -> None:
+        """Cache a topic graph and drop those of older document sets.
+
+        Failures are only logged; the graph is simply generated again.
+
+        Args:
+            project_id: The project ID
+            cache_key: Key of the graph
+            document_set_hash: Hash of the document set it was generated from
+            topic_graph: The generated graph
+        """
+        graph = topic_graph.model_dump(mode="json")
+        try:
+            with get_db_session() as db:
+                db.query(TopicGraphCache).filter(
+                    TopicGraphCache.project_id == project_id,
+                    TopicGraphCache.document_set_hash != document_set_hash,
+                ).delete(synchronize_session=False)
+                db.execute(
+                    insert(TopicGraphCache)
+                    .values(
+                        project_id=project_id,
+                        cache_key=cache_key,
+                        document_set_hash=document_set_hash,
+                        graph=graph,
+                    )
+                    .on_conflict_do_update(
+                        index_elements=["project_id", "cache_key"],
+                        set_={"graph": graph},
+                    )
+                )
+        except Exception as e:
+            logger.warning("Could not cache topic graph for %s: %s", project_id, e)
@@ -1,8 +1,10 @@
 import logging
+from collections.abc import Awaitable, Callable
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+from edu_core.schemas.generation_jobs import GenerationStage
 from edu_db.session import get_session_factory
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_openai import AzureChatOpenAI
@@ -17,6 +19,9 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# Called with each stage a generation enters, e.g. to update its job
+StageCallback = Callable[[GenerationStage], Awaitable[None]]
+
 
 class ContentAgentConfig(BaseModel):
     azure_openai_chat_deployment: str
@@ -24,6 +29,12 @@ class ContentAgentConfig(BaseModel):
     azure_openai_api_version: str
 
 
+async def report_stage(on_stage: StageCallback | None, stage: GenerationStage) -> None:
+    """Report a generation stage to the optional progress callback."""
+    if on_stage is not None:
+        await on_stage(stage)
+
+
 @contextmanager
 def get_db_session():
     """Context manager for database sessions with transaction handling.
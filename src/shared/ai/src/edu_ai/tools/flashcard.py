@@ -56,7 +56,7 @@ async def create_flashcards(
         description="AI-generated flashcards",
     )
 
-    svc.queue_generation(
+    _, job = await svc.queue_generation(
         group_id=group.id,
         project_id=ctx.project_id,
         topic=topic,
@@ -64,13 +64,17 @@ async def create_flashcards(
         count=count,
         user_id=ctx.user_id,
         difficulty=difficulty,
+        new_target=True,
     )
+    if job.target_id != group.id:
+        # Collapsed into an identical request still in flight
+        await asyncio.to_thread(svc.delete_flashcard_group, group.id, ctx.project_id)
 
     return json.dumps(
         {
             "status": "queued",
             "message": "Your request to generate flashcards has been queued.",
-            "group_id": group.id,
+            "group_id": job.target_id,
         },
         ensure_ascii=False,
     )
@@ -103,7 +107,7 @@ async def create_flashcards_scoped(
     )
 
     # Send message to queue
-    svc.queue_generation(
+    _, job = await svc.queue_generation(
         group_id=group.id,
         project_id=ctx.project_id,
         topic=query,
@@ -111,13 +115,17 @@ async def create_flashcards_scoped(
         count=count,
         user_id=ctx.user_id,
         difficulty=difficulty,
+        new_target=True,
     )
+    if job.target_id != group.id:
+        # Collapsed into an identical request still in flight
+        await asyncio.to_thread(svc.delete_flashcard_group, group.id, ctx.project_id)
 
     return json.dumps(
         {
             "status": "queued",
             "message": "Your request to generate flashcards from specific documents has been queued.",
-            "group_id": group.id,
+            "group_id": job.target_id,
         },
         ensure_ascii=False,
     )
@@ -47,17 +47,8 @@ async def create_mind_map(
     increment_usage(ctx.usage, ctx.user_id, "mindmap_generation")
 
     svc = MindMapService(queue_service=ctx.queue)
-    # Create a new mind map first
-    mind_map = svc.create_mind_map(
-        project_id=ctx.project_id,
-        user_id=ctx.user_id,
-        title="Generated Mind Map",
-        description="AI-generated mind map",
-        map_data={"nodes": [], "edges": []},
-    )
-
-    svc.queue_generation(
-        mind_map_id=mind_map.id,
+    # The worker creates the mind map once it is generated
+    await svc.queue_generation(
         project_id=ctx.project_id,
         user_id=ctx.user_id,
         topic=topic,
@@ -91,19 +82,9 @@ async def create_mind_map_scoped(
 
     # Send message to queue
     svc = MindMapService(queue_service=ctx.queue)
-
-    mind_map = svc.create_mind_map(
-        project_id=ctx.project_id,
-        user_id=ctx.user_id,
-        title="Generated Mind Map",
-        description="AI-generated mind map",
-        map_data={"nodes": [], "edges": []},
-    )
-
-    svc.queue_generation(
+    await svc.queue_generation(
         project_id=ctx.project_id,
         user_id=ctx.user_id,
-        mind_map_id=mind_map.id,
         topic=query,
         custom_instructions=enhanced_prompt,
     )
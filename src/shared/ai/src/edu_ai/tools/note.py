@@ -56,19 +56,23 @@ async def create_note(
     )
 
     # Send message to queue
-    svc.queue_generation(
+    _, job = await svc.queue_generation(
         note_id=note.id,
         project_id=ctx.project_id,
         topic=topic,
         custom_instructions=custom_instructions,
         user_id=ctx.user_id,
+        new_target=True,
     )
+    if job.target_id != note.id:
+        # Collapsed into an identical request still in flight
+        await asyncio.to_thread(svc.delete_note, note.id, ctx.project_id)
 
     return json.dumps(
         {
             "status": "queued",
             "message": "Your request to generate a note has been queued.",
-            "note_id": note.id,
+            "note_id": job.target_id,
         },
         ensure_ascii=False,
     )
@@ -100,19 +104,23 @@ async def create_note_scoped(
     )
 
     # Send message to queue
-    svc.queue_generation(
+    _, job = await svc.queue_generation(
         note_id=note.id,
         project_id=ctx.project_id,
         topic=query,
         custom_instructions=enhanced_prompt,
         user_id=ctx.user_id,
+        new_target=True,
     )
+    if job.target_id != note.id:
+        # Collapsed into an identical request still in flight
+        await asyncio.to_thread(svc.delete_note, note.id, ctx.project_id)
 
     return json.dumps(
         {
             "status": "queued",
             "message": "Your request to generate a note from specific documents has been queued.",
-            "note_id": note.id,
+            "note_id": job.target_id,
         },
         ensure_ascii=False,
     )
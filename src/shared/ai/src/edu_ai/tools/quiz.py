@@ -56,20 +56,24 @@ async def create_quiz(
     )
 
     # Send message to queue
-    svc.queue_generation(
+    _, job = await svc.queue_generation(
         quiz_id=quiz.id,
         project_id=ctx.project_id,
         topic=topic,
         custom_instructions=custom_instructions,
         count=count,
         user_id=ctx.user_id,
+        new_target=True,
     )
+    if job.target_id != quiz.id:
+        # Collapsed into an identical request still in flight
+        await asyncio.to_thread(svc.delete_quiz, quiz.id, ctx.project_id)
 
     return json.dumps(
         {
             "status": "queued",
             "message": "Your request to generate a quiz has been queued.",
-            "quiz_id": quiz.id,
+            "quiz_id": job.target_id,
         },
         ensure_ascii=False,
     )
@@ -101,20 +105,24 @@ async def create_quiz_scoped(
     )
 
     # Send message to queue
-    svc.queue_generation(
+    _, job = await svc.queue_generation(
         quiz_id=quiz.id,
         project_id=ctx.project_id,
         topic=query,
         custom_instructions=enhanced_prompt,
         count=count,
         user_id=ctx.user_id,
+        new_target=True,
     )
+    if job.target_id != quiz.id:
+        # Collapsed into an identical request still in flight
+        await asyncio.to_thread(svc.delete_quiz, quiz.id, ctx.project_id)
 
     return json.dumps(
         {
             "status": "queued",
             "message": "Your request to generate a quiz from specific documents has been queued.",
-            "quiz_id": quiz.id,
+            "quiz_id": job.target_id,
         },
         ensure_ascii=False,
     )
@@ -0,0 +1,270 @@
+"""Project event bus pushing changes to clients watching a project."""
+
+import asyncio
+import contextlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Literal
+
+from edu_db.notifications import NotificationListener, notify
+from edu_db.session import get_session_factory
+from pydantic import ValidationError
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from edu_core.schemas.events import ProjectEvent
+
+logger = logging.getLogger(__name__)
+
+EventBusKind = Literal["memory", "postgres"]
+
+# Every project event is announced on this channel as JSON
+PROJECT_EVENTS_CHANNEL = "project_events"
+
+EventCallback = Callable[[ProjectEvent], None]
+
+# Process-wide bus, set by init_event_bus()
+_event_bus: "EventBus | None" = None
+
+
+class EventBus(ABC):
+    """Publishes project events and delivers them to subscribers.
+
+    Delivery is best effort: a subscriber may miss events, e.g. while a
+    connection is down, and is then told to resync.
+    """
+
+    @abstractmethod
+    def publish(self, event: ProjectEvent, db: Session | None = None) -> None:
+        """Publish an event.
+
+        Args:
+            event: The event
+            db: Optional session whose transaction carries the change; the
+                event is then delivered only once it commits. Without one
+                the event is delivered right away.
+        """
+
+    @abstractmethod
+    def subscribe(self, project_id: str, callback: EventCallback) -> Callable[[], None]:
+        """Call ``callback`` with every event of a project.
+
+        Must be called from the event loop that runs the callbacks.
+
+        Args:
+            project_id: The project ID
+            callback: Called on the event loop with each event
+
+        Returns:
+            Function that removes the subscription
+        """
+
+    @property
+    def connected(self) -> bool:
+        """Whether events are currently being received."""
+        return True
+
+    def reconnect(self) -> None:
+        """Resume receiving events after a failure, if it may be retried.
+
+        Buses that cannot lose their connection keep the default no-op.
+        """
+        return None
+
+    def close(self) -> None:
+        """Release connections held by the bus; the default is a no-op."""
+        return None
+
+
+class InProcessEventBus(EventBus):
+    """Delivers events to subscribers in the same process.
+
+    Events published by other processes, such as the worker, are never
+    seen; use it when everything runs in one process.
+    """
+
+    def __init__(self):
+        """Initialize the bus."""
+        self._lock = threading.Lock()
+        self._subscribers: dict[
+            str, set[tuple[asyncio.AbstractEventLoop, EventCallback]]
+        ] = defaultdict(set)
+
+    def publish(self, event: ProjectEvent, db: Session | None = None) -> None:
+        if db is not None:
+            sa_event.listen(
+                db, "after_commit", lambda _: self._deliver(event), once=True
+            )
+        else:
+            self._deliver(event)
+
+    def subscribe(self, project_id: str, callback: EventCallback) -> Callable[[], None]:
+        subscriber = (asyncio.get_running_loop(), callback)
+        with self._lock:
+            self._subscribers[project_id].add(subscriber)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers[project_id].discard(subscriber)
+                if not self._subscribers[project_id]:
+                    del self._subscribers[project_id]
+
+        return unsubscribe
+
+    def _deliver(self, event: ProjectEvent) -> None:
+        """Hand the event to each subscriber's loop; safe from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.project_id, ()))
+        for loop, callback in subscribers:
+            # The loop is closed if its subscriber is shutting down
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(callback, event)
+
+
+class PostgresEventBus(EventBus):
+    """Carries events between processes with Postgres ``NOTIFY``.
+
+    Events are published on ``PROJECT_EVENTS_CHANNEL``; each subscribing
+    process listens on one connection and filters by project.
+    """
+
+    def __init__(self, listener: NotificationListener, owns_listener: bool = False):
+        """Initialize the bus.
+
+        Args:
+            listener: Listener delivering notifications, possibly shared
+                with other channels
+            owns_listener: Whether closing the bus closes the listener
+        """
+        self.listener = listener
+        self.owns_listener = owns_listener
+        self._subscribers: dict[str, set[EventCallback]] = defaultdict(set)
+        self._unlisten: Callable[[], None] | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self.listener.connected
+
+    def publish(self, event: ProjectEvent, db: Session | None = None) -> None:
+        payload = event.model_dump_json()
+        if db is not None:
+            notify(db, PROJECT_EVENTS_CHANNEL, payload)
+            return
+
+        with get_session_factory()() as session:
+            notify(session, PROJECT_EVENTS_CHANNEL, payload)
+            session.commit()
+
+    def subscribe(self, project_id: str, callback: EventCallback) -> Callable[[], None]:
+        self._subscribers[project_id].add(callback)
+        if self._unlisten is None:
+            self._unlisten = self.listener.subscribe(
+                PROJECT_EVENTS_CHANNEL, self._dispatch
+            )
+
+        def unsubscribe() -> None:
+            self._subscribers[project_id].discard(callback)
+            if not self._subscribers[project_id]:
+                del self._subscribers[project_id]
+
+        return unsubscribe
+
+    def reconnect(self) -> None:
+        self.listener.reconnect()
+
+    def close(self) -> None:
+        if self._unlisten is not None:
+            self._unlisten()
+            self._unlisten = None
+        if self.owns_listener:
+            self.listener.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = ProjectEvent.model_validate_json(payload)
+        except ValidationError as e:
+            logger.warning("Ignoring malformed project event: %s", e)
+            return
+        for callback in list(self._subscribers.get(event.project_id, ())):
+            callback(event)
+
+
+def create_event_bus(
+    kind: EventBusKind,
+    database_url: str = "",
+    listener: NotificationListener | None = None,
+) -> EventBus:
+    """Create the event bus of the given kind.
+
+    Args:
+        kind: "memory" for in-process delivery or "postgres" for NOTIFY
+        database_url: Database connection URL (postgres only)
+        listener: Optional listener to share (postgres only); by default the
+            bus gets its own, which connects on the first subscription
+
+    Returns:
+        The event bus
+    """
+    if kind == "memory":
+        return InProcessEventBus()
+    if kind == "postgres":
+        if listener is None:
+            return PostgresEventBus(
+                NotificationListener(database_url), owns_listener=True
+            )
+        return PostgresEventBus(listener)
+    raise ValueError(f"Unknown event bus: {kind}")
+
+
+def init_event_bus(
+    kind: EventBusKind,
+    database_url: str = "",
+    listener: NotificationListener | None = None,
+) -> EventBus:
+    """Create the process-wide event bus used by ``publish_event``.
+
+    Call this once at startup (API lifespan or worker startup); later calls
+    return the existing bus.
+
+    Args:
+        kind: "memory" for in-process delivery or "postgres" for NOTIFY
+        database_url: Database connection URL (postgres only)
+        listener: Optional listener to share (postgres only)
+
+    Returns:
+        The event bus
+    """
+    global _event_bus
+
+    if _event_bus is None:
+        _event_bus = create_event_bus(
+            kind, database_url=database_url, listener=listener
+        )
+    return _event_bus
+
+
+def get_event_bus() -> EventBus:
+    """Return the process-wide event bus."""
+    if _event_bus is None:
+        raise RuntimeError("Event bus not initialized.")
+    return _event_bus
+
+
+def publish_event(event: ProjectEvent, db: Session | None = None) -> None:
+    """Publish an event on the process-wide bus; failures are only logged.
+
+    Does nothing if the process never initialized a bus, e.g. in scripts.
+
+    Args:
+        event: The event
+        db: Optional session whose transaction carries the change
+    """
+    if _event_bus is None:
+        return
+    try:
+        _event_bus.publish(event, db=db)
+    except Exception:
+        logger.exception("Could not publish %s event", event.type.value)
@@ -10,10 +10,20 @@ class DocumentStatus(str, Enum):
     UPLOADED = "uploaded"
     PROCESSING = "processing"
     PROCESSED = "processed"
+    PARTIALLY_INDEXED = "partially_indexed"
     INDEXED = "indexed"
     FAILED = "failed"
 
 
+class DocumentProcessingStage(str, Enum):
+    """Last completed document processing stage, in processing order."""
+
+    ANALYZED = "analyzed"
+    STORED = "stored"
+    SEGMENTED = "segmented"
+    INDEXED = "indexed"
+
+
 class DocumentDto(BaseModel):
     model_config = {"from_attributes": True}
 
@@ -27,7 +37,13 @@ class DocumentDto(BaseModel):
     file_size: int = Field(..., gt=0, description="File size in bytes")
     status: DocumentStatus = Field(
         ...,
-        description="Document processing status: uploaded, processing, processed, failed, indexed",
+        description="Document processing status: uploaded, processing, processed, partially_indexed, failed, indexed",
+    )
+    indexing_progress: int | None = Field(
+        None,
+        ge=0,
+        le=100,
+        description="Percentage of the document's segments that are already searchable",
     )
     summary: str | None = Field(
         None, description="Auto-generated summary of the document"
@@ -0,0 +1,50 @@
+from datetime import UTC, datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class ProjectEventType(str, Enum):
+    """Project event type enum."""
+
+    DOCUMENT_STATUS_CHANGED = "document_status_changed"
+    RESOURCE_CREATED = "resource_created"
+    GENERATION_FINISHED = "generation_finished"
+    # Events may have been missed; the client should reload everything
+    RESYNC = "resync"
+
+
+class ProjectResourceType(str, Enum):
+    """Kind of project resource an event refers to."""
+
+    DOCUMENT = "document"
+    QUIZ = "quiz"
+    FLASHCARD_GROUP = "flashcard_group"
+    NOTE = "note"
+    MIND_MAP = "mind_map"
+
+
+class ProjectEvent(BaseModel):
+    """Change within a project, pushed to clients watching the project.
+
+    Events only identify what changed; clients fetch the resource itself.
+    """
+
+    type: ProjectEventType = Field(..., description="Event type")
+    project_id: str = Field(..., description="ID of the project that changed")
+    resource_type: ProjectResourceType | None = Field(
+        None, description="Kind of resource that changed"
+    )
+    resource_id: str | None = Field(None, description="ID of the resource")
+    status: str | None = Field(
+        None,
+        description="New document status, or succeeded/failed for a generation",
+    )
+    progress: int | None = Field(
+        None, description="Indexing progress percentage of a document"
+    )
+    error: str | None = Field(None, description="Error message if any")
+    occurred_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        description="Date and time of the change",
+    )
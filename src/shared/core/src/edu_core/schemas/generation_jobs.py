@@ -0,0 +1,69 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class GenerationJobStatus(str, Enum):
+    """Generation job status enum."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    # Replaced by a newer request for the same target before it ran
+    SUPERSEDED = "superseded"
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job will not change any more."""
+        return self in (
+            GenerationJobStatus.SUCCEEDED,
+            GenerationJobStatus.FAILED,
+            GenerationJobStatus.SUPERSEDED,
+        )
+
+
+class GenerationStage(str, Enum):
+    """Stage of a running generation job, in processing order."""
+
+    # Building the topic graph over the project's documents
+    SEARCHING = "searching"
+    # Retrieving context and calling the model
+    GENERATING = "generating"
+    # Writing the generated content
+    SAVING = "saving"
+
+
+class GenerationJobDto(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: str = Field(..., description="Unique ID of the generation job")
+    project_id: str = Field(..., description="ID of the project the job belongs to")
+    task_type: str = Field(..., description="Queue task type of the job")
+    target_id: str = Field(
+        ..., description="ID of the quiz, flashcard group, note or mind map"
+    )
+    idempotency_key: str | None = Field(
+        None, description="Hash of the task's type, target and parameters"
+    )
+    status: GenerationJobStatus = Field(
+        ...,
+        description="Job status: queued, running, succeeded, failed, superseded",
+    )
+    stage: GenerationStage | None = Field(
+        None, description="Current stage while running: searching, generating, saving"
+    )
+    stage_timings: dict[str, float] = Field(
+        default_factory=dict,
+        description="Seconds spent per stage, including 'queued', over all attempts",
+    )
+    attempts: int = Field(0, description="Number of times the worker started the job")
+    error: str | None = Field(None, description="Last error, if any")
+    created_at: datetime = Field(..., description="Date and time the job was queued")
+    started_at: datetime | None = Field(
+        None, description="Date and time the worker first started the job"
+    )
+    finished_at: datetime | None = Field(
+        None, description="Date and time the job finished"
+    )
@@ -2,9 +2,11 @@
 
 from edu_core.exceptions import NotFoundError
 from edu_core.services.chats import ChatService
+from edu_core.services.document_contents import DocumentContentsService
 from edu_core.services.document_upload import DocumentUploadService
 from edu_core.services.documents import DocumentService
 from edu_core.services.flashcard_groups import FlashcardGroupService
+from edu_core.services.generation_jobs import GenerationJobService
 from edu_core.services.mind_maps import MindMapService
 from edu_core.services.notes import NoteService
 from edu_core.services.practice import PracticeService
@@ -17,9 +19,11 @@ from edu_core.services.users import UserService
 
 __all__ = [
     "ChatService",
+    "DocumentContentsService",
     "DocumentService",
     "DocumentUploadService",
     "FlashcardGroupService",
+    "GenerationJobService",
     "MindMapService",
     "NotFoundError",
     "NoteService",
@@ -944,7 +944,7 @@ class ChatService:
                                     "type": TaskType.CHAT_TITLE_GENERATION,
                                     "data": task_data,
                                 }
-                                queue_service.send_message(task_message)
+                                await queue_service.send_message(task_message)
                             else:
                                 # Fallback to synchronous generation if queue not available
                                 generated_title = await self._generate_chat_title(
@@ -0,0 +1,206 @@
+"""Service for reading processed document contents from blob storage."""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError, ResourceNotModifiedError
+
+from edu_core.exceptions import NotFoundError
+
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of UTF-8 bytes per character, for ranged downloads of a prefix
+MAX_BYTES_PER_CHAR = 4
+
+
+class ContentsCache(ABC):
+    """Local copies of contents blobs, revalidated against the blob's ETag.
+
+    Methods are called from worker threads and must be thread-safe.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        """Return the ETag and data cached under a key, or None."""
+
+    @abstractmethod
+    def put(self, key: str, etag: str, data: bytes) -> None:
+        """Cache the data of a blob at the given ETag, replacing older data."""
+
+    def mark_fresh(self, key: str) -> None:
+        """Note that the blob confirmed a cached entry is current.
+
+        The default is a no-op; caches override it to track hits.
+        """
+        return None
+
+
+class DocumentContentsService:
+    """Async reads of the analyzed text (``contents.txt``) of documents.
+
+    Downloads never block the event loop, and ``load_many`` runs at most
+    ``max_concurrency`` of them at a time, so loading many documents takes
+    about as long as the slowest few rather than the sum of all.
+
+    With a ``cache``, a blob already cached is requested with its ETag and
+    only downloaded again if it changed; otherwise the cached copy is used.
+    """
+
+    def __init__(
+        self,
+        azure_storage_connection_string: str,
+        azure_storage_output_container_name: str,
+        max_concurrency: int = 8,
+        on_download: Callable[[float, bool], None] | None = None,
+        cache: ContentsCache | None = None,
+    ) -> None:
+        """Initialize the document contents service.
+
+        Args:
+            azure_storage_connection_string: Azure Storage connection string
+            azure_storage_output_container_name: Container holding the contents
+            max_concurrency: Downloads run at the same time by ``load_many``
+            on_download: Called with the duration of each download in seconds
+                and whether it succeeded, e.g. to record a metric
+            cache: Optional local cache of downloaded contents
+        """
+        self.connection_string = azure_storage_connection_string
+        self.output_container = azure_storage_output_container_name
+        self.max_concurrency = max_concurrency
+        self.on_download = on_download
+        self.cache = cache
+
+    @cached_property
+    def service_client(self) -> "BlobServiceClient":
+        """Async client shared by all downloads, opened on first use."""
+        from azure.storage.blob.aio import BlobServiceClient
+
+        return BlobServiceClient.from_connection_string(self.connection_string)
+
+    @staticmethod
+    def get_blob_name(project_id: str, document_id: str) -> str:
+        """Get the name of a document's contents blob.
+
+        Args:
+            project_id: The project ID
+            document_id: The document ID
+
+        Returns:
+            ``<project_id>/<document_id>.contents.txt``
+        """
+        return f"{project_id}/{document_id}.contents.txt"
+
+    async def load(
+        self, project_id: str, document_id: str, max_chars: int | None = None
+    ) -> str:
+        """Load a document's contents.
+
+        Args:
+            project_id: The project ID
+            document_id: The document ID
+            max_chars: Only load about this many leading characters; a
+                multi-byte character cut at the end is dropped
+
+        Returns:
+            The analyzed markdown
+
+        Raises:
+            NotFoundError: If the document has no contents blob
+        """
+        blob_name = self.get_blob_name(project_id, document_id)
+        blob = self.service_client.get_blob_client(self.output_container, blob_name)
+        length = max_chars * MAX_BYTES_PER_CHAR if max_chars is not None else None
+
+        # A prefix is cached apart from the full blob
+        cache_key = blob_name if length is None else f"{blob_name}@{length}"
+        cached = None
+        conditions = {}
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                conditions = {
+                    "etag": cached[0],
+                    "match_condition": MatchConditions.IfModified,
+                }
+
+        start = time.perf_counter()
+        succeeded = False
+        etag = None
+        try:
+            downloader = await blob.download_blob(offset=0, length=length, **conditions)
+            data = await downloader.readall()
+            etag = downloader.properties.etag
+            succeeded = True
+        except ResourceNotModifiedError:
+            # Unchanged since it was cached
+            data = cached[1]
+            succeeded = True
+        except ResourceNotFoundError as e:
+            raise NotFoundError(f"Contents of document {document_id} not found") from e
+        finally:
+            if self.on_download is not None:
+                self.on_download(time.perf_counter() - start, succeeded)
+
+        if self.cache is not None:
+            try:
+                if etag is None:
+                    self.cache.mark_fresh(cache_key)
+                else:
+                    await asyncio.to_thread(self.cache.put, cache_key, etag, data)
+            except Exception as e:
+                logger.warning("Could not cache contents of %s: %s", blob_name, e)
+
+        if max_chars is None:
+            return data.decode("utf-8")
+        return data.decode("utf-8", errors="ignore")[:max_chars]
+
+    async def load_many(
+        self, project_id: str, document_ids: list[str], max_chars: int | None = None
+    ) -> dict[str, str]:
+        """Load the contents of several documents concurrently.
+
+        Documents whose contents are missing or fail to download are left
+        out and logged.
+
+        Args:
+            project_id: The project ID
+            document_ids: The document IDs
+            max_chars: Only load about this many leading characters of each
+
+        Returns:
+            Mapping of document ID to contents
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def load_one(document_id: str) -> str:
+            async with semaphore:
+                return await self.load(project_id, document_id, max_chars)
+
+        results = await asyncio.gather(
+            *(load_one(document_id) for document_id in document_ids),
+            return_exceptions=True,
+        )
+        contents = {}
+        for document_id, result in zip(document_ids, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "Could not load contents of document %s: %s", document_id, result
+                )
+            else:
+                contents[document_id] = result
+        return contents
+
+    async def aclose(self) -> None:
+        """Close the blob client, if it was opened."""
+        if "service_client" in self.__dict__:
+            await self.service_client.close()
+            del self.service_client
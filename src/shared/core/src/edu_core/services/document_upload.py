@@ -1,5 +1,6 @@
 """Service for uploading documents to blob storage."""
 
+import hashlib
 from contextlib import contextmanager
 from datetime import datetime
 from uuid import uuid4
@@ -11,7 +12,13 @@ from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPerm
 from edu_db.models import Document
 from edu_db.session import get_session_factory
 
+from edu_core.events import publish_event
 from edu_core.schemas.documents import DocumentStatus
+from edu_core.schemas.events import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectResourceType,
+)
 
 
 class DocumentUploadService:
@@ -136,10 +143,21 @@ class DocumentUploadService:
             file_name=filename,
             file_type=self._get_file_type(filename),
             file_size=len(file_content),
+            content_hash=self.compute_content_hash(file_content),
             status=DocumentStatus.UPLOADED.value,
             uploaded_at=datetime.now(),
         )
         db.add(document)
+        publish_event(
+            ProjectEvent(
+                type=ProjectEventType.RESOURCE_CREATED,
+                project_id=project_id,
+                resource_type=ProjectResourceType.DOCUMENT,
+                resource_id=document.id,
+                status=document.status,
+            ),
+            db=db,
+        )
         db.commit()
         db.refresh(document)
         return document.id
@@ -170,6 +188,18 @@ class DocumentUploadService:
         blob_client.upload_blob(data=file_content, overwrite=True)
         return blob_name
 
+    @staticmethod
+    def compute_content_hash(file_content: bytes) -> str:
+        """Fingerprint file content so identical uploads can share processing results.
+
+        Args:
+            file_content: The file content as bytes
+
+        Returns:
+            Hex-encoded SHA-256 digest of the content
+        """
+        return hashlib.sha256(file_content).hexdigest()
+
     @staticmethod
     def _get_file_type(filename: str) -> str:
         """Extract file type from filename.
@@ -197,6 +227,16 @@ class DocumentUploadService:
         if document:
             document.original_blob_name = raw_blob_name
             document.status = DocumentStatus.PROCESSING.value
+            publish_event(
+                ProjectEvent(
+                    type=ProjectEventType.DOCUMENT_STATUS_CHANGED,
+                    project_id=document.project_id,
+                    resource_type=ProjectResourceType.DOCUMENT,
+                    resource_id=document.id,
+                    status=document.status,
+                ),
+                db=db,
+            )
             db.commit()
 
     @contextmanager
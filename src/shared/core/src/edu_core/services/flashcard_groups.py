@@ -8,8 +8,16 @@ from uuid import uuid4
 from edu_db.models import Flashcard, FlashcardGroup
 from edu_db.session import get_session_factory
 
+from edu_core.events import publish_event
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.events import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectResourceType,
+)
 from edu_core.schemas.flashcards import FlashcardDto, FlashcardGroupDto
+from edu_core.schemas.generation_jobs import GenerationJobDto
+from edu_core.services.generation_jobs import GenerationJobService
 
 if TYPE_CHECKING:
     from edu_queue.service import QueueService
@@ -53,6 +61,15 @@ class FlashcardGroupService:
                     updated_at=datetime.now(),
                 )
                 db.add(flashcard_group)
+                publish_event(
+                    ProjectEvent(
+                        type=ProjectEventType.RESOURCE_CREATED,
+                        project_id=project_id,
+                        resource_type=ProjectResourceType.FLASHCARD_GROUP,
+                        resource_id=flashcard_group.id,
+                    ),
+                    db=db,
+                )
                 db.commit()
                 db.refresh(flashcard_group)
 
@@ -449,7 +466,7 @@ class FlashcardGroupService:
             created_at=flashcard.created_at,
         )
 
-    def queue_generation(
+    async def queue_generation(
         self,
         group_id: str,
         project_id: str,
@@ -458,7 +475,8 @@ class FlashcardGroupService:
         count: int | None = None,
         difficulty: str | None = None,
         user_id: str | None = None,
-    ) -> FlashcardGroupDto:
+        new_target: bool = False,
+    ) -> tuple[FlashcardGroupDto, GenerationJobDto]:
         """Queue a flashcard generation request to be processed by a worker.
 
         Args:
@@ -470,9 +488,12 @@ class FlashcardGroupService:
             count: Optional count of flashcards to generate
             difficulty: Optional difficulty level
             user_id: Optional user ID for queue message
+            new_target: The flashcard group was created for this request; see
+                ``GenerationJobService.queue_task``
 
         Returns:
-            Existing FlashcardGroupDto (generation will happen asynchronously)
+            Existing FlashcardGroupDto (generation will happen asynchronously) and the
+            job tracking its generation
 
         Raises:
             NotFoundError: If flashcard group not found
@@ -502,14 +523,21 @@ class FlashcardGroupService:
         if difficulty:
             task_data["difficulty"] = difficulty
 
-        # Send message to queue
         task_message: QueueTaskMessage = {
             "type": TaskType.FLASHCARD_GENERATION,
             "data": task_data,
         }
-        self.queue_service.send_message(task_message)
+        # Track the task with a job and queue it, unless it is a duplicate
+        job = await GenerationJobService().queue_task(
+            self.queue_service,
+            task_message,
+            project_id=project_id,
+            target_id=group_id,
+            user_id=user_id,
+            new_target=new_target,
+        )
 
-        return group
+        return group, job
 
     @contextmanager
     def _get_db_session(self):
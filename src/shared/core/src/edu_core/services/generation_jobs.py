@@ -0,0 +1,390 @@
+"""Service for tracking the progress of queued generation tasks."""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from edu_db.models import GenerationJob
+from edu_db.notifications import notify
+from edu_db.session import get_session_factory
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from edu_core.exceptions import NotFoundError
+from edu_core.schemas.generation_jobs import (
+    GenerationJobDto,
+    GenerationJobStatus,
+    GenerationStage,
+)
+
+if TYPE_CHECKING:
+    from edu_queue.schemas import QueueTaskMessage
+    from edu_queue.service import QueueService
+
+logger = logging.getLogger(__name__)
+
+# Every job change is announced on this channel; the payload is the job ID
+GENERATION_JOBS_CHANNEL = "generation_jobs"
+
+QUEUED = GenerationJobStatus.QUEUED.value
+RUNNING = GenerationJobStatus.RUNNING.value
+SUCCEEDED = GenerationJobStatus.SUCCEEDED.value
+FAILED = GenerationJobStatus.FAILED.value
+SUPERSEDED = GenerationJobStatus.SUPERSEDED.value
+
+
+class GenerationJobService:
+    """Service for generation jobs and their state machine.
+
+    A job is created whenever a generation task is queued; the worker moves
+    it along::
+
+        queued -> running -> succeeded
+                          -> failed -> queued (its dead letter was replayed)
+                          -> queued (retried after an error)
+        queued -> superseded (a newer request for the target was queued)
+
+    Each job carries the idempotency key of its task. While a job is queued
+    or running, an identical request is collapsed into it instead of being
+    queued again. A request with different parameters for the same target
+    supersedes the queued jobs before it, and the worker skips their tasks.
+
+    While running, the job records its current stage. Leaving a state adds
+    the time spent in it to ``stage_timings``, with time waiting in the queue
+    recorded as ``queued``. Every change is committed together with a
+    ``NOTIFY`` on ``GENERATION_JOBS_CHANNEL``.
+    """
+
+    def create_job(
+        self,
+        project_id: str,
+        task_type: str,
+        target_id: str,
+        user_id: str | None = None,
+        idempotency_key: str | None = None,
+    ) -> tuple[GenerationJobDto, bool]:
+        """Create a queued job, unless an identical one is in flight.
+
+        Queued jobs for the same target are superseded by the new one.
+
+        Args:
+            project_id: The project ID
+            task_type: Queue task type of the job
+            target_id: ID of the entity being generated
+            user_id: Optional ID of the user who requested it
+            idempotency_key: Optional idempotency key of the task
+
+        Returns:
+            The created job and True, or the queued or running job with the
+            same idempotency key and False
+        """
+        with self._get_db_session() as db:
+            if idempotency_key:
+                existing = self._find_in_flight(db, idempotency_key)
+                if existing:
+                    return GenerationJobDto.model_validate(existing), False
+
+            now = datetime.now(UTC)
+            superseded = self._supersede_queued(db, task_type, target_id, now)
+            job = GenerationJob(
+                id=str(uuid4()),
+                project_id=project_id,
+                user_id=user_id,
+                task_type=task_type,
+                target_id=target_id,
+                idempotency_key=idempotency_key,
+                status=QUEUED,
+                stage_started_at=now,
+                stage_timings={},
+                attempts=0,
+            )
+            db.add(job)
+            try:
+                db.flush()
+            except IntegrityError:
+                # An identical request created its job in the meantime
+                db.rollback()
+                existing = self._find_in_flight(db, idempotency_key)
+                if not existing:
+                    raise
+                return GenerationJobDto.model_validate(existing), False
+
+            for superseded_id in superseded:
+                notify(db, GENERATION_JOBS_CHANNEL, superseded_id)
+            db.commit()
+            db.refresh(job)
+            return GenerationJobDto.model_validate(job), True
+
+    async def queue_task(
+        self,
+        queue_service: "QueueService",
+        message: "QueueTaskMessage",
+        project_id: str,
+        target_id: str,
+        user_id: str | None = None,
+        new_target: bool = False,
+    ) -> GenerationJobDto:
+        """Create a job for a generation task and queue the task.
+
+        The task is not queued again while an identical one is queued or
+        running; the request is collapsed into that task's job instead.
+
+        Args:
+            queue_service: QueueService instance to send the message
+            message: The task message; its ``job_id`` is filled in
+            project_id: The project ID
+            target_id: ID of the entity being generated
+            user_id: Optional ID of the user who requested it
+            new_target: The target was created for this request; an identical
+                request for another new target is collapsed into its job, whose
+                ``target_id`` then differs from ``target_id``
+
+        Returns:
+            The job tracking the task
+        """
+        from edu_queue.idempotency import get_idempotency_key
+        from edu_queue.schemas import TaskType
+
+        task_type = TaskType(message["type"]).value
+        # The job queries would otherwise block the event loop
+        job, created = await asyncio.to_thread(
+            self.create_job,
+            project_id=project_id,
+            task_type=task_type,
+            target_id=target_id,
+            user_id=user_id,
+            idempotency_key=get_idempotency_key(message, new_target=new_target),
+        )
+        if not created:
+            logger.info(
+                "Collapsed duplicate %s request for %s into job %s",
+                task_type,
+                target_id,
+                job.id,
+            )
+            return job
+
+        message["data"]["job_id"] = job.id
+        try:
+            await queue_service.send_message(message)
+        except Exception as e:
+            # Nothing will ever pick the job up
+            await asyncio.to_thread(self.fail, job.id, f"Could not queue task: {e}")
+            raise
+        return job
+
+    def get_job(self, job_id: str, project_id: str | None = None) -> GenerationJobDto:
+        """Get a job by ID.
+
+        Args:
+            job_id: The job ID
+            project_id: Optional project ID the job must belong to
+
+        Returns:
+            GenerationJobDto
+
+        Raises:
+            NotFoundError: If the job is not found
+        """
+        with self._get_db_session() as db:
+            query = db.query(GenerationJob).filter(GenerationJob.id == job_id)
+            if project_id is not None:
+                query = query.filter(GenerationJob.project_id == project_id)
+            job = query.first()
+            if not job:
+                raise NotFoundError(f"Generation job {job_id} not found")
+            return GenerationJobDto.model_validate(job)
+
+    def start(self, job_id: str) -> bool:
+        """Mark a job as running.
+
+        A running job may be started again when its message is redelivered
+        after a worker crash. A finished job is left alone, and its task
+        should be skipped: it was superseded, or an earlier delivery of the
+        message already finished it.
+
+        Returns:
+            Whether the job was updated
+        """
+
+        def apply(job: GenerationJob, now: datetime) -> None:
+            if job.status == QUEUED:
+                self._add_timing(job, "queued", now)
+            else:
+                self._close_stage(job, now)
+            job.status = RUNNING
+            job.attempts += 1
+            job.started_at = job.started_at or now
+
+        return self._transition(job_id, {QUEUED, RUNNING}, apply)
+
+    def enter_stage(self, job_id: str, stage: GenerationStage) -> bool:
+        """Record that a running job entered the next stage.
+
+        Returns:
+            Whether the job was updated
+        """
+
+        def apply(job: GenerationJob, now: datetime) -> None:
+            self._close_stage(job, now)
+            job.stage = stage.value
+            job.stage_started_at = now
+
+        return self._transition(job_id, {RUNNING}, apply)
+
+    def succeed(self, job_id: str) -> bool:
+        """Mark a running job as succeeded.
+
+        Returns:
+            Whether the job was updated
+        """
+
+        def apply(job: GenerationJob, now: datetime) -> None:
+            self._close_stage(job, now)
+            job.status = SUCCEEDED
+            job.error = None
+            job.finished_at = now
+
+        return self._transition(job_id, {RUNNING}, apply)
+
+    def retry(self, job_id: str, error: str) -> bool:
+        """Put a failed attempt back into the queued state.
+
+        Returns:
+            Whether the job was updated
+        """
+
+        def apply(job: GenerationJob, now: datetime) -> None:
+            self._close_stage(job, now)
+            job.status = QUEUED
+            job.error = error
+            job.stage_started_at = now
+
+        return self._transition(job_id, {RUNNING}, apply)
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """Mark a job as failed for good.
+
+        Returns:
+            Whether the job was updated
+        """
+
+        def apply(job: GenerationJob, now: datetime) -> None:
+            if job.status == QUEUED:
+                self._add_timing(job, "queued", now)
+            else:
+                self._close_stage(job, now)
+            job.status = FAILED
+            job.error = error
+            job.finished_at = now
+
+        return self._transition(job_id, {QUEUED, RUNNING}, apply)
+
+    def requeue(self, job_id: str) -> bool:
+        """Put a failed job back into the queued state for a replayed task.
+
+        Returns:
+            Whether the job was updated; False if it did not fail, or an
+            identical job is already queued or running
+        """
+
+        def apply(job: GenerationJob, now: datetime) -> None:
+            job.status = QUEUED
+            job.error = None
+            job.finished_at = None
+            job.stage_started_at = now
+
+        try:
+            return self._transition(job_id, {FAILED}, apply)
+        except IntegrityError:
+            return False
+
+    def _transition(
+        self,
+        job_id: str,
+        allowed: set[str],
+        apply: Callable[[GenerationJob, datetime], None],
+    ) -> bool:
+        """Apply a change to a job in one of the allowed states and notify."""
+        with self._get_db_session() as db:
+            job = (
+                db.query(GenerationJob)
+                .filter(GenerationJob.id == job_id)
+                .with_for_update()
+                .first()
+            )
+            if not job or job.status not in allowed:
+                return False
+
+            apply(job, datetime.now(UTC))
+            notify(db, GENERATION_JOBS_CHANNEL, job_id)
+            db.commit()
+            return True
+
+    @staticmethod
+    def _find_in_flight(db: Session, idempotency_key: str) -> GenerationJob | None:
+        """Return the queued or running job with the key, if any."""
+        return (
+            db.query(GenerationJob)
+            .filter(
+                GenerationJob.idempotency_key == idempotency_key,
+                GenerationJob.status.in_((QUEUED, RUNNING)),
+            )
+            .first()
+        )
+
+    @classmethod
+    def _supersede_queued(
+        cls, db: Session, task_type: str, target_id: str, now: datetime
+    ) -> list[str]:
+        """Supersede the queued jobs of a target and return their IDs."""
+        jobs = (
+            db.query(GenerationJob)
+            .filter(
+                GenerationJob.task_type == task_type,
+                GenerationJob.target_id == target_id,
+                GenerationJob.status == QUEUED,
+            )
+            .with_for_update()
+            .all()
+        )
+        for job in jobs:
+            cls._add_timing(job, "queued", now)
+            job.status = SUPERSEDED
+            job.stage_started_at = None
+            job.finished_at = now
+        return [job.id for job in jobs]
+
+    @staticmethod
+    def _add_timing(job: GenerationJob, name: str, now: datetime) -> None:
+        if job.stage_started_at is None:
+            return
+        elapsed = (now - job.stage_started_at).total_seconds()
+        timings = dict(job.stage_timings or {})
+        timings[name] = round(timings.get(name, 0.0) + max(elapsed, 0.0), 3)
+        # Reassign so the JSON column is marked as changed
+        job.stage_timings = timings
+
+    @classmethod
+    def _close_stage(cls, job: GenerationJob, now: datetime) -> None:
+        if job.stage:
+            cls._add_timing(job, job.stage, now)
+        job.stage = None
+        job.stage_started_at = None
+
+    @contextmanager
+    def _get_db_session(self):
+        """Context manager for database sessions."""
+        SessionLocal = get_session_factory()
+        db = SessionLocal()
+        try:
+            yield db
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
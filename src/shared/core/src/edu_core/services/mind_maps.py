@@ -8,8 +8,16 @@ from uuid import uuid4
 from edu_db.models import MindMap
 from edu_db.session import get_session_factory
 
+from edu_core.events import publish_event
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.events import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectResourceType,
+)
+from edu_core.schemas.generation_jobs import GenerationJobDto
 from edu_core.schemas.mind_maps import MindMapDto
+from edu_core.services.generation_jobs import GenerationJobService
 
 if TYPE_CHECKING:
     from edu_queue.service import QueueService
@@ -59,6 +67,15 @@ class MindMapService:
                     updated_at=datetime.now(),
                 )
                 db.add(mind_map)
+                publish_event(
+                    ProjectEvent(
+                        type=ProjectEventType.RESOURCE_CREATED,
+                        project_id=project_id,
+                        resource_type=ProjectResourceType.MIND_MAP,
+                        resource_id=mind_map.id,
+                    ),
+                    db=db,
+                )
                 db.commit()
                 db.refresh(mind_map)
 
@@ -141,16 +158,20 @@ class MindMapService:
             updated_at=mind_map.updated_at,
         )
 
-    def queue_generation(
+    async def queue_generation(
         self,
         user_id: str,
         project_id: str,
         mind_map_id: str | None = None,
         topic: str | None = None,
         custom_instructions: str | None = None,
-    ) -> MindMapDto:
+    ) -> tuple[MindMapDto | None, GenerationJobDto]:
         """Queue a mind map generation request to be processed by a worker.
 
+        Without ``mind_map_id`` no mind map is created here; the worker
+        creates it once the content is generated, under the ID that is the
+        job's ``target_id``, so a failed generation leaves no empty mind map.
+
         Args:
             user_id: The user ID
             project_id: The project ID
@@ -160,30 +181,26 @@ class MindMapService:
             custom_instructions: Optional custom instructions
 
         Returns:
-            Existing or newly created MindMapDto (generation will happen asynchronously)
+            Existing MindMapDto, or None for a new mind map (generation will
+            happen asynchronously), and the job tracking its generation
 
         Raises:
             NotFoundError: If mind_map_id is provided but mind map not found
         """
         from edu_queue.schemas import MindMapGenerationData, QueueTaskMessage, TaskType
 
-        # If mind_map_id is provided, verify it exists
-        if mind_map_id:
+        create = not mind_map_id
+        if create:
+            # The worker creates the mind map together with its content
+            mind_map = None
+            mind_map_id = str(uuid4())
+        else:
+            # If mind_map_id is provided, verify it exists
             mind_map = self.get_mind_map(
                 mind_map_id=mind_map_id,
                 project_id=project_id,
                 user_id=user_id,
             )
-        else:
-            # Create a new empty mind map
-            mind_map = self.create_mind_map(
-                user_id=user_id,
-                project_id=project_id,
-                title="Generating...",
-                description="Mind map is being generated",
-                map_data={"nodes": [], "edges": []},
-            )
-            mind_map_id = mind_map.id
 
         # Prepare task data
         task_data: MindMapGenerationData = {
@@ -191,19 +208,28 @@ class MindMapService:
             "user_id": user_id,
             "mind_map_id": mind_map_id,
         }
+        if create:
+            task_data["create_mind_map"] = True
         if topic:
             task_data["topic"] = topic
         if custom_instructions:
             task_data["custom_instructions"] = custom_instructions
 
-        # Send message to queue
         task_message: QueueTaskMessage = {
             "type": TaskType.MIND_MAP_GENERATION,
             "data": task_data,
         }
-        self.queue_service.send_message(task_message)
+        # Track the task with a job and queue it, unless it is a duplicate
+        job = await GenerationJobService().queue_task(
+            self.queue_service,
+            task_message,
+            project_id=project_id,
+            target_id=mind_map_id,
+            user_id=user_id,
+            new_target=create,
+        )
 
-        return mind_map
+        return mind_map, job
 
     @contextmanager
     def _get_db_session(self):
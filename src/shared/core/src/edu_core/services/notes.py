@@ -8,8 +8,16 @@ from uuid import uuid4
 from edu_db.models import Note
 from edu_db.session import get_session_factory
 
+from edu_core.events import publish_event
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.events import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectResourceType,
+)
+from edu_core.schemas.generation_jobs import GenerationJobDto
 from edu_core.schemas.notes import NoteDto
+from edu_core.services.generation_jobs import GenerationJobService
 
 if TYPE_CHECKING:
     from edu_queue.service import QueueService
@@ -56,6 +64,15 @@ class NoteService:
                     updated_at=datetime.now(),
                 )
                 db.add(note)
+                publish_event(
+                    ProjectEvent(
+                        type=ProjectEventType.RESOURCE_CREATED,
+                        project_id=project_id,
+                        resource_type=ProjectResourceType.NOTE,
+                        resource_id=note.id,
+                    ),
+                    db=db,
+                )
                 db.commit()
                 db.refresh(note)
 
@@ -205,14 +222,15 @@ class NoteService:
             updated_at=note.updated_at,
         )
 
-    def queue_generation(
+    async def queue_generation(
         self,
         note_id: str,
         project_id: str,
         topic: str | None = None,
         custom_instructions: str | None = None,
         user_id: str | None = None,
-    ) -> NoteDto:
+        new_target: bool = False,
+    ) -> tuple[NoteDto, GenerationJobDto]:
         """Queue a note generation request to be processed by a worker.
 
         Args:
@@ -222,9 +240,12 @@ class NoteService:
             topic: Optional topic for generation
             custom_instructions: Optional custom instructions
             user_id: Optional user ID for queue message
+            new_target: The note was created for this request; see
+                ``GenerationJobService.queue_task``
 
         Returns:
-            Existing NoteDto (generation will happen asynchronously)
+            Existing NoteDto (generation will happen asynchronously) and the
+            job tracking its generation
 
         Raises:
             NotFoundError: If note not found
@@ -246,14 +267,21 @@ class NoteService:
         if user_id:
             task_data["user_id"] = user_id
 
-        # Send message to queue
         task_message: QueueTaskMessage = {
             "type": TaskType.NOTE_GENERATION,
             "data": task_data,
         }
-        self.queue_service.send_message(task_message)
+        # Track the task with a job and queue it, unless it is a duplicate
+        job = await GenerationJobService().queue_task(
+            self.queue_service,
+            task_message,
+            project_id=project_id,
+            target_id=note_id,
+            user_id=user_id,
+            new_target=new_target,
+        )
 
-        return note
+        return note, job
 
     @contextmanager
     def _get_db_session(self):
@@ -8,8 +8,16 @@ from uuid import uuid4
 from edu_db.models import Quiz, QuizQuestion
 from edu_db.session import get_session_factory
 
+from edu_core.events import publish_event
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.events import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectResourceType,
+)
+from edu_core.schemas.generation_jobs import GenerationJobDto
 from edu_core.schemas.quizzes import QuizDto, QuizQuestionDto
+from edu_core.services.generation_jobs import GenerationJobService
 
 if TYPE_CHECKING:
     from edu_queue.service import QueueService
@@ -53,6 +61,15 @@ class QuizService:
                     updated_at=datetime.now(),
                 )
                 db.add(quiz)
+                publish_event(
+                    ProjectEvent(
+                        type=ProjectEventType.RESOURCE_CREATED,
+                        project_id=project_id,
+                        resource_type=ProjectResourceType.QUIZ,
+                        resource_id=quiz.id,
+                    ),
+                    db=db,
+                )
                 db.commit()
                 db.refresh(quiz)
 
@@ -531,7 +548,7 @@ class QuizService:
             created_at=question.created_at,
         )
 
-    def queue_generation(
+    async def queue_generation(
         self,
         quiz_id: str,
         project_id: str,
@@ -539,7 +556,8 @@ class QuizService:
         custom_instructions: str | None = None,
         count: int | None = None,
         user_id: str | None = None,
-    ) -> QuizDto:
+        new_target: bool = False,
+    ) -> tuple[QuizDto, GenerationJobDto]:
         """Queue a quiz generation request to be processed by a worker.
 
         Args:
@@ -550,9 +568,12 @@ class QuizService:
             custom_instructions: Optional custom instructions
             count: Optional count of questions to generate
             user_id: Optional user ID for queue message
+            new_target: The quiz was created for this request; see
+                ``GenerationJobService.queue_task``
 
         Returns:
-            Existing QuizDto (generation will happen asynchronously)
+            Existing QuizDto (generation will happen asynchronously) and the
+            job tracking its generation
 
         Raises:
             NotFoundError: If quiz not found
@@ -576,14 +597,21 @@ class QuizService:
         if count is not None:
             task_data["count"] = count
 
-        # Send message to queue
         task_message: QueueTaskMessage = {
             "type": TaskType.QUIZ_GENERATION,
             "data": task_data,
         }
-        self.queue_service.send_message(task_message)
+        # Track the task with a job and queue it, unless it is a duplicate
+        job = await GenerationJobService().queue_task(
+            self.queue_service,
+            task_message,
+            project_id=project_id,
+            target_id=quiz_id,
+            user_id=user_id,
+            new_target=new_target,
+        )
 
-        return quiz
+        return quiz, job
 
     @contextmanager
     def _get_db_session(self):
@@ -11,8 +11,15 @@ from langchain_openai import AzureOpenAIEmbeddings
 from langchain_postgres import PGEngine, PGVectorStore
 
 from edu_core.exceptions import NotFoundError
+from edu_core.schemas.documents import DocumentStatus
 from edu_core.schemas.search import SearchResultItem
 
+# Documents whose embedded segments can be served by search
+SEARCHABLE_STATUSES = (
+    DocumentStatus.PARTIALLY_INDEXED.value,
+    DocumentStatus.INDEXED.value,
+)
+
 
 class SearchService:
     """Service for RAG-based document search using LangChain PGVectorStore."""
@@ -51,6 +58,9 @@ class SearchService:
     ) -> list[SearchResultItem]:
         """Search documents using vector similarity search.
 
+        Partially indexed documents are searched too: every segment embedded so
+        far is served while the rest of the document is still being indexed.
+
         Args:
             query: The search query
             project_id: The project ID to search within
@@ -69,8 +79,14 @@ class SearchService:
                 if not project:
                     raise NotFoundError(f"Project {project_id} not found")
 
-                # Get document IDs for the project
-                document_ids = [str(doc.id) for doc in project.documents]
+                # Get IDs of the project's searchable documents
+                document_ids = [
+                    str(document_id)
+                    for (document_id,) in db.query(Document.id).filter(
+                        Document.project_id == project_id,
+                        Document.status.in_(SEARCHABLE_STATUSES),
+                    )
+                ]
                 if not document_ids:
                     return []
 
@@ -152,6 +168,10 @@ class SearchService:
         Returns:
             List of SearchResultItem instances
         """
+        # Segments that are not embedded yet have no distance
+        similar_docs = [
+            (doc, score) for doc, score in similar_docs if score is not None
+        ]
         if not similar_docs:
             return []
 
@@ -0,0 +1,105 @@
+"""Tests for collapsing duplicate generation requests.
+
+Run from src/shared/core:
+    python -m unittest discover -s tests
+"""
+
+import unittest
+from unittest.mock import patch
+
+from edu_core.services import generation_jobs
+from edu_core.services.mind_maps import MindMapService
+from edu_db.models import GenerationJob
+from edu_queue.idempotency import get_idempotency_key
+from edu_queue.schemas import TaskType
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+class FakeQueueService:
+    """Records sent messages instead of queuing them."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, message) -> None:
+        self.messages.append(message)
+
+
+class CreateRequestCollapseTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # One shared connection, as the job queries run in worker threads
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        GenerationJob.__table__.create(engine)
+        session_factory = sessionmaker(bind=engine)
+        for patcher in (
+            patch.object(
+                generation_jobs, "get_session_factory", lambda: session_factory
+            ),
+            patch.object(generation_jobs, "notify", lambda *args: None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.queue = FakeQueueService()
+        self.service = MindMapService(queue_service=self.queue)
+
+    async def test_identical_new_mind_map_requests_share_a_job(self):
+        request = {
+            "user_id": "user",
+            "project_id": "project",
+            "topic": "Photosynthesis",
+            "custom_instructions": "Keep it short",
+        }
+        first_map, first_job = await self.service.queue_generation(**request)
+        second_map, second_job = await self.service.queue_generation(**request)
+
+        self.assertIsNone(first_map)
+        self.assertIsNone(second_map)
+        self.assertEqual(first_job.id, second_job.id)
+        self.assertEqual(first_job.target_id, second_job.target_id)
+        self.assertEqual(len(self.queue.messages), 1)
+
+    async def test_different_new_mind_map_requests_get_their_own_jobs(self):
+        _, first_job = await self.service.queue_generation(
+            user_id="user", project_id="project", topic="Photosynthesis"
+        )
+        _, second_job = await self.service.queue_generation(
+            user_id="user", project_id="project", topic="Respiration"
+        )
+
+        self.assertNotEqual(first_job.id, second_job.id)
+        self.assertNotEqual(first_job.target_id, second_job.target_id)
+        self.assertEqual(len(self.queue.messages), 2)
+
+
+class NewTargetKeyTest(unittest.TestCase):
+    def _message(self, quiz_id: str) -> dict:
+        return {
+            "type": TaskType.QUIZ_GENERATION,
+            "data": {"project_id": "project", "quiz_id": quiz_id, "topic": "Cells"},
+        }
+
+    def test_new_targets_are_left_out_of_the_key(self):
+        self.assertEqual(
+            get_idempotency_key(self._message("a"), new_target=True),
+            get_idempotency_key(self._message("b"), new_target=True),
+        )
+
+    def test_existing_targets_are_part_of_the_key(self):
+        self.assertNotEqual(
+            get_idempotency_key(self._message("a")),
+            get_idempotency_key(self._message("b")),
+        )
+        self.assertNotEqual(
+            get_idempotency_key(self._message("a")),
+            get_idempotency_key(self._message("a"), new_target=True),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
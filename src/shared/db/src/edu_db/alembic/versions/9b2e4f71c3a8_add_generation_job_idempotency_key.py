@@ -0,0 +1,43 @@
+"""add_generation_job_idempotency_key
+
+Revision ID: 9b2e4f71c3a8
+Revises: 3f8c2a61d7b4
+Create Date: 2026-02-03 14:27:09.318442
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2e4f71c3a8"
+down_revision: Union[str, Sequence[str], None] = "3f8c2a61d7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "generation_jobs", sa.Column("idempotency_key", sa.String(), nullable=True)
+    )
+    op.create_index(
+        "ix_generation_jobs_in_flight_key",
+        "generation_jobs",
+        ["idempotency_key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_generation_jobs_in_flight_key",
+        table_name="generation_jobs",
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+    op.drop_column("generation_jobs", "idempotency_key")
@@ -2,7 +2,17 @@ from datetime import datetime
 from uuid import uuid4
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -75,6 +85,9 @@ class Document(Base):
     file_name: Mapped[str] = mapped_column(String)  # Original file name
     file_type: Mapped[str] = mapped_column(String)  # pdf, docx, txt, etc.
     file_size: Mapped[int] = mapped_column(Integer)  # Size in bytes
+    content_hash: Mapped[str] = mapped_column(
+        String, nullable=True, index=True
+    )  # SHA-256 of the uploaded file content
 
     # Azure Blob Storage references
     original_blob_name: Mapped[str] = mapped_column(
@@ -88,9 +101,18 @@ class Document(Base):
     summary: Mapped[str] = mapped_column(
         Text, nullable=True
     )  # Auto-generated summary of the document
+    outline: Mapped[dict] = mapped_column(
+        JSON, nullable=True
+    )  # Topics with their segment ranges, generated at index time
 
     # Document processing metadata
     status: Mapped[str] = mapped_column(String, default="uploaded")
+    processing_stage: Mapped[str] = mapped_column(
+        String, nullable=True
+    )  # Last completed worker stage; lets redeliveries resume
+    indexing_progress: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # Percentage of segments embedded and searchable
 
     # Timestamps
     uploaded_at: Mapped[datetime] = mapped_column(
@@ -120,6 +142,12 @@ class DocumentSegment(Base):
     # Content
     content: Mapped[str] = mapped_column(Text)
     content_type: Mapped[str] = mapped_column(String, default="text")
+    page_number: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # 1-based source page, from page break markers
+    position: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # Order of the segment within the document
 
     # Metadata for RAG
     embedding_vector: Mapped[list] = mapped_column(Vector(3072), nullable=True)
@@ -133,6 +161,58 @@ class DocumentSegment(Base):
     document = relationship("Document", back_populates="segments")
 
 
+class DocumentAnalysisCache(Base):
+    __tablename__ = "document_analysis_cache"
+    # Keyed by the SHA-256 of the analyzed file and the analyzer that produced it
+    content_hash: Mapped[str] = mapped_column(String, primary_key=True)
+    analyzer_id: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # Content Understanding result
+    markdown: Mapped[str] = mapped_column(Text)
+    summary: Mapped[str] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+    # Keyed by the SHA-256 of the chunk text and the embedding model
+    content_hash: Mapped[str] = mapped_column(String, primary_key=True)
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+
+    embedding_vector: Mapped[list] = mapped_column(Vector(3072))
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class TopicGraphCache(Base):
+    """Topic graph of a project's indexed documents, reused across generations."""
+
+    __tablename__ = "topic_graph_cache"
+    project_id: Mapped[str] = mapped_column(
+        String, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Hash of the document set, topic, instructions and language the graph
+    # was generated for
+    cache_key: Mapped[str] = mapped_column(String, primary_key=True)
+    # Hash of the indexed document set alone; entries for an older document
+    # set are deleted when a graph for the current one is stored
+    document_set_hash: Mapped[str] = mapped_column(String)
+
+    graph: Mapped[dict] = mapped_column(JSON)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
 class Chat(Base):
     __tablename__ = "chats"
     id: Mapped[str] = mapped_column(
@@ -542,3 +622,90 @@ class StudyPlan(Base):
     # Relationships
     user = relationship("User")
     project = relationship("Project")
+
+
+class QueuedMessage(Base):
+    """Task message held by the Postgres queue backend."""
+
+    __tablename__ = "queue_messages"
+    __table_args__ = (
+        # Receivers scan one queue for the oldest visible messages
+        Index("ix_queue_messages_queue_name_visible_at", "queue_name", "visible_at"),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String, primary_key=True, default=lambda: str(uuid4())
+    )
+    queue_name: Mapped[str] = mapped_column(String)
+    content: Mapped[str] = mapped_column(Text)
+    dequeue_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Changes on every receive and renewal; stale receipts cannot touch the row
+    pop_receipt: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # Timestamps
+    inserted_on: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    visible_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class GenerationJob(Base):
+    """Progress of one queued generation task, updated by the worker."""
+
+    __tablename__ = "generation_jobs"
+    __table_args__ = (
+        # Duplicate requests collapse into the job already queued or running
+        Index(
+            "ix_generation_jobs_in_flight_key",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+    id: Mapped[str] = mapped_column(
+        String, primary_key=True, default=lambda: str(uuid4())
+    )
+    project_id: Mapped[str] = mapped_column(
+        String, ForeignKey("projects.id", ondelete="CASCADE"), index=True
+    )
+    user_id: Mapped[str] = mapped_column(String, nullable=True)
+    task_type: Mapped[str] = mapped_column(String)
+    # ID of the quiz, flashcard group, note or mind map being generated
+    target_id: Mapped[str] = mapped_column(String, index=True)
+    # Hash of the task's type, target and parameters; at most one queued or
+    # running job per key, see ix_generation_jobs_in_flight_key
+    idempotency_key: Mapped[str] = mapped_column(String, nullable=True)
+
+    # queued -> running -> succeeded | failed; a retried job returns to queued
+    # and a queued job replaced by a newer request for its target is superseded
+    status: Mapped[str] = mapped_column(String, default="queued")
+    stage: Mapped[str] = mapped_column(String, nullable=True)
+    stage_started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Seconds spent per stage, summed over attempts, e.g. {"queued": 0.4}
+    stage_timings: Mapped[dict] = mapped_column(JSON, default=dict)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    # Relationships
+    project = relationship("Project")
@@ -0,0 +1,147 @@
+"""Postgres LISTEN/NOTIFY helpers."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable
+
+import psycopg2
+from sqlalchemy import Connection, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Seconds between attempts to reopen a failed listener connection
+RECONNECT_INTERVAL_SECONDS = 5.0
+
+
+def notify(db: Session | Connection, channel: str, payload: str) -> None:
+    """Queue a notification that is delivered when the transaction commits.
+
+    Args:
+        db: Session or connection whose transaction carries the notification
+        channel: Channel name
+        payload: Notification payload (at most 8000 bytes)
+    """
+    db.execute(select(func.pg_notify(channel, payload)))
+
+
+class NotificationListener:
+    """Dispatches notifications to callbacks on the running event loop.
+
+    One dedicated connection listens on every subscribed channel; it is
+    opened by the first subscription and watched with ``loop.add_reader``,
+    so no thread is needed. If the connection fails, subscribers simply stop
+    hearing notifications until it is reopened, which is why callers always
+    wait with a timeout and re-check the state they care about.
+    """
+
+    def __init__(self, database_url: str):
+        """Initialize the listener.
+
+        Args:
+            database_url: Database connection URL
+        """
+        self.dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._subscribers: dict[str, set[Callable[[str], None]]] = defaultdict(set)
+        self._conn = None
+        self._fd: int | None = None
+        self._next_connect_at = 0.0
+
+    @property
+    def connected(self) -> bool:
+        """Whether notifications are currently being received."""
+        return self._conn is not None
+
+    def subscribe(
+        self, channel: str, callback: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Call ``callback`` with the payload of every notification on a channel.
+
+        Must be called from the event loop that runs the callbacks.
+
+        Args:
+            channel: Channel name (a plain identifier)
+            callback: Called on the event loop with each payload
+
+        Returns:
+            Function that removes the subscription
+        """
+        new_channel = not self._subscribers[channel]
+        self._subscribers[channel].add(callback)
+        if self._conn is None:
+            self.reconnect()
+        elif new_channel:
+            self._listen(channel)
+
+        def unsubscribe() -> None:
+            self._subscribers[channel].discard(callback)
+
+        return unsubscribe
+
+    def reconnect(self) -> None:
+        """Open the listener connection if it is closed and may be retried."""
+        if self._conn is not None or time.monotonic() < self._next_connect_at:
+            return
+        try:
+            conn = psycopg2.connect(self.dsn)
+            conn.autocommit = True
+        except psycopg2.Error as e:
+            self._next_connect_at = time.monotonic() + RECONNECT_INTERVAL_SECONDS
+            logger.warning("Cannot listen for notifications: %s", e)
+            return
+
+        self._conn = conn
+        self._fd = conn.fileno()
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+        for channel, callbacks in list(self._subscribers.items()):
+            if callbacks and self._conn is not None:
+                self._listen(channel)
+
+    def close(self) -> None:
+        """Close the listener connection."""
+        if self._conn is None:
+            return
+        # Without a running loop (at shutdown) the reader went with the loop
+        with contextlib.suppress(RuntimeError):
+            asyncio.get_running_loop().remove_reader(self._fd)
+        with contextlib.suppress(psycopg2.Error):
+            self._conn.close()
+        self._conn = None
+
+    def _listen(self, channel: str) -> None:
+        try:
+            with self._conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{channel}"')
+        except psycopg2.Error as e:
+            logger.warning("Cannot listen on %s: %s", channel, e)
+            self._drop()
+
+    def _on_readable(self) -> None:
+        conn = self._conn
+        try:
+            conn.poll()
+        except psycopg2.Error as e:
+            logger.warning("Notification listener failed: %s", e)
+            self._drop()
+            return
+
+        while conn.notifies:
+            notification = conn.notifies.pop(0)
+            for callback in list(self._subscribers.get(notification.channel, ())):
+                try:
+                    callback(notification.payload)
+                except Exception:
+                    logger.exception("Notification callback failed")
+
+    def _drop(self) -> None:
+        """Close a failed connection; the next subscription or wait reopens it."""
+        self.close()
+        self._next_connect_at = time.monotonic() + RECONNECT_INTERVAL_SECONDS
@@ -1,7 +1,9 @@
-from collections.abc import Generator
+import time
+from collections.abc import Callable, Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from edu_db.base import Base
 
@@ -10,18 +12,60 @@ _engine = None
 _SessionLocal = None
 
 
-def init_db(database_url: str) -> None:
+class _TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    on_checkout_wait: Callable[[float], None] | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.on_checkout_wait is not None:
+                self.on_checkout_wait(time.perf_counter() - start)
+
+
+def init_db(
+    database_url: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    on_checkout_wait: Callable[[float], None] | None = None,
+) -> None:
     """
     Initialize the global database engine and session factory.
     Call this ONCE at the start of your application (API lifespan or Worker startup).
+
+    Args:
+        database_url: Database connection URL
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections allowed when the pool is exhausted
+        pool_timeout: Seconds to wait for a connection before giving up
+        on_checkout_wait: Optional callback receiving the seconds every pool
+            checkout waited, e.g. to export it as a metric
     """
     global _engine, _SessionLocal
 
     if _engine is not None:
         return  # Already initialized, skip
 
+    # A subclass per engine keeps the callback when the pool is recreated
+    pool_class = type(
+        "TimedQueuePool",
+        (_TimedQueuePool,),
+        {"on_checkout_wait": staticmethod(on_checkout_wait)},
+    )
+
     # Create the engine
-    _engine = create_engine(database_url, pool_pre_ping=True)
+    _engine = create_engine(
+        database_url,
+        pool_pre_ping=True,
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
 
     # Create the session factory
     _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
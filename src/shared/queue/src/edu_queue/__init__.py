@@ -2,5 +2,6 @@
 Queue-related DTOs and services for EduAgent.
 
 This package contains the Pydantic models that define queue messages
-and any helper services for talking to Azure Storage Queues.
+and the services and backends (Azure Storage Queues or Postgres) that
+carry them.
 """
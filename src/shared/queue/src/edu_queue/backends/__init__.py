@@ -0,0 +1,54 @@
+"""Storage backends behind the task queues.
+
+``azure`` uses Azure Storage Queues (one queue per name). ``postgres`` keeps
+messages in the application database, so the whole pipeline runs against a
+single local Postgres and receivers wake on ``NOTIFY`` instead of polling.
+"""
+
+from typing import Literal
+
+from .base import MessageNotFoundError, MessageQueue, QueueBackend, QueueMessage
+
+QueueBackendKind = Literal["azure", "postgres"]
+
+
+def create_queue_backend(
+    kind: QueueBackendKind,
+    azure_storage_connection_string: str = "",
+    database_url: str = "",
+) -> QueueBackend:
+    """Create the configured queue backend.
+
+    Backends are imported on demand, so the Azure SDK is not needed to run on
+    Postgres and vice versa.
+
+    Args:
+        kind: ``azure`` or ``postgres``
+        azure_storage_connection_string: Connection string for ``azure``
+        database_url: Database connection URL for ``postgres``
+
+    Returns:
+        The queue backend
+
+    Raises:
+        ValueError: If the backend kind is unknown
+    """
+    if kind == "azure":
+        from .azure_storage import AzureStorageQueueBackend
+
+        return AzureStorageQueueBackend(azure_storage_connection_string)
+    if kind == "postgres":
+        from .postgres import PostgresQueueBackend
+
+        return PostgresQueueBackend(database_url)
+    raise ValueError(f"Unknown queue backend: {kind}")
+
+
+__all__ = [
+    "MessageNotFoundError",
+    "MessageQueue",
+    "QueueBackend",
+    "QueueBackendKind",
+    "QueueMessage",
+    "create_queue_backend",
+]
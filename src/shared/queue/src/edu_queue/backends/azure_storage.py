@@ -0,0 +1,154 @@
+"""Queue backend on Azure Storage Queues."""
+
+import asyncio
+import contextlib
+from functools import cached_property
+
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+from azure.storage.queue import QueueClient
+from azure.storage.queue.aio import QueueServiceClient as AsyncQueueServiceClient
+
+from .base import MessageNotFoundError, MessageQueue, QueueBackend, QueueMessage
+
+# Async sends in flight at once per batch; Azure has no batch send operation
+MAX_CONCURRENT_SENDS = 16
+
+
+def _to_message(message) -> QueueMessage:
+    return QueueMessage(
+        id=message.id,
+        content=message.content,
+        dequeue_count=message.dequeue_count or 0,
+        inserted_on=message.inserted_on,
+        pop_receipt=message.pop_receipt,
+        next_visible_on=message.next_visible_on,
+    )
+
+
+class AzureStorageQueue(MessageQueue):
+    """Azure Storage Queue.
+
+    Messages are limited to 64 KB and expire after seven days by default.
+    """
+
+    def __init__(self, backend: "AzureStorageQueueBackend", client: QueueClient):
+        """Initialize the queue.
+
+        Args:
+            backend: Backend owning the shared async client
+            client: Queue client for the queue
+        """
+        self.backend = backend
+        self.client = client
+        self.name = client.queue_name
+
+    def ensure_exists(self) -> None:
+        """Create the queue if it does not exist yet."""
+        with contextlib.suppress(ResourceExistsError):
+            self.client.create_queue()
+
+    def send_message(self, content: str, time_to_live: int | None = None) -> None:
+        """Add a message to the queue."""
+        self.client.send_message(content, time_to_live=time_to_live)
+
+    async def send_messages(
+        self, contents: list[str], time_to_live: int | None = None
+    ) -> None:
+        """Send messages concurrently over the backend's shared async client."""
+        client = self.backend.async_service_client.get_queue_client(self.name)
+        for start in range(0, len(contents), MAX_CONCURRENT_SENDS):
+            await asyncio.gather(
+                *(
+                    client.send_message(content, time_to_live=time_to_live)
+                    for content in contents[start : start + MAX_CONCURRENT_SENDS]
+                )
+            )
+
+    def receive_messages(
+        self, max_messages: int, visibility_timeout: int
+    ) -> list[QueueMessage]:
+        """Receive visible messages and hide them from other receivers."""
+        messages = self.client.receive_messages(
+            max_messages=max_messages, visibility_timeout=visibility_timeout
+        )
+        return [_to_message(message) for message in messages]
+
+    def update_message(
+        self, message: QueueMessage, visibility_timeout: int
+    ) -> QueueMessage:
+        """Reset a received message's visibility timeout."""
+        try:
+            receipt = self.client.update_message(
+                message.id,
+                pop_receipt=message.pop_receipt,
+                visibility_timeout=visibility_timeout,
+            )
+        except HttpResponseError as e:
+            # 400 for a malformed receipt, 404 for a stale one or a gone message
+            if e.status_code in (400, 404):
+                raise MessageNotFoundError(str(e)) from e
+            raise
+        message.pop_receipt = receipt.pop_receipt
+        message.next_visible_on = receipt.next_visible_on
+        return message
+
+    def delete_message(self, message: QueueMessage) -> None:
+        """Delete a received message."""
+        try:
+            self.client.delete_message(message.id, pop_receipt=message.pop_receipt)
+        except HttpResponseError as e:
+            if e.status_code in (400, 404):
+                raise MessageNotFoundError(str(e)) from e
+            raise
+
+    def peek_messages(self, max_messages: int) -> list[QueueMessage]:
+        """Read visible messages without hiding them (at most 32)."""
+        messages = self.client.peek_messages(max_messages=min(max_messages, 32))
+        return [_to_message(message) for message in messages]
+
+    def approximate_message_count(self) -> int:
+        """Read the approximate message count from the queue properties."""
+        properties = self.client.get_queue_properties()
+        return properties.approximate_message_count or 0
+
+
+class AzureStorageQueueBackend(QueueBackend):
+    """Queues in one Azure Storage account.
+
+    Async sends from every queue share one async client and its connection
+    pool, which is opened on first use.
+    """
+
+    # Azure rejects message bodies over 64 KiB
+    max_message_bytes = 64 * 1024
+
+    def __init__(self, connection_string: str):
+        """Initialize the backend.
+
+        Args:
+            connection_string: Azure Storage connection string
+        """
+        self.connection_string = connection_string
+
+    def get_queue(self, name: str) -> AzureStorageQueue:
+        """Return the queue with the given name."""
+        return AzureStorageQueue(
+            self,
+            QueueClient.from_connection_string(
+                conn_str=self.connection_string, queue_name=name
+            ),
+        )
+
+    @cached_property
+    def async_service_client(self) -> AsyncQueueServiceClient:
+        """Async client shared by all queues of the backend."""
+        return AsyncQueueServiceClient.from_connection_string(self.connection_string)
+
+    def close(self) -> None:
+        """Nothing to release; each sync queue client opens connections on use."""
+
+    async def aclose(self) -> None:
+        """Close the shared async client if it was opened."""
+        if "async_service_client" in self.__dict__:
+            await self.async_service_client.close()
+            del self.async_service_client
@@ -0,0 +1,172 @@
+"""Interface shared by the queue backends."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class QueueMessage:
+    """A message received from or peeked at on a queue."""
+
+    id: str
+    content: str
+    dequeue_count: int = 0
+    inserted_on: datetime | None = None
+    # Proves the receiver still holds the message; None for peeked messages
+    pop_receipt: str | None = None
+    next_visible_on: datetime | None = None
+
+
+class MessageNotFoundError(Exception):
+    """The message was deleted, or its pop receipt is no longer current."""
+
+
+class MessageQueue(ABC):
+    """A single named queue with visibility-timeout semantics.
+
+    A received message is hidden from other receivers for the visibility
+    timeout and reappears unless it is deleted, so a crashed receiver never
+    loses work. Receiving, updating and deleting are blocking calls; run
+    them in a thread from async code.
+    """
+
+    name: str
+
+    @abstractmethod
+    def ensure_exists(self) -> None:
+        """Create the queue if it does not exist yet."""
+
+    @abstractmethod
+    def send_message(self, content: str, time_to_live: int | None = None) -> None:
+        """Add a message to the queue.
+
+        Args:
+            content: Message body
+            time_to_live: Seconds until the message expires, -1 to keep it
+                until it is deleted, or None for the backend default
+        """
+
+    async def send_messages(
+        self, contents: list[str], time_to_live: int | None = None
+    ) -> None:
+        """Add several messages to the queue without blocking the event loop.
+
+        The default sends them one by one in a worker thread; backends
+        override this with a native async or batched implementation.
+
+        Args:
+            contents: Message bodies
+            time_to_live: Seconds until the messages expire, -1 to keep them
+                until they are deleted, or None for the backend default
+        """
+
+        def send_all() -> None:
+            for content in contents:
+                self.send_message(content, time_to_live=time_to_live)
+
+        await asyncio.to_thread(send_all)
+
+    @abstractmethod
+    def receive_messages(
+        self, max_messages: int, visibility_timeout: int
+    ) -> list[QueueMessage]:
+        """Receive visible messages and hide them from other receivers.
+
+        Args:
+            max_messages: Maximum number of messages to receive
+            visibility_timeout: Seconds the messages stay hidden
+
+        Returns:
+            Received messages, each with a fresh pop receipt
+        """
+
+    @abstractmethod
+    def update_message(
+        self, message: QueueMessage, visibility_timeout: int
+    ) -> QueueMessage:
+        """Reset a received message's visibility timeout.
+
+        Args:
+            message: Message holding the current pop receipt
+            visibility_timeout: Seconds from now the message stays hidden
+
+        Returns:
+            The message with its new pop receipt and visibility time
+
+        Raises:
+            MessageNotFoundError: If the message is gone or its pop receipt
+                is stale
+        """
+
+    @abstractmethod
+    def delete_message(self, message: QueueMessage) -> None:
+        """Delete a received message.
+
+        Args:
+            message: Message holding the current pop receipt
+
+        Raises:
+            MessageNotFoundError: If the message is gone or its pop receipt
+                is stale
+        """
+
+    @abstractmethod
+    def peek_messages(self, max_messages: int) -> list[QueueMessage]:
+        """Read visible messages without hiding them.
+
+        Args:
+            max_messages: Maximum number of messages to return
+
+        Returns:
+            Visible messages, oldest first
+        """
+
+    @abstractmethod
+    def approximate_message_count(self) -> int:
+        """Count the messages in the queue, including hidden ones.
+
+        The count may lag behind sends and deletes; use it for monitoring
+        and autoscaling, not for control flow.
+
+        Returns:
+            Approximate number of messages
+        """
+
+    async def wait_for_messages(self, timeout: float) -> None:
+        """Wait until messages may have arrived, or at most ``timeout`` seconds.
+
+        Backends without change notifications simply sleep, which makes the
+        caller poll.
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        await asyncio.sleep(timeout)
+
+
+class QueueBackend(ABC):
+    """Factory for the queues of one storage system."""
+
+    # Largest message body the queues accept, or None if there is no limit
+    max_message_bytes: int | None = None
+
+    @abstractmethod
+    def get_queue(self, name: str) -> MessageQueue:
+        """Return the queue with the given name.
+
+        Args:
+            name: Queue name
+
+        Returns:
+            The queue; call ``ensure_exists`` before first use
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release connections held by the backend."""
+
+    async def aclose(self) -> None:
+        """Release connections, including those opened for async sends."""
+        self.close()
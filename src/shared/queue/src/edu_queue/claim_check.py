@@ -0,0 +1,177 @@
+"""Claim checks for task messages too large for the queue.
+
+The sender stores the full message in a blob and enqueues a small envelope
+holding the message type, the ID fields of its data and a reference to the
+blob. The worker downloads the message when it processes the envelope and
+deletes the blob once the task succeeded.
+"""
+
+import contextlib
+import gzip
+import json
+from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+from .schemas import ClaimCheck, QueueTaskMessage, TaskType
+
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient
+
+GZIP = "gzip"
+
+
+class PayloadStore(ABC):
+    """Blob storage holding the messages behind claim checks."""
+
+    @abstractmethod
+    async def put(self, name: str, data: bytes) -> None:
+        """Store a payload, replacing any blob with the same name."""
+
+    @abstractmethod
+    async def get(self, name: str) -> bytes:
+        """Read a payload.
+
+        Raises:
+            KeyError: If there is no payload with the name
+        """
+
+    @abstractmethod
+    async def delete(self, name: str) -> None:
+        """Delete a payload; deleting a missing payload is not an error."""
+
+    async def aclose(self) -> None:
+        """Release connections held by the store; the default is a no-op."""
+        return None
+
+
+class AzureBlobPayloadStore(PayloadStore):
+    """Payloads in an Azure Storage blob container, created on first use."""
+
+    def __init__(self, connection_string: str, container_name: str):
+        """Initialize the store.
+
+        Args:
+            connection_string: Azure Storage connection string
+            container_name: Container holding the payloads
+        """
+        self.connection_string = connection_string
+        self.container_name = container_name
+
+    @cached_property
+    def service_client(self) -> "BlobServiceClient":
+        """Async client shared by all operations, opened on first use."""
+        from azure.storage.blob.aio import BlobServiceClient
+
+        return BlobServiceClient.from_connection_string(self.connection_string)
+
+    async def put(self, name: str, data: bytes) -> None:
+        container = self.service_client.get_container_client(self.container_name)
+        try:
+            await container.upload_blob(name, data, overwrite=True)
+        except ResourceNotFoundError:
+            with contextlib.suppress(ResourceExistsError):
+                await container.create_container()
+            await container.upload_blob(name, data, overwrite=True)
+
+    async def get(self, name: str) -> bytes:
+        blob = self.service_client.get_blob_client(self.container_name, name)
+        try:
+            downloader = await blob.download_blob()
+        except ResourceNotFoundError as e:
+            raise KeyError(name) from e
+        return await downloader.readall()
+
+    async def delete(self, name: str) -> None:
+        blob = self.service_client.get_blob_client(self.container_name, name)
+        with contextlib.suppress(ResourceNotFoundError):
+            await blob.delete_blob()
+
+    async def aclose(self) -> None:
+        if "service_client" in self.__dict__:
+            await self.service_client.close()
+            del self.service_client
+
+
+def get_claim_check(message: dict) -> ClaimCheck | None:
+    """Return the claim check of a decoded message body, if it has one."""
+    return message.get("claim_check")
+
+
+async def check_in(
+    store: PayloadStore, message: QueueTaskMessage, compress: bool = True
+) -> QueueTaskMessage:
+    """Store a message and return the envelope to enqueue in its place.
+
+    The envelope keeps the ID fields of the message data, such as
+    ``project_id`` and ``job_id``, so it can be routed, tracked and
+    dead-lettered without downloading the payload.
+
+    Args:
+        store: Store receiving the payload
+        message: The full task message
+        compress: Whether to gzip the payload
+
+    Returns:
+        The claim-check envelope
+    """
+    task_type = TaskType(message["type"])
+    payload = json.dumps(message).encode("utf-8")
+    claim_check: ClaimCheck = {
+        "blob": f"{task_type.value}/{uuid4()}.json",
+        "size": len(payload),
+    }
+    if compress:
+        payload = gzip.compress(payload)
+        claim_check["blob"] += ".gz"
+        claim_check["compression"] = GZIP
+
+    await store.put(claim_check["blob"], payload)
+    return {
+        "type": task_type,
+        "data": {
+            key: value for key, value in message["data"].items() if key.endswith("_id")
+        },
+        "claim_check": claim_check,
+    }
+
+
+async def check_out(store: PayloadStore, message: dict) -> dict:
+    """Return the full message behind a claim-check envelope.
+
+    Messages without a claim check are returned unchanged. The payload is
+    kept until ``release`` is called, so a failed task can be retried.
+
+    Args:
+        store: Store holding the payload
+        message: Decoded message body
+
+    Returns:
+        The full message body
+
+    Raises:
+        KeyError: If the payload no longer exists
+    """
+    claim_check = get_claim_check(message)
+    if claim_check is None:
+        return message
+
+    payload = await store.get(claim_check["blob"])
+    if claim_check.get("compression") == GZIP:
+        payload = gzip.decompress(payload)
+    return json.loads(payload)
+
+
+async def release(store: PayloadStore, message: dict) -> None:
+    """Delete the payload behind a claim-check envelope, if any.
+
+    Args:
+        store: Store holding the payload
+        message: Decoded message body
+    """
+    claim_check = get_claim_check(message)
+    if claim_check is not None:
+        await store.delete(claim_check["blob"])
@@ -0,0 +1,55 @@
+"""Idempotency keys identifying the work a queued task asks for."""
+
+import hashlib
+import json
+
+from edu_queue.schemas import QueueTaskMessage, TaskType
+
+# Data fields that describe who asked or how progress is tracked, not the
+# work itself; tasks differing only in these are duplicates
+NON_IDENTIFYING_FIELDS = frozenset({"job_id", "user_id"})
+
+# Data field holding the ID of the entity each generation task populates
+TARGET_FIELDS = {
+    TaskType.FLASHCARD_GENERATION: "group_id",
+    TaskType.QUIZ_GENERATION: "quiz_id",
+    TaskType.NOTE_GENERATION: "note_id",
+    TaskType.MIND_MAP_GENERATION: "mind_map_id",
+}
+
+
+def get_idempotency_key(message: QueueTaskMessage, new_target: bool = False) -> str:
+    """Derive a task's idempotency key from its type, target and parameters.
+
+    Two messages get the same key exactly when they would produce the same
+    result, e.g. a double-clicked "generate" for the same quiz, topic and
+    count.
+
+    Args:
+        message: The task message
+        new_target: The target was created for this request, e.g. by a chat
+            tool; its ID is left out, so identical requests for new targets
+            in the same project share a key
+
+    Returns:
+        Hex SHA-256 digest of the task's canonical JSON
+    """
+    task_type = TaskType(message["type"])
+    excluded = NON_IDENTIFYING_FIELDS
+    if new_target and task_type in TARGET_FIELDS:
+        excluded = excluded | {TARGET_FIELDS[task_type]}
+    data = {
+        key: value
+        for key, value in message["data"].items()
+        if key not in excluded and value is not None
+    }
+    task = {"type": task_type.value, "data": data}
+    if new_target:
+        task["new_target"] = True
+    canonical = json.dumps(
+        task,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
@@ -0,0 +1,55 @@
+"""Queue lanes that separate task types by how urgently they are needed."""
+
+from enum import Enum
+
+from .schemas import TaskType
+
+
+class QueueLane(str, Enum):
+    """Named lane; every lane is backed by its own queue."""
+
+    # Tasks a user is actively waiting on
+    INTERACTIVE = "interactive"
+    # Background work nobody is waiting on, e.g. precomputation
+    BULK = "bulk"
+    # Document processing, which arrives in large bursts
+    INDEXING = "indexing"
+
+
+TASK_LANES: dict[TaskType, QueueLane] = {
+    TaskType.CHAT_TITLE_GENERATION: QueueLane.INTERACTIVE,
+    TaskType.FLASHCARD_GENERATION: QueueLane.INTERACTIVE,
+    TaskType.QUIZ_GENERATION: QueueLane.INTERACTIVE,
+    TaskType.NOTE_GENERATION: QueueLane.INTERACTIVE,
+    TaskType.MIND_MAP_GENERATION: QueueLane.INTERACTIVE,
+    TaskType.DOCUMENT_PROCESSING: QueueLane.INDEXING,
+    TaskType.TOPIC_GRAPH_GENERATION: QueueLane.BULK,
+}
+
+
+def get_lane(task_type: TaskType | str) -> QueueLane:
+    """Return the lane a task type is routed to.
+
+    Args:
+        task_type: Task type or its string value
+
+    Returns:
+        The task type's lane
+
+    Raises:
+        ValueError: If the task type is unknown
+    """
+    return TASK_LANES[TaskType(task_type)]
+
+
+def get_lane_queue_name(queue_name: str, lane: QueueLane) -> str:
+    """Return the name of the queue backing a lane.
+
+    Args:
+        queue_name: Base queue name shared by all lanes
+        lane: The lane
+
+    Returns:
+        ``<queue_name>-<lane>``
+    """
+    return f"{queue_name}-{lane.value}"
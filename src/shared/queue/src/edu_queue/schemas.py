@@ -13,6 +13,7 @@ class TaskType(str, Enum):
     MIND_MAP_GENERATION = "mind_map_generation"
     DOCUMENT_PROCESSING = "document_processing"
     CHAT_TITLE_GENERATION = "chat_title_generation"
+    TOPIC_GRAPH_GENERATION = "topic_graph_generation"
 
 
 class FlashcardGenerationData(TypedDict):
@@ -25,6 +26,7 @@ class FlashcardGenerationData(TypedDict):
     user_id: NotRequired[str]
     count: NotRequired[int]
     difficulty: NotRequired[str]
+    job_id: NotRequired[str]  # GenerationJob tracking this task's progress
 
 
 class QuizGenerationData(TypedDict):
@@ -36,6 +38,7 @@ class QuizGenerationData(TypedDict):
     custom_instructions: NotRequired[str]
     user_id: NotRequired[str]
     count: NotRequired[int]
+    job_id: NotRequired[str]  # GenerationJob tracking this task's progress
 
 
 class NoteGenerationData(TypedDict):
@@ -46,6 +49,7 @@ class NoteGenerationData(TypedDict):
     topic: NotRequired[str]
     custom_instructions: NotRequired[str]
     user_id: NotRequired[str]
+    job_id: NotRequired[str]  # GenerationJob tracking this task's progress
 
 
 class MindMapGenerationData(TypedDict):
@@ -56,8 +60,11 @@ class MindMapGenerationData(TypedDict):
     mind_map_id: NotRequired[
         str
     ]  # Optional: existing mind map to populate (if not provided, creates new)
+    # The worker creates the mind map under mind_map_id once it is generated
+    create_mind_map: NotRequired[bool]
     topic: NotRequired[str]
     custom_instructions: NotRequired[str]
+    job_id: NotRequired[str]  # GenerationJob tracking this task's progress
 
 
 class DocumentProcessingData(TypedDict):
@@ -78,6 +85,12 @@ class ChatTitleGenerationData(TypedDict):
     ai_response: str
 
 
+class TopicGraphGenerationData(TypedDict):
+    """Data schema for precomputing a project's topic graph."""
+
+    project_id: str
+
+
 TaskData = Union[
     FlashcardGenerationData,
     QuizGenerationData,
@@ -85,11 +98,25 @@ TaskData = Union[
     MindMapGenerationData,
     DocumentProcessingData,
     ChatTitleGenerationData,
+    TopicGraphGenerationData,
 ]
 
 
+class ClaimCheck(TypedDict):
+    """Reference to a task message moved to blob storage for its size."""
+
+    blob: str  # Name of the blob holding the full message JSON
+    compression: NotRequired[str]  # "gzip" if the blob is compressed
+    size: int  # Size of the full message JSON in bytes
+
+
 class QueueTaskMessage(TypedDict):
-    """Schema for queue task messages."""
+    """Schema for queue task messages.
+
+    An oversized message is sent as a claim check instead: ``data`` keeps
+    only the ID fields and ``claim_check`` points at the full message.
+    """
 
     type: TaskType
     data: TaskData
+    claim_check: NotRequired[ClaimCheck]
@@ -1,33 +1,74 @@
-"""Queue service for sending messages to Azure Queue."""
+"""Queue service for sending task messages to the lane queues."""
 
+import asyncio
 import base64
 import json
 import logging
+from collections import defaultdict
 
-from azure.storage.queue import QueueClient
-
-from .schemas import QueueTaskMessage
+from .backends import QueueBackend
+from .claim_check import PayloadStore, check_in
+from .lanes import QueueLane, get_lane, get_lane_queue_name
+from .schemas import QueueTaskMessage, TaskType
 
 logger = logging.getLogger(__name__)
 
 
 class QueueService:
-    """Service for sending messages to Azure Queue."""
+    """Async service for sending task messages to the queue backend.
+
+    Each message is routed to the queue of its task type's lane, named
+    ``<queue_name>-<lane>``, so interactive tasks never wait behind a burst
+    of document uploads.
+
+    Sends never block the event loop. With ``max_delay_seconds`` set,
+    ``send_message`` buffers messages and sends them concurrently once
+    ``max_batch_size`` are waiting or the oldest has waited that long; the
+    caller still waits until its message was sent and sees only the error of
+    its own message.
 
-    def __init__(self, connection_string: str, queue_name: str):
+    A message whose encoded body exceeds the backend's size limit is stored
+    in the ``payload_store`` and sent as a claim check referencing it; the
+    worker downloads it when processing the task.
+    """
+
+    def __init__(
+        self,
+        backend: QueueBackend,
+        queue_name: str,
+        max_batch_size: int = 32,
+        max_delay_seconds: float = 0.0,
+        payload_store: PayloadStore | None = None,
+        compress_payloads: bool = True,
+    ):
         """Initialize the queue service.
 
         Args:
-            connection_string: Azure Storage connection string
-            queue_name: Name of the queue
+            backend: Queue backend holding the lane queues
+            queue_name: Base name of the lane queues
+            max_batch_size: Buffered messages that trigger an immediate flush
+            max_delay_seconds: Longest a message is buffered before it is
+                sent; 0 sends every message right away
+            payload_store: Optional store for messages over the backend's
+                size limit; without one such messages fail to send
+            compress_payloads: Whether stored messages are gzipped
         """
-        self.queue_client = QueueClient.from_connection_string(
-            conn_str=connection_string, queue_name=queue_name
-        )
+        self.queues = {
+            lane: backend.get_queue(get_lane_queue_name(queue_name, lane))
+            for lane in QueueLane
+        }
+        self.max_batch_size = max_batch_size
+        self.max_delay_seconds = max_delay_seconds
+        self.max_message_bytes = backend.max_message_bytes
+        self.payload_store = payload_store
+        self.compress_payloads = compress_payloads
+        self._pending: list[tuple[QueueTaskMessage, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
 
-    def send_message(self, message: QueueTaskMessage) -> None:
+    async def send_message(self, message: QueueTaskMessage) -> None:
         """
-        Sends a QueueTaskMessage to the Azure Queue.
+        Sends a QueueTaskMessage to the queue of its lane.
         Automatically handles Base64 encoding required by Azure Functions.
 
         Args:
@@ -36,18 +77,116 @@ class QueueService:
         Raises:
             Exception: If sending the message fails
         """
-        try:
-            # 1. Convert dict to JSON string
-            message_json = json.dumps(message)
+        if self.max_delay_seconds <= 0:
+            await self.send_many([message])
+            return
 
-            # 2. Base64 encode the string (Required for Azure Functions triggers)
-            message_bytes = message_json.encode("utf-8")
-            base64_message = base64.b64encode(message_bytes).decode("utf-8")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((message, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay_seconds, self._flush)
+        await future
+
+    async def send_many(self, messages: list[QueueTaskMessage]) -> None:
+        """
+        Sends several QueueTaskMessages, batched per lane queue.
+
+        Args:
+            messages: The queue task messages to send
+
+        Raises:
+            Exception: If sending any of the messages fails
+        """
+        try:
+            contents = await asyncio.gather(
+                *(self._encode_fitting(message) for message in messages)
+            )
+            batches: dict[QueueLane, list[str]] = defaultdict(list)
+            for message, content in zip(messages, contents, strict=True):
+                batches[get_lane(message["type"])].append(content)
 
-            # 3. Send to Azure
-            self.queue_client.send_message(base64_message)
-            logger.info("Message sent to queue: %s", self.queue_client.queue_name)
+            await asyncio.gather(
+                *(
+                    self.queues[lane].send_messages(contents)
+                    for lane, contents in batches.items()
+                )
+            )
+            for lane, contents in batches.items():
+                logger.info(
+                    "%d message(s) sent to queue: %s",
+                    len(contents),
+                    self.queues[lane].name,
+                )
 
         except Exception as e:
-            logger.error("Error sending message: %s", e)
+            logger.error("Error sending messages: %s", e)
             raise
+
+    async def aclose(self) -> None:
+        """Send buffered messages and wait for sends in progress."""
+        self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        if self.payload_store is not None:
+            await self.payload_store.aclose()
+
+    async def _encode_fitting(self, message: QueueTaskMessage) -> str:
+        """Encode a message, replacing it by a claim check if it is too large."""
+        content = self._encode(message)
+        if self.max_message_bytes is None or len(content) <= self.max_message_bytes:
+            return content
+
+        if self.payload_store is None:
+            raise ValueError(
+                f"{TaskType(message['type']).value} message is {len(content)} "
+                f"bytes encoded, over the queue limit of {self.max_message_bytes}"
+            )
+        envelope = await check_in(
+            self.payload_store, message, compress=self.compress_payloads
+        )
+        logger.info(
+            "Moved %d-byte message to payload blob %s",
+            len(content),
+            envelope["claim_check"]["blob"],
+        )
+        return self._encode(envelope)
+
+    @staticmethod
+    def _encode(message: QueueTaskMessage) -> str:
+        # 1. Convert dict to JSON string
+        message_json = json.dumps(message)
+
+        # 2. Base64 encode the string (Required for Azure Functions triggers)
+        message_bytes = message_json.encode("utf-8")
+        return base64.b64encode(message_bytes).decode("utf-8")
+
+    def _flush(self) -> None:
+        """Start sending the buffered messages as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._send_batch(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send_batch(
+        self, batch: list[tuple[QueueTaskMessage, asyncio.Future]]
+    ) -> None:
+        # Sent one by one, so a message that fails does not fail the others
+        results = await asyncio.gather(
+            *(self.send_many([message]) for message, _ in batch),
+            return_exceptions=True,
+        )
+        for (_, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)